@@ -0,0 +1,157 @@
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PRODUCT_TYPES = ("T-shirt", "Hoodie", "Pants", "Jacket", "Dress", "Shoes", "Sweater", "Outerwear")
+SIZES = ("XS", "S", "M", "L", "XL", "XXL")
+GENDERS = ("Men", "Women", "Unisex")
+PAGE_PATH_PATTERN = re.compile(r'^/(?:page(\d+))?/?$')
+
+def render_card(rng: random.Random, invalid_rate: float) -> str:
+    """Satu kartu produk dengan markup collection-card seperti situs asli.
+
+    Sebagian kartu (sebanyak invalid_rate) meniru data rusak di situs asli:
+    judul "Unknown Product", harga tidak tersedia, dan rating tidak valid.
+    """
+    if rng.random() < invalid_rate:
+        title, price, rating = "Unknown Product", '<span class="price">Price Unavailable</span>', "⭐ Invalid Rating / 5"
+    else:
+        title = f"{rng.choice(PRODUCT_TYPES)} {rng.randint(1, 100)}"
+        price = f'<span class="price">${rng.uniform(10, 500):.2f}</span>'
+        rating = f"⭐ {rng.uniform(1, 5):.1f} / 5"
+    return (
+        '<div class="collection-card">'
+        '<div style="position: relative;"><img alt="Product Image" class="collection-image" '
+        'src="https://picsum.photos/280/350?random=1"/></div>'
+        '<div class="product-details">'
+        f'<h3 class="product-title">{title}</h3>'
+        f'<div class="price-container">{price}</div>'
+        f'<p style="font-size: 14px; color: #777;">Rating: {rating}</p>'
+        f'<p style="font-size: 14px; color: #777;">{rng.randint(1, 8)} Colors</p>'
+        f'<p style="font-size: 14px; color: #777;">Size: {rng.choice(SIZES)}</p>'
+        f'<p style="font-size: 14px; color: #777;">Gender: {rng.choice(GENDERS)}</p>'
+        '</div></div>'
+    )
+
+def render_page(page: int, page_count: int, cards_per_page: int, invalid_rate: float = 0.05, seed: int = 0) -> str:
+    """HTML satu halaman katalog sintetis; isi halaman yang sama selalu identik untuk seed yang sama."""
+    rng = random.Random(seed * 1_000_003 + page)
+    cards = "".join(render_card(rng, invalid_rate) for _ in range(cards_per_page))
+    next_link = (
+        f'<li class="page-item next"><a class="page-link" href="/page{page + 1}">Next</a></li>'
+        if page < page_count else ''
+    )
+    return (
+        '<!DOCTYPE html><html><head><title>Fashion Studio</title></head><body>'
+        '<div class="collection-grid" id="collectionList">'
+        f'{cards}</div>'
+        f'<ul class="pagination"><li class="page-item current"><span class="page-link">Page {page} of {page_count}</span></li>'
+        f'{next_link}</ul></body></html>'
+    )
+
+class FixtureSite:
+    """Server HTTP lokal yang meniru katalog fashion-studio untuk benchmark.
+
+    Halaman dibuat saat diminta (tidak disimpan di memori), sehingga ukuran
+    katalog bisa sampai puluhan ribu halaman. Setiap respons ditunda sebesar
+    latency detik (ditambah jitter acak), dan sebagian respons (error_rate)
+    dibalas 503 agar jalur retry ikut terukur. Halaman di luar katalog dibalas 404.
+    """
+
+    def __init__(self, page_count: int = 1000, cards_per_page: int = 20, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, invalid_rate: float = 0.05, seed: int = 0):
+        """Inisialisasi situs.
+
+        Args:
+            page_count (int): Jumlah halaman katalog
+            cards_per_page (int): Jumlah kartu produk per halaman
+            latency (float): Tunda setiap respons (detik)
+            jitter (float): Tambahan tunda acak maksimum (detik)
+            error_rate (float): Peluang sebuah request dibalas 503
+            invalid_rate (float): Peluang sebuah kartu berisi data rusak
+            seed (int): Benih isi halaman dan error acak
+        """
+        self.page_count = page_count
+        self.cards_per_page = cards_per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.invalid_rate = invalid_rate
+        self.requests_served = 0
+        self.errors_served = 0
+        self._rng = random.Random(seed)
+        self._seed = seed
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _next_response(self):
+        """Tentukan tunda dan apakah request ini gagal, dengan RNG bersama yang dikunci."""
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.errors_served += 1
+        return delay, failed
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                delay, failed = site._next_response()
+                if delay:
+                    time.sleep(delay)
+                match = PAGE_PATH_PATTERN.match(self.path)
+                page = int(match.group(1) or 1) if match else 0
+                if failed:
+                    self._reply(503, b"Service Unavailable")
+                elif not 1 <= page <= site.page_count:
+                    self._reply(404, b"Not Found")
+                else:
+                    html = render_page(page, site.page_count, site.cards_per_page, site.invalid_rate, site._seed)
+                    self._reply(200, html.encode("utf-8"))
+
+            def _reply(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureSite":
+        """Jalankan server di port acak pada thread latar belakang."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Hentikan server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+        return False
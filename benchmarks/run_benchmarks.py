@@ -0,0 +1,249 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(current_dir, '..')))
+
+import pandas as pd
+
+from benchmarks.fixture_site import FixtureSite
+from utils.extract import (
+    collect_fashion_data, configure_page_cache, configure_retry_policy, best_parser_backend, PARSER_BACKENDS
+)
+from utils.load import DataSaver, close_postgres_pools
+from utils.resilience import RetryPolicy
+from utils.transform import clean_and_transform
+
+try:
+    import pyarrow  # noqa: F401  save_as_parquet butuh pyarrow
+except ImportError:
+    pyarrow = None
+
+BENCHMARK_SINKS = ("csv", "csv_gzip", "parquet", "sqlite", "postgres")
+RSS_SAMPLE_INTERVAL = 0.005
+
+def _current_rss() -> int:
+    """RSS proses saat ini dalam byte dari /proc; None jika tidak tersedia (non-Linux)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+class PeakMemorySampler:
+    """Sampling RSS di thread latar belakang untuk mencari puncak memori satu langkah benchmark.
+
+    Di luar Linux, puncak diambil dari ru_maxrss yang merupakan puncak sepanjang proses.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss() or 0)
+
+    def __enter__(self):
+        rss = _current_rss()
+        if rss is None:
+            self.baseline = self.peak = 0
+            return self
+        self.baseline = self.peak = rss
+        self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _current_rss() or 0)
+        else:
+            # ru_maxrss dalam KB di Linux dan byte di macOS
+            scale = 1 if sys.platform == 'darwin' else 1024
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        return False
+
+def measure(name: str, run, quiet: bool = True, **units) -> tuple:
+    """Jalankan run() sekali dan ukur durasi, throughput, dan puncak memori.
+
+    Args:
+        name (str): Nama langkah benchmark
+        run (callable): Fungsi tanpa argumen; hasilnya dikembalikan apa adanya
+        quiet (bool): Buang output print dari langkah ini
+        **units: Fungsi hasil -> jumlah unit, mis. rows=len; dilaporkan sebagai <unit>_per_second
+
+    Returns:
+        tuple: (hasil run, dict ringkasan)
+    """
+    output = open(os.devnull, 'w') if quiet else contextlib.nullcontext()
+    with output as sink, PeakMemorySampler() as memory:
+        redirect = contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext()
+        started_at = time.perf_counter()
+        with redirect:
+            result = run()
+        seconds = time.perf_counter() - started_at
+
+    summary = {
+        'name': name,
+        'seconds': round(seconds, 4),
+        'peak_rss_mb': round(memory.peak / 2**20, 1),
+        'peak_rss_delta_mb': round(max(memory.peak - memory.baseline, 0) / 2**20, 1),
+    }
+    for unit, count in units.items():
+        value = count(result)
+        summary[unit] = value
+        summary[f'{unit}_per_second'] = round(value / seconds, 1) if seconds > 0 else None
+    throughput = ", ".join(f"{summary[f'{unit}_per_second']} {unit}/s" for unit in units)
+    print(f"[Benchmark] {name}: {seconds:.2f}s, {throughput or '-'}, puncak RSS {summary['peak_rss_mb']} MB")
+    return result, summary
+
+def sink_runs(cleaned: pd.DataFrame, sinks, work_dir: str, postgres_dsn: str = None) -> dict:
+    """Nama benchmark sink -> (kunci sink_stats, fungsi yang menjalankan sink dan mengembalikan DataSaver-nya)."""
+    def run(stats_key, method, *args, **kwargs):
+        def call():
+            saver = DataSaver(cleaned)
+            getattr(saver, method)(*args, **kwargs)
+            return saver
+        return stats_key, call
+
+    available = {
+        'csv': run('csv', 'save_as_csv', os.path.join(work_dir, 'products.csv')),
+        'csv_gzip': run('csv', 'save_as_csv', os.path.join(work_dir, 'products.csv.gz')),
+        'sqlite': run('sqlite', 'save_to_sqlite', os.path.join(work_dir, 'warehouse.sqlite')),
+    }
+    if pyarrow is not None:
+        available['parquet'] = run('parquet', 'save_as_parquet', os.path.join(work_dir, 'products_parquet'))
+    if postgres_dsn:
+        available['postgres'] = run('postgres', 'save_to_postgres', postgres_dsn, table='products_benchmark')
+    skipped = [sink for sink in sinks if sink not in available]
+    if skipped:
+        print(f"[Benchmark] Sink dilewati (dependensi atau DSN tidak tersedia): {', '.join(skipped)}")
+    return {sink: available[sink] for sink in sinks if sink in available}
+
+def run_benchmarks(pages: int = 1000, cards_per_page: int = 20, latency: float = 0.0, jitter: float = 0.0,
+                   error_rate: float = 0.0, concurrency: int = 10, parser_backend: str = None, parse_workers: int = None,
+                   sinks=BENCHMARK_SINKS, postgres_dsn: str = None, quiet: bool = True, seed: int = 0) -> dict:
+    """Jalankan benchmark end-to-end terhadap situs fixture lokal.
+
+    Urutannya sama dengan pipeline: collect_fashion_data dari situs fixture,
+    clean_and_transform pada data mentah, lalu setiap sink DataSaver pada data bersih.
+
+    Returns:
+        dict: Konfigurasi, informasi lingkungan, dan ringkasan per langkah
+    """
+    parser_backend = parser_backend or best_parser_backend()
+    config = {
+        'pages': pages, 'cards_per_page': cards_per_page, 'latency': latency, 'jitter': jitter,
+        'error_rate': error_rate, 'concurrency': concurrency,
+        'parser_backend': parser_backend, 'parse_workers': parse_workers,
+        'sinks': list(sinks), 'seed': seed,
+    }
+    started_at = datetime.now(timezone.utc).isoformat()
+    results = []
+    configure_page_cache(None)
+    # Backoff pendek agar error yang disengaja tidak mendominasi waktu pengambilan
+    configure_retry_policy(RetryPolicy(max_attempts=6, backoff_base=0.01, backoff_max=0.1))
+    try:
+        with FixtureSite(pages, cards_per_page, latency, jitter, error_rate, seed=seed) as site:
+            raw, summary = measure(
+                "collect_fashion_data",
+                lambda: collect_fashion_data(pages_to_scrape=pages, wait_seconds=0, concurrency=concurrency,
+                                             parser_backend=parser_backend, parse_workers=parse_workers,
+                                             base_url=site.base_url),
+                quiet, pages=lambda _: pages, rows=len,
+            )
+            summary['requests'] = site.requests_served
+            summary['errors_injected'] = site.errors_served
+            results.append(summary)
+
+        cleaned, summary = measure("clean_and_transform", lambda: clean_and_transform(raw), quiet, rows=len)
+        summary['input_rows'] = len(raw)
+        results.append(summary)
+        del raw
+
+        with tempfile.TemporaryDirectory(prefix="etl-benchmark-") as work_dir:
+            for sink, (stats_key, run) in sink_runs(cleaned, sinks, work_dir, postgres_dsn).items():
+                written = lambda saver: saver.sink_stats.get(stats_key, {}).get('rows', 0)
+                saver, summary = measure(f"sink:{sink}", run, quiet, rows=written)
+                summary['status'] = 'ok' if stats_key in saver.sink_stats else 'failed'
+                summary['bytes'] = saver.sink_stats.get(stats_key, {}).get('bytes', 0)
+                results.append(summary)
+    finally:
+        configure_retry_policy(None)
+        close_postgres_pools()
+
+    return {
+        'started_at': started_at,
+        'config': config,
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+def compare_results(current: dict, baseline: dict):
+    """Cetak perbandingan durasi per langkah terhadap hasil benchmark sebelumnya."""
+    previous = {result['name']: result for result in baseline.get('results', [])}
+    for result in current['results']:
+        before = previous.get(result['name'])
+        if before is None or not before['seconds']:
+            continue
+        ratio = before['seconds'] / result['seconds'] if result['seconds'] else float('inf')
+        print(f"[Benchmark] {result['name']}: {before['seconds']:.2f}s -> {result['seconds']:.2f}s ({ratio:.2f}x)")
+
+def parse_args(argv=None):
+    """Baca opsi baris perintah benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end pipeline ETL terhadap situs fixture lokal.")
+    parser.add_argument("--pages", type=int, default=1000, help="Jumlah halaman katalog (bawaan: 1000)")
+    parser.add_argument("--cards-per-page", type=int, default=20, help="Jumlah kartu produk per halaman")
+    parser.add_argument("--latency", type=float, default=0.0, help="Tunda setiap respons dalam detik")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Tambahan tunda acak maksimum dalam detik")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang respons 503 per request")
+    parser.add_argument("--concurrency", type=int, default=10, help="Jumlah request bersamaan")
+    parser.add_argument("--parser-backend", choices=PARSER_BACKENDS, default=None,
+                        help="Backend parser HTML (bawaan: yang tercepat yang terpasang, sama seperti main.py)")
+    parser.add_argument("--parse-workers", type=int, default=None, help="Jumlah proses parser (bawaan: di thread utama)")
+    parser.add_argument("--sinks", nargs="+", choices=BENCHMARK_SINKS, default=list(BENCHMARK_SINKS),
+                        help="Sink DataSaver yang diukur; postgres hanya jika --postgres-dsn diisi")
+    parser.add_argument("--postgres-dsn", default=os.environ.get("POSTGRES_DSN"), help="DSN PostgreSQL untuk sink postgres")
+    parser.add_argument("--seed", type=int, default=0, help="Benih isi halaman dan error acak")
+    parser.add_argument("--output", default="benchmark_results.json", help="File JSON hasil benchmark")
+    parser.add_argument("--compare", metavar="FILE", default=None, help="Bandingkan dengan file JSON hasil sebelumnya")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan output print dari pipeline")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    options = parse_args(argv)
+    report = run_benchmarks(
+        pages=options.pages, cards_per_page=options.cards_per_page, latency=options.latency,
+        jitter=options.jitter, error_rate=options.error_rate, concurrency=options.concurrency,
+        parser_backend=options.parser_backend, parse_workers=options.parse_workers, sinks=options.sinks, postgres_dsn=options.postgres_dsn,
+        quiet=not options.verbose, seed=options.seed,
+    )
+    with open(options.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2)
+    print(f"[Benchmark] Hasil disimpan ke {options.output}")
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as baseline:
+            compare_results(report, json.load(baseline))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,202 @@
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from functools import partial
+import argparse
 import sys
 import os
-from utils.extract import collect_fashion_data
-from utils.transform import clean_and_transform
-from utils.load import process_data
+from utils.extract import (
+    collect_fashion_data, iter_fashion_batches, configure_page_cache, configure_retry_policy, best_parser_backend
+)
+from utils.cache import PageCache
+from utils.checkpoint import CheckpointJournal
+from utils.resilience import RetryPolicy, CircuitBreaker
+from utils.transform import clean_and_transform, transform_batches
+from utils.validate import DataValidator, QuarantineSink
+from utils.dedup import ProductDeduplicator, DEDUP_MODES
+from utils.reprocess import reprocess_files, DEFAULT_MEMORY_BUDGET_MB
+from utils.load import DataSaver, process_data, process_stream, close_postgres_pools
+from utils.state import ProductStateStore, build_delta_frame, report_delta
+from utils.metrics import PipelineMetrics, configure_metrics, get_metrics
+from utils.profiling import StageProfiler, DEFAULT_TOP_ALLOCATIONS
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
 
+def parse_args(argv=None):
+    """Baca opsi baris perintah pipeline ETL."""
+    parser = argparse.ArgumentParser(description="Pipeline ETL data produk fashion.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Proses data per batch dari ekstraksi sampai penyimpanan")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Jumlah baris per batch pada mode --stream (bawaan: satu batch per halaman)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Hanya simpan produk baru, berubah, atau hilang dibanding run sebelumnya "
+                             "(ke CSV delta, dan upsert ke --sqlite/--postgres-dsn)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Lanjutkan run yang gagal dari jurnal checkpoint tanpa mengambil ulang halaman yang selesai")
+    parser.add_argument("--engine", choices=("auto", "pandas", "polars"), default="auto",
+                        help="Engine transformasi; auto memilih berdasarkan jumlah baris (bawaan: auto)")
+    parser.add_argument("--validate", action="store_true",
+                        help="Validasi data bersih dan simpan baris yang dibuang beserta alasannya ke file karantina")
+    parser.add_argument("--quarantine-file", default="quarantine.csv",
+                        help="File CSV karantina untuk --validate (bawaan: quarantine.csv)")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default=None,
+                        help="Buang produk duplikat sebelum disimpan; bloom untuk memori terbatas (bawaan: tidak aktif)")
+    parser.add_argument("--parquet", metavar="DIR", default=None,
+                        help="Simpan juga sebagai dataset Parquet terpartisi (ScrapeDate, Gender) di direktori ini")
+    parser.add_argument("--postgres-dsn", default=os.environ.get("POSTGRES_DSN"),
+                        help="Muat juga ke PostgreSQL (COPY + upsert); bawaan dari variabel POSTGRES_DSN")
+    parser.add_argument("--sqlite", metavar="FILE", default=None,
+                        help="Upsert juga ke gudang data SQLite lokal berindeks dengan tabel ringkasan")
+    parser.add_argument("--metrics-log", metavar="FILE", default=None,
+                        help="Tulis log terstruktur (JSON Lines) per tahap dan sink ke file ini")
+    parser.add_argument("--metrics-textfile", metavar="FILE", default=None,
+                        help="Ekspor metrik dalam format textfile Prometheus (untuk node exporter) ke file ini")
+    parser.add_argument("--profile", metavar="DIR", default=None,
+                        help="Profil CPU (cProfile) dan memori (tracemalloc) per tahap; hasil pstats dan snapshot ke DIR")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP_ALLOCATIONS,
+                        help="Jumlah baris pengalokasi memori teratas per tahap pada --profile")
+    parser.add_argument("--profile-sample-interval", type=float, default=None, metavar="SECONDS",
+                        help="Sampling stack loop fetch (termasuk thread worker) dengan interval ini pada --profile")
+    parser.add_argument("--reprocess", nargs="+", metavar="FILE",
+                        help="Bersihkan ulang file CSV/JSON Lines mentah historis per chunk tanpa scraping")
+    parser.add_argument("--reprocess-output", default="products_reprocessed.csv",
+                        help="File CSV hasil --reprocess (akhiran .gz untuk gzip)")
+    parser.add_argument("--memory-budget", type=float, default=DEFAULT_MEMORY_BUDGET_MB,
+                        help="Batas memori (MB) untuk chunk yang diproses bersamaan pada --reprocess")
+    options = parser.parse_args(argv)
+    if options.incremental and options.stream:
+        parser.error("--incremental tidak bisa dipakai bersama --stream")
+    if options.incremental and options.parquet:
+        parser.error("--incremental tidak bisa dipakai bersama --parquet (dataset Parquet berisi snapshot penuh)")
+    return options
 
+@contextmanager
+def pipeline_stage(name: str, profiler: StageProfiler = None, **fields):
+    """Ukur satu tahap ke metrik yang terpasang dan, jika profiler diisi, profil CPU dan memorinya."""
+    with get_metrics().stage(name, **fields):
+        if profiler is None:
+            yield
+        else:
+            with profiler.stage(name):
+                yield
 
-def main():
+def load_incremental(cleaned_df, state_path: str = '.state/products.sqlite',
+                     delta_file: str = 'products_delta.csv', sqlite_path: str = None, postgres_dsn: str = None):
+    """Simpan hanya perubahan dibanding state run sebelumnya, lalu perbarui state.
+
+    Delta lengkap (termasuk produk yang hilang) ditulis ke delta_file. Produk baru
+    dan berubah juga di-upsert ke SQLite dan PostgreSQL jika diisi. State hanya
+    diperbarui jika semua sink berhasil, agar perubahan yang gagal dimuat ikut
+    terdeteksi lagi pada run berikutnya.
+
+    Raises:
+        RuntimeError: Jika ada sink yang gagal; state tidak diperbarui
+    """
+    state_store = ProductStateStore(state_path)
+    try:
+        delta = state_store.compute_delta(cleaned_df)
+        report_delta(delta)
+        delta_df = build_delta_frame(delta)
+        if delta_df.empty:
+            print(f"[{datetime.now()}] [INFO] Tidak ada perubahan data sejak run sebelumnya.")
+        else:
+            delta_saver = DataSaver(delta_df)
+            delta_saver.save_as_csv(delta_file)
+            failed = [] if 'csv' in delta_saver.sink_stats else ['csv']
+
+            upserts = delta_df[delta_df['ChangeType'] != 'removed'].drop(columns=['ChangeType'])
+            if not upserts.empty:
+                upsert_saver = DataSaver(upserts)
+                if sqlite_path:
+                    upsert_saver.save_to_sqlite(sqlite_path)
+                if postgres_dsn:
+                    upsert_saver.save_to_postgres(postgres_dsn)
+                failed += [sink for sink, enabled in (('sqlite', sqlite_path), ('postgres', postgres_dsn))
+                           if enabled and sink not in upsert_saver.sink_stats]
+            if failed:
+                raise RuntimeError(f"Delta gagal dimuat ke {', '.join(failed)}; state tidak diperbarui")
+        state_store.commit(cleaned_df)
+    finally:
+        state_store.close()
+
+def run_stream(scrape_options: dict, batch_size: int = None, engine: str = "auto", deduplicator=None,
+               validator=None, parquet_path: str = None, postgres_dsn: str = None, sqlite_path: str = None):
+    """Jalankan ETL secara bertahap sehingga memori tetap terbatas berapapun jumlah halamannya."""
+    print(f"[{datetime.now()}] [INFO] Memulai proses ETL bertahap...")
+    metrics = get_metrics()
+    raw_batches = metrics.timed_batches("extract", iter_fashion_batches(batch_size=batch_size, **scrape_options))
+    quarantine = validator.quarantine if validator is not None else None
+    cleaned_batches = transform_batches(raw_batches, engine=engine, quarantine=quarantine)
+    if validator is not None:
+        cleaned_batches = validator.validate_batches(cleaned_batches)
+    if deduplicator is not None:
+        cleaned_batches = deduplicator.filter_batches(cleaned_batches)
+    cleaned_batches = metrics.timed_batches("transform", cleaned_batches)
+    with metrics.stage("load"):
+        total_rows = process_stream(cleaned_batches, parquet_path=parquet_path, postgres_dsn=postgres_dsn,
+                                    sqlite_path=sqlite_path)
+    if validator is not None:
+        validator.report()
+        validator.quarantine.report()
+    if deduplicator is not None:
+        deduplicator.report()
+
+    if total_rows == 0:
+        print(f"[{datetime.now()}] [ERROR] Tidak ada data yang berhasil diproses.")
+        return
+    print(f"[{datetime.now()}] [SUCCESS] Proses ETL bertahap selesai: {total_rows} baris disimpan")
+
+def main(options=None):
     """Fungsi utama untuk menjalankan proses ETL fashion data."""
+    options = options or parse_args([])
+    if options.reprocess:
+        reprocess_files(options.reprocess, options.reprocess_output,
+                        memory_budget_mb=options.memory_budget, engine=options.engine)
+        return
+    checkpoint = CheckpointJournal('.state/checkpoint.jsonl')
+    if not options.resume:
+        checkpoint.reset()
+    scrape_options = {
+        "pages_to_scrape": None,
+        "concurrency": 5,
+        "rate_limit": 2,
+        "parser_backend": best_parser_backend(),
+        "checkpoint": checkpoint,
+        "adaptive_concurrency": True,
+    }
+    page_cache = PageCache('.cache/pages.sqlite', ttl=1800)
+    configure_page_cache(page_cache)
+    retry_policy = RetryPolicy(max_attempts=4, circuit_breaker=CircuitBreaker())
+    configure_retry_policy(retry_policy)
+    deduplicator = ProductDeduplicator(mode=options.dedup) if options.dedup else None
+    validator = DataValidator(quarantine=QuarantineSink(options.quarantine_file)) if options.validate else None
+    quarantine = validator.quarantine if validator is not None else None
+    metrics = None
+    if options.metrics_log or options.metrics_textfile:
+        metrics = PipelineMetrics(options.metrics_log)
+        configure_metrics(metrics)
+    profiler = None
+    if options.profile:
+        profiler = StageProfiler(options.profile, options.profile_top, options.profile_sample_interval,
+                                 sample_stages=("extract", "stream"))
+    stage = partial(pipeline_stage, profiler=profiler)
     try:
+        if options.stream:
+            # Tahap pada mode bertahap saling bersarang per batch, jadi seluruh run diprofil sebagai satu tahap
+            with profiler.stage("stream") if profiler is not None else nullcontext():
+                run_stream(scrape_options, options.batch_size, options.engine, deduplicator, validator,
+                           options.parquet, options.postgres_dsn, options.sqlite)
+            page_cache.report_stats()
+            retry_policy.metrics.report()
+            return
+
         print(f"[{datetime.now()}] [INFO] Memulai proses pengumpulan data...")
-        raw_products = collect_fashion_data(pages_to_scrape=50)  
+        with stage("extract"):
+            raw_products = collect_fashion_data(**scrape_options)
+        page_cache.report_stats()
+        retry_policy.metrics.report()
 
         if raw_products.empty:
             print(f"[{datetime.now()}] [ERROR] Tidak ada data yang berhasil dikumpulkan.")
@@ -24,20 +205,48 @@ def main():
         print(f"[{datetime.now()}] [SUCCESS] Jumlah data awal: {len(raw_products)}")
         
         print(f"[{datetime.now()}] [INFO] Memulai proses pembersihan data...")
-        cleaned_df = clean_and_transform(raw_products)
+        with stage("transform"):
+            cleaned_df = clean_and_transform(raw_products, engine=options.engine, quarantine=quarantine)
+            if validator is not None:
+                cleaned_df = validator.validate(cleaned_df)
+        if validator is not None:
+            validator.report()
+            quarantine.report()
         
         if cleaned_df.empty:
             print(f"[{datetime.now()}] [ERROR] Tidak ada data yang tersisa setelah pembersihan.")
             return
             
         print(f"[{datetime.now()}] [SUCCESS] Data setelah dibersihkan: {len(cleaned_df)} baris")
+        if deduplicator is not None:
+            with stage("dedup"):
+                cleaned_df = deduplicator.filter(cleaned_df)
+            deduplicator.report()
         
         print(f"[{datetime.now()}] [INFO] Memulai proses penyimpanan data...")
-        process_data(df=cleaned_df)
+        with stage("load", rows=len(cleaned_df)):
+            if options.incremental:
+                load_incremental(cleaned_df, sqlite_path=options.sqlite, postgres_dsn=options.postgres_dsn)
+            else:
+                process_data(df=cleaned_df, parquet_path=options.parquet, postgres_dsn=options.postgres_dsn,
+                             sqlite_path=options.sqlite)
         print(f"[{datetime.now()}] [SUCCESS] Proses ETL selesai")
         
     except Exception as error:
         print(f"[{datetime.now()}] [ERROR] Terjadi kesalahan: {str(error)}")
+    finally:
+        configure_page_cache(None)
+        configure_retry_policy(None)
+        page_cache.close()
+        close_postgres_pools()
+        if deduplicator is not None:
+            deduplicator.close()
+        if metrics is not None:
+            configure_metrics(None)
+            metrics.log('run_finished', metrics=metrics.snapshot())
+            if options.metrics_textfile:
+                metrics.write_prometheus(options.metrics_textfile)
+            metrics.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(parse_args())
\ No newline at end of file
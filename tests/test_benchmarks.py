@@ -0,0 +1,45 @@
+import requests
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from benchmarks.fixture_site import FixtureSite, render_page
+from benchmarks.run_benchmarks import run_benchmarks
+from utils.extract import parse_page_products, find_next_page_url, build_page_url
+
+def test_fixture_pages_parse_like_the_real_site():
+    """Menguji apakah halaman sintetis diparse menjadi produk lengkap, termasuk kartu rusak dan tautan Next."""
+    html = render_page(3, page_count=5, cards_per_page=40, invalid_rate=0.5, seed=1)
+    items = parse_page_products(html, 3)
+
+    assert len(items) == 40
+    assert {"Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"} <= set(items[0])
+    assert any(item["Title"] == "Unknown Product" for item in items)
+    assert all(item["Size"] != "Ukuran Tidak Diketahui" for item in items)
+    assert find_next_page_url(html, "http://localhost/page3") == "http://localhost/page4"
+    assert find_next_page_url(render_page(5, 5, 1), "http://localhost/page5") is None
+
+def test_fixture_site_serves_pages_errors_and_missing_pages():
+    """Menguji apakah situs fixture membalas 200 untuk halaman katalog, 404 di luar katalog, dan 503 sesuai error_rate."""
+    with FixtureSite(page_count=2, cards_per_page=3) as site:
+        assert requests.get(build_page_url(2, site.base_url), timeout=5).status_code == 200
+        assert requests.get(build_page_url(3, site.base_url), timeout=5).status_code == 404
+    with FixtureSite(page_count=2, error_rate=1.0) as site:
+        assert requests.get(site.base_url, timeout=5).status_code == 503
+        assert site.errors_served == 1
+
+def test_run_benchmarks_reports_every_step(tmp_path):
+    """Menguji apakah benchmark kecil melaporkan throughput dan memori untuk setiap langkah."""
+    report = run_benchmarks(pages=4, cards_per_page=5, error_rate=0.2, concurrency=2, sinks=("csv", "sqlite"))
+
+    results = {result['name']: result for result in report['results']}
+    assert list(results) == ["collect_fashion_data", "clean_and_transform", "sink:csv", "sink:sqlite"]
+    assert results["collect_fashion_data"]["rows"] == 20
+    assert results["collect_fashion_data"]["pages_per_second"] > 0
+    assert results["sink:csv"]["status"] == "ok"
+    assert results["sink:sqlite"]["rows"] == results["clean_and_transform"]["rows"]
+    assert all(result["peak_rss_mb"] > 0 for result in results.values())
@@ -0,0 +1,70 @@
+import pytest
+import sys
+import os
+import time
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.cache import PageCache
+
+@pytest.fixture
+def page_cache(tmp_path):
+    """Menyediakan PageCache sementara di direktori tes."""
+    cache = PageCache(str(tmp_path / "cache" / "pages.sqlite"), ttl=60, max_bytes=1000)
+    yield cache
+    cache.close()
+
+def test_cache_stores_and_returns_body_with_validators(page_cache):
+    """Menguji apakah body dan validator ETag/Last-Modified tersimpan per URL."""
+    page_cache.put("http://contoh.com/", "<html>A</html>", etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    entry = page_cache.get("http://contoh.com/")
+
+    assert entry["body"] == "<html>A</html>"
+    assert page_cache.is_fresh(entry)
+    assert page_cache.conditional_headers(entry) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert page_cache.get("http://contoh.com/lain") is None
+
+def test_cache_entry_expires_after_ttl(page_cache):
+    """Menguji apakah entri dianggap kedaluwarsa setelah TTL lewat dan segar lagi setelah revalidasi."""
+    page_cache.ttl = 0.01
+    page_cache.put("http://contoh.com/", "<html>A</html>")
+    time.sleep(0.02)
+
+    assert not page_cache.is_fresh(page_cache.get("http://contoh.com/"))
+
+    page_cache.ttl = 60
+    page_cache.mark_revalidated("http://contoh.com/")
+    assert page_cache.is_fresh(page_cache.get("http://contoh.com/"))
+    assert page_cache.stats["revalidated"] == 1
+
+def test_cache_evicts_least_recently_used_entries(page_cache):
+    """Menguji eviction LRU ketika total ukuran body melebihi batas."""
+    page_cache.put("http://contoh.com/1", "a" * 400)
+    time.sleep(0.01)
+    page_cache.put("http://contoh.com/2", "b" * 400)
+    time.sleep(0.01)
+    page_cache.get("http://contoh.com/1")  # halaman 1 menjadi yang terbaru diakses
+    time.sleep(0.01)
+    page_cache.put("http://contoh.com/3", "c" * 400)
+
+    assert page_cache.get("http://contoh.com/2") is None
+    assert page_cache.get("http://contoh.com/1") is not None
+    assert page_cache.get("http://contoh.com/3") is not None
+    assert page_cache.total_bytes() <= 1000
+    assert page_cache.stats["evicted"] == 1
+
+def test_cache_reports_stats(page_cache, capsys):
+    """Menguji ringkasan statistik hit/miss yang dicetak."""
+    page_cache.record_hit()
+    page_cache.record_miss()
+    page_cache.report_stats()
+
+    captured = capsys.readouterr()
+    assert "[Cache] hit: 1, revalidasi (304): 0, miss: 1" in captured.out
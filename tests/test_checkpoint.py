@@ -0,0 +1,109 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.checkpoint import CheckpointJournal
+from utils.extract import collect_fashion_data, iter_fashion_batches
+from utils.load import process_stream
+from utils.transform import transform_batches
+
+PAGE_HTML = """
+<div class="collection-card">
+    <h3 class="product-title">{title}</h3>
+    <div class="price-container">$10.00</div>
+    <p>Rating: ⭐ 4.0 / 5</p>
+</div>
+"""
+
+def fake_catalog(failing_page=None, last_page=4):
+    """Pengganti retrieve_page_content untuk katalog dengan halaman yang bisa dibuat gagal."""
+    def fetch(url):
+        page_name = url.rstrip('/').rsplit('/', 1)[-1]
+        page = int(page_name[4:]) if page_name.startswith('page') else 1
+        if page == failing_page or page > last_page:
+            return None
+        next_link = f'<li class="next"><a href="/page{page + 1}">Next</a></li>' if page < last_page else ''
+        return PAGE_HTML.format(title=f"Produk {page}") + next_link
+    return fetch
+
+@pytest.fixture
+def journal(tmp_path):
+    """Menyediakan CheckpointJournal sementara."""
+    return CheckpointJournal(str(tmp_path / "state" / "checkpoint.jsonl"))
+
+def test_journal_round_trips_items_and_ignores_truncated_line(journal):
+    """Menguji apakah halaman tersimpan bisa dibaca ulang, termasuk Timestamp, meski baris terakhir terpotong."""
+    journal.load("https://contoh.com/")
+    journal.record(1, [{"Title": "A", "Timestamp": datetime(2024, 5, 25, 10, 0, 0)}])
+    with open(journal.path, 'a', encoding='utf-8') as journal_file:
+        journal_file.write('{"type": "page", "page": 2, "ite')
+
+    completed = CheckpointJournal(journal.path).load("https://contoh.com/")
+
+    assert completed == {1: [{"Title": "A", "Timestamp": datetime(2024, 5, 25, 10, 0, 0)}]}
+
+def test_pages_recorded_after_truncated_line_are_kept(journal):
+    """Menguji apakah halaman yang dicatat setelah resume tidak tersambung ke baris terpotong dari crash."""
+    journal.load("https://contoh.com/")
+    journal.record(1, [{"Title": "A"}])
+    with open(journal.path, 'a', encoding='utf-8') as journal_file:
+        journal_file.write('{"type": "page", "page": 9, "ite')
+
+    resumed = CheckpointJournal(journal.path)
+    assert list(resumed.load("https://contoh.com/")) == [1]
+    resumed.record(2, [{"Title": "B"}])
+    resumed.record(3, [{"Title": "C"}])
+
+    assert sorted(CheckpointJournal(journal.path).load("https://contoh.com/")) == [1, 2, 3]
+
+def test_journal_for_other_catalog_is_discarded(journal):
+    """Menguji apakah jurnal milik URL katalog lain tidak dipakai."""
+    journal.load("https://contoh.com/")
+    journal.record(1, [{"Title": "A"}])
+
+    assert journal.load("https://lain.com/") == {}
+
+@pytest.mark.parametrize("scrape_options", [
+    {"pages_to_scrape": 4, "wait_seconds": 0},
+    {"pages_to_scrape": 4, "concurrency": 2},
+    {"wait_seconds": 0},
+])
+def test_resume_continues_from_last_good_page(journal, scrape_options):
+    """Menguji apakah run yang gagal di halaman 3 dilanjutkan tanpa mengambil ulang halaman 1 dan 2."""
+    with patch('utils.extract.retrieve_page_content', side_effect=fake_catalog(failing_page=3)):
+        partial_df = collect_fashion_data(checkpoint=journal, **scrape_options)
+    assert partial_df['Title'].tolist() == ["Produk 1", "Produk 2"]
+    assert os.path.exists(journal.path)
+
+    with patch('utils.extract.retrieve_page_content', side_effect=fake_catalog()) as mock_fetcher_func:
+        resumed_df = collect_fashion_data(checkpoint=journal, **scrape_options)
+
+    assert resumed_df['Title'].tolist() == ["Produk 1", "Produk 2", "Produk 3", "Produk 4"]
+    fetched_urls = [call.args[0] for call in mock_fetcher_func.call_args_list]
+    assert "https://fashion-studio.dicoding.dev/" not in fetched_urls
+    assert "https://fashion-studio.dicoding.dev/page2" not in fetched_urls
+    # Run yang selesai menghapus jurnal
+    assert not os.path.exists(journal.path)
+
+def test_stream_resume_does_not_duplicate_parquet_rows(tmp_path, journal):
+    """Menguji apakah halaman dari jurnal yang dimuat ulang pada --stream --resume tidak menggandakan baris Parquet."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    dataset_path = str(tmp_path / "products_parquet")
+
+    def run_stream(fetch):
+        with patch('utils.extract.retrieve_page_content', side_effect=fetch):
+            raw_batches = iter_fashion_batches(pages_to_scrape=4, wait_seconds=0, checkpoint=journal)
+            return process_stream(transform_batches(raw_batches), filename=str(tmp_path / "products.csv"),
+                                  spreadsheet_info=None, parquet_path=dataset_path)
+
+    assert run_stream(fake_catalog(failing_page=3)) == 2
+    assert run_stream(fake_catalog()) == 4
+
+    assert sorted(pq.read_table(dataset_path).column("Title").to_pylist()) == [f"Produk {page}" for page in range(1, 5)]
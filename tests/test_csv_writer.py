@@ -0,0 +1,146 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.csv_writer import AtomicCsvWriter, zstandard
+
+@pytest.fixture
+def product_batches():
+    """Dua batch produk bersih; batch kedua mengulang satu produk dari batch pertama dengan Timestamp baru."""
+    first = pd.DataFrame({
+        "Title": ["Kemeja Denim", "Dress Musim Panas"],
+        "Price": [256000.0, 320000.0],
+        "Rating": [4.5, np.nan],
+        "Size": ["M", "S"],
+        "Gender": ["Men", "Women"],
+        "Timestamp": ["2025-05-10T10:00:00.000000", "2025-05-10T11:00:00.000000"],
+    })
+    second = pd.DataFrame({
+        "Title": ["Dress Musim Panas", "Jaket Bomber"],
+        "Price": [320000.0, 780000.0],
+        "Rating": [np.nan, 4.8],
+        "Size": ["S", "L"],
+        "Gender": ["Women", "Unisex"],
+        "Timestamp": ["2025-05-11T11:00:00.000000", "2025-05-11T12:00:00.000000"],
+    })
+    return first, second
+
+def write_batches(path, batches, **kwargs):
+    with AtomicCsvWriter(str(path), **kwargs) as writer:
+        for batch in batches:
+            writer.write(batch)
+    return writer
+
+def test_failed_write_keeps_previous_file(tmp_path, product_batches):
+    """Menguji apakah kegagalan di tengah penulisan membiarkan file lama utuh dan membuang file sementara."""
+    path = tmp_path / "products.csv"
+    write_batches(path, [product_batches[0]])
+    before = path.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with AtomicCsvWriter(str(path), append=True) as writer:
+            writer.write(product_batches[1])
+            raise RuntimeError("proses terhenti")
+
+    assert path.read_bytes() == before
+    assert not os.path.exists(f"{path}.tmp")
+
+@pytest.mark.parametrize("suffix", [
+    ".csv",
+    ".csv.gz",
+    pytest.param(".csv.zst", marks=pytest.mark.skipif(zstandard is None, reason="zstandard tidak terpasang")),
+])
+def test_append_is_readable_with_compression(tmp_path, product_batches, suffix):
+    """Menguji apakah hasil append (termasuk gzip dan zstd) terbaca pandas sebagai satu tabel dengan satu header."""
+    path = tmp_path / f"products{suffix}"
+    write_batches(path, [product_batches[0]])
+    writer = write_batches(path, [product_batches[1]], append=True)
+
+    expected = pd.concat(product_batches, ignore_index=True)
+    pd.testing.assert_frame_equal(pd.read_csv(path), expected)
+    assert writer.rows_written == 2
+    assert writer.bytes_written > 0
+
+def test_skip_existing_uses_sidecar_index(tmp_path, product_batches):
+    """Menguji apakah baris yang sudah ada di file dilewati saat append, dengan Timestamp diabaikan sebagai kunci."""
+    path = tmp_path / "products.csv.gz"
+    write_batches(path, [product_batches[0]])
+    assert os.path.exists(f"{path}.keys.npz")
+
+    writer = write_batches(path, [product_batches[1], product_batches[1]], append=True, skip_existing=True)
+
+    assert writer.rows_written == 1
+    assert writer.rows_skipped == 3
+    assert pd.read_csv(path)["Title"].tolist() == ["Kemeja Denim", "Dress Musim Panas", "Jaket Bomber"]
+
+def test_stale_index_is_rebuilt_from_csv(tmp_path, product_batches, capsys):
+    """Menguji apakah indeks yang tidak cocok dengan isi file dibangun ulang dari CSV sebelum baris dilewati."""
+    path = tmp_path / "products.csv"
+    write_batches(path, [product_batches[0]])
+    os.remove(f"{path}.keys.npz")
+
+    writer = write_batches(path, [product_batches[1]], append=True, skip_existing=True)
+
+    assert "dibangun ulang" in capsys.readouterr().out
+    assert writer.rows_skipped == 1
+    with np.load(f"{path}.keys.npz") as index:
+        assert len(index["keys"]) == 3
+        assert int(index["data_size"]) == path.stat().st_size
+
+@pytest.mark.parametrize("suffix", [".csv", ".csv.gz"])
+def test_target_changes_only_when_session_is_published(tmp_path, product_batches, suffix):
+    """Menguji apakah commit di tengah sesi tidak menyentuh file tujuan sehingga pembaca tidak melihat batch terpotong."""
+    path = tmp_path / f"products{suffix}"
+    write_batches(path, [product_batches[0]])
+    before = path.read_bytes()
+
+    with AtomicCsvWriter(str(path), append=True) as writer:
+        writer.write(product_batches[1])
+        assert writer.commit() > 0
+        assert path.read_bytes() == before
+
+    pd.testing.assert_frame_equal(pd.read_csv(path), pd.concat(product_batches, ignore_index=True))
+    assert not os.path.exists(f"{path}.tmp")
+
+def test_killed_session_leaves_target_readable(tmp_path, product_batches):
+    """Menguji apakah proses yang mati di tengah batch gzip tidak merusak file tujuan maupun sesi berikutnya."""
+    path = tmp_path / "products.csv.gz"
+    write_batches(path, [product_batches[0]])
+    before = path.read_bytes()
+
+    writer = AtomicCsvWriter(str(path), append=True)
+    writer.open()
+    writer.write(product_batches[1])
+    writer._raw.close()  # tiru proses yang mati: member gzip di file sementara tidak pernah ditutup
+
+    assert path.read_bytes() == before
+    pd.testing.assert_frame_equal(pd.read_csv(path), product_batches[0])
+    write_batches(path, [product_batches[1]], append=True)
+    pd.testing.assert_frame_equal(pd.read_csv(path), pd.concat(product_batches, ignore_index=True))
+
+def test_abort_publishes_only_committed_batches(tmp_path, product_batches):
+    """Menguji apakah batch yang sudah di-commit tetap diterbitkan saat sesi gagal, tanpa batch yang belum di-commit."""
+    path = tmp_path / "products.csv.gz"
+
+    with pytest.raises(RuntimeError):
+        with AtomicCsvWriter(str(path)) as writer:
+            writer.write(product_batches[0])
+            writer.commit()
+            writer.write(product_batches[1])
+            raise RuntimeError("proses terhenti")
+
+    pd.testing.assert_frame_equal(pd.read_csv(path), product_batches[0])
+    with np.load(f"{path}.keys.npz") as index:
+        assert len(index["keys"]) == 2
+        assert int(index["data_size"]) == path.stat().st_size
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        AtomicCsvWriter(str(tmp_path / "products.csv"), compression="bz2")
@@ -0,0 +1,102 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.dedup import ProductDeduplicator, BloomFilter
+
+@pytest.fixture
+def duplicated_snapshot():
+    """Data produk bersih dengan dua duplikat (beda Timestamp) dan satu varian ukuran."""
+    return pd.DataFrame({
+        "Title": ["Kemeja Denim", "Dress Musim Panas", "Kemeja Denim", "Kemeja Denim", "Dress Musim Panas"],
+        "Price": [256000.0, 320000.0, 256000.0, 256000.0, 320000.0],
+        "Rating": [4.5, 3.9, 4.5, 4.5, 3.9],
+        "Colors": [2, 4, 2, 2, 4],
+        "Size": ["M", "S", "M", "L", "S"],
+        "Gender": ["Men", "Women", "Men", "Men", "Women"],
+        "Timestamp": ["2025-05-10T12:00:00.000000", "2025-05-10T09:00:00.000000",
+                      "2025-05-10T10:00:00.000000", "2025-05-10T10:00:00.000000",
+                      "2025-05-10T11:00:00.000000"],
+    })
+
+@pytest.fixture(params=["exact", "bloom"])
+def deduplicator(request, tmp_path):
+    """Menyediakan ProductDeduplicator untuk setiap mode."""
+    dedup = ProductDeduplicator(mode=request.param, capacity=1000,
+                                spill_path=str(tmp_path / "state" / "dedup.sqlite"))
+    yield dedup
+    dedup.close()
+
+def test_filter_keeps_latest_timestamp_per_product(deduplicator, duplicated_snapshot):
+    """Menguji apakah hanya baris dengan Timestamp terbaru per produk yang dipertahankan, urutan asli tetap."""
+    result = deduplicator.filter(duplicated_snapshot)
+
+    assert result.index.tolist() == [0, 3, 4]
+    assert deduplicator.dropped == 2
+
+def test_filter_drops_products_seen_in_earlier_batches(deduplicator, duplicated_snapshot):
+    """Menguji apakah produk yang sudah dilewatkan di batch sebelumnya dibuang pada batch berikutnya."""
+    batches = [duplicated_snapshot.iloc[:2], duplicated_snapshot.iloc[2:]]
+    result = pd.concat(list(deduplicator.filter_batches(batches)))
+
+    assert result.index.tolist() == [0, 1, 3]
+    assert deduplicator.dropped == 2
+    assert deduplicator.rows_seen == 5
+
+def test_custom_key_columns(duplicated_snapshot):
+    """Menguji apakah kolom kunci bisa diatur, misalnya hanya Title."""
+    dedup = ProductDeduplicator(key_columns=("Title",))
+    result = dedup.filter(duplicated_snapshot)
+
+    assert result.index.tolist() == [0, 4]
+
+def test_report_prints_dropped_count(capsys, duplicated_snapshot):
+    """Menguji apakah jumlah duplikat yang dibuang dilaporkan."""
+    dedup = ProductDeduplicator()
+    dedup.filter(duplicated_snapshot)
+    dedup.report()
+
+    assert "2 duplikat dibuang dari 5 baris" in capsys.readouterr().out
+
+def test_bloom_mode_matches_exact_mode_on_many_batches(tmp_path):
+    """Menguji apakah mode bloom dengan filter yang terlalu kecil tetap sama tepatnya dengan mode exact."""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "Title": [f"Produk {i}" for i in rng.integers(0, 3000, 20_000)],
+        "Timestamp": pd.Timestamp(2025, 1, 1) + pd.to_timedelta(rng.integers(0, 10**6, 20_000), unit='s'),
+    })
+    batches = [data.iloc[start:start + 1000] for start in range(0, len(data), 1000)]
+
+    exact = ProductDeduplicator(key_columns=("Title",))
+    bloom = ProductDeduplicator(key_columns=("Title",), mode="bloom", capacity=100,
+                                spill_path=str(tmp_path / "dedup.sqlite"))
+    try:
+        exact_rows = pd.concat(list(exact.filter_batches(batches)))
+        bloom_rows = pd.concat(list(bloom.filter_batches(batches)))
+    finally:
+        bloom.close()
+
+    pd.testing.assert_frame_equal(bloom_rows, exact_rows)
+    assert bloom.dropped == exact.dropped == len(data) - data["Title"].nunique()
+    assert not os.path.exists(tmp_path / "dedup.sqlite")
+
+def test_bloom_filter_has_no_false_negatives():
+    """Menguji apakah semua kunci yang ditambahkan selalu dikenali oleh Bloom filter."""
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    keys = np.random.default_rng(1).integers(-2**63, 2**63 - 1, 10_000, dtype=np.int64)
+    bloom.add(keys)
+
+    assert bloom.might_contain(keys).all()
+    others = np.random.default_rng(2).integers(-2**63, 2**63 - 1, 10_000, dtype=np.int64)
+    assert bloom.might_contain(others).mean() < 0.05
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ProductDeduplicator(mode="lsh")
@@ -1,4 +1,5 @@
 import unittest
+import pytest
 from unittest.mock import patch, MagicMock
 import sys
 import os
@@ -18,15 +19,63 @@ from utils.extract import (
     parse_text_by_keyword,
     parse_fashion_item,
     collect_fashion_data,
+    fetch_pages_async,
+    TokenBucket,
+    create_http_session,
+    configure_page_cache,
+    classify_paragraphs,
+    parse_page_products,
+    available_parser_backends,
+    parse_pages_in_pool,
+    iter_fashion_batches,
+    discover_page_count,
+    fetch_page_with_status,
+    PageDiscoveryError,
+    find_next_page_url,
+    ProductRecordBuilder,
     HEADERS
 )
+from utils.resilience import RetryPolicy, CircuitBreaker
+from utils.cache import PageCache
+import tempfile
+import asyncio
+
+# Halaman contoh dengan markup kartu seperti situs asli, termasuk kartu yang datanya tidak lengkap
+SAMPLE_PAGE_HTML = """
+<html><body><div class="collection-grid">
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">T-shirt 2</h3>
+            <div class="price-container"><span class="price">$102.15</span></div>
+            <p style="font-size: 14px;">Rating: ⭐ 3.9 / 5</p>
+            <p style="font-size: 14px;">3 Colors</p>
+            <p style="font-size: 14px;">Size: M</p>
+            <p style="font-size: 14px;">Gender: Women</p>
+        </div>
+    </div>
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">Unknown Product</h3>
+            <div class="price-container"><span class="price">Price Unavailable</span></div>
+            <p>Rating: ⭐ Invalid Rating / 5</p>
+            <p>Rating: ⭐ 4.1 / 5</p>
+            <p>  5   Colors </p>
+            <p>Size: XXL</p>
+        </div>
+    </div>
+    <div class="collection-card">
+        <div class="product-details"><h3 class="product-title">  Jacket 7 </h3></div>
+    </div>
+</div></body></html>
+"""
 
 class TestDataExtractionLogic(unittest.TestCase):
     """Kumpulan tes untuk memverifikasi fungsionalitas modul ekstraksi data."""
 
-    @patch('utils.extract.requests.get')
-    def test_retrieve_page_html_on_success(self, mock_http_get):
+    @patch('utils.extract.get_http_session')
+    def test_retrieve_page_html_on_success(self, mock_get_session):
         """Tes: retrieve_page_content mengembalikan konten HTML jika request sukses (status 200)."""
+        mock_http_get = mock_get_session.return_value.get
         # Persiapan mock untuk respons HTTP yang sukses
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -41,11 +90,12 @@ class TestDataExtractionLogic(unittest.TestCase):
         # Verifikasi: Konten yang diterima sesuai dan request.get dipanggil dengan benar
         self.assertEqual(html_text, "<html><body>Konten Uji Coba</body></html>")
         self.assertEqual(mock_http_get.call_count, 1) # Pastikan dipanggil sekali
-        mock_http_get.assert_called_once_with(test_url, headers=HEADERS, timeout=10)
+        mock_http_get.assert_called_once_with(test_url, timeout=10)
 
-    @patch('utils.extract.requests.get')
-    def test_retrieve_page_html_on_request_exception(self, mock_http_get):
+    @patch('utils.extract.get_http_session')
+    def test_retrieve_page_html_on_request_exception(self, mock_get_session):
         """Tes: retrieve_page_content mengembalikan None jika terjadi RequestException (misal: jaringan error)."""
+        mock_http_get = mock_get_session.return_value.get
         # Persiapan mock untuk mensimulasikan kegagalan request
         mock_http_get.side_effect = requests.exceptions.RequestException("Simulasi Error Jaringan")
 
@@ -56,7 +106,103 @@ class TestDataExtractionLogic(unittest.TestCase):
         # Verifikasi: Hasilnya None dan request.get tetap dipanggil
         self.assertIsNone(html_text)
         self.assertEqual(mock_http_get.call_count, 1)
-        mock_http_get.assert_called_once_with(test_url, headers=HEADERS, timeout=10)
+        mock_http_get.assert_called_once_with(test_url, timeout=10)
+
+    @patch('utils.extract.get_http_session')
+    def test_fetch_page_with_status_separates_not_found_from_network_error(self, mock_get_session):
+        """Tes: fetch_page_with_status mengembalikan 404 untuk halaman yang tidak ada dan None untuk error jaringan."""
+        mock_http_get = mock_get_session.return_value.get
+        not_found = MagicMock(status_code=404)
+        not_found.raise_for_status.side_effect = requests.exceptions.HTTPError("404", response=not_found)
+        mock_http_get.return_value = not_found
+        self.assertEqual(fetch_page_with_status("http://contoh.com/page99"), (None, 404))
+
+        mock_http_get.side_effect = requests.exceptions.ConnectionError("Simulasi Error Jaringan")
+        self.assertEqual(fetch_page_with_status("http://contoh.com/page32"), (None, None))
+
+    @patch('utils.extract.get_http_session')
+    def test_retrieve_page_uses_cache_and_revalidates(self, mock_get_session):
+        """Tes: retrieve_page_content memakai entri cache yang segar dan merevalidasi entri kedaluwarsa dengan 304."""
+        mock_http_get = mock_get_session.return_value.get
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PageCache(os.path.join(tmp_dir, "pages.sqlite"), ttl=60)
+            configure_page_cache(cache)
+            try:
+                first_response = MagicMock(status_code=200, text="<html>v1</html>", headers={"ETag": '"v1"'})
+                mock_http_get.return_value = first_response
+                self.assertEqual(retrieve_page_content("http://contoh.com/"), "<html>v1</html>")
+
+                # Entri masih segar: tidak ada request baru
+                self.assertEqual(retrieve_page_content("http://contoh.com/"), "<html>v1</html>")
+                self.assertEqual(mock_http_get.call_count, 1)
+
+                # Entri kedaluwarsa: request kondisional dan server membalas 304
+                cache.ttl = 0
+                mock_http_get.return_value = MagicMock(status_code=304)
+                self.assertEqual(retrieve_page_content("http://contoh.com/"), "<html>v1</html>")
+                mock_http_get.assert_called_with("http://contoh.com/", timeout=10, headers={"If-None-Match": '"v1"'})
+                self.assertEqual(cache.stats["hits"], 1)
+                self.assertEqual(cache.stats["misses"], 1)
+                self.assertEqual(cache.stats["revalidated"], 1)
+            finally:
+                configure_page_cache(None)
+                cache.close()
+
+    @patch('utils.extract.time.sleep')
+    @patch('utils.extract.get_http_session')
+    def test_retrieve_page_retries_transient_errors(self, mock_get_session, mock_time_sleep):
+        """Tes: retrieve_page_content mengulang timeout dan 503 (menghormati Retry-After) sampai berhasil."""
+        mock_http_get = mock_get_session.return_value.get
+        unavailable = MagicMock(status_code=503, headers={"Retry-After": "7"})
+        success = MagicMock(status_code=200, text="<html>OK</html>")
+        mock_http_get.side_effect = [requests.exceptions.Timeout("lambat"), unavailable, success]
+        policy = RetryPolicy(max_attempts=4, backoff_base=0.01)
+
+        html_text = retrieve_page_content("http://contoh.com/", retry_policy=policy)
+
+        self.assertEqual(html_text, "<html>OK</html>")
+        self.assertEqual(mock_http_get.call_count, 3)
+        self.assertGreaterEqual(mock_time_sleep.call_args_list[1].args[0], 7)
+        metrics = policy.metrics.snapshot()
+        self.assertEqual(metrics["outcomes"], {"timeout": 1, "http_5xx": 1, "success": 1})
+        self.assertEqual(metrics["retries"], 2)
+
+    @patch('utils.extract.time.sleep')
+    @patch('utils.extract.get_http_session')
+    def test_retrieve_page_stops_when_circuit_opens(self, mock_get_session, mock_time_sleep):
+        """Tes: setelah circuit breaker terbuka, request berikutnya langsung ditolak tanpa menghubungi server."""
+        mock_http_get = mock_get_session.return_value.get
+        mock_http_get.side_effect = requests.exceptions.ConnectionError("server mati")
+        policy = RetryPolicy(max_attempts=3, backoff_base=0.01, circuit_breaker=CircuitBreaker(failure_threshold=3))
+
+        self.assertIsNone(retrieve_page_content("http://contoh.com/1", retry_policy=policy))
+        self.assertIsNone(retrieve_page_content("http://contoh.com/2", retry_policy=policy))
+
+        self.assertEqual(mock_http_get.call_count, 3)
+        self.assertEqual(policy.metrics.snapshot()["outcomes"]["circuit_open"], 1)
+
+    @patch('utils.extract.retrieve_page_content')
+    def test_collect_with_adaptive_concurrency_matches_fixed(self, mock_fetcher_func):
+        """Tes: mode konkurensi adaptif menghasilkan data yang sama dengan konkurensi tetap."""
+        mock_fetcher_func.side_effect = lambda url: SAMPLE_PAGE_HTML.replace("T-shirt 2", url)
+
+        fixed_df = collect_fashion_data(pages_to_scrape=6, concurrency=4)
+        adaptive_df = collect_fashion_data(pages_to_scrape=6, concurrency=4, adaptive_concurrency=True)
+
+        pd.testing.assert_frame_equal(adaptive_df.drop(columns=['Timestamp']), fixed_df.drop(columns=['Timestamp']))
+
+    def test_http_session_pools_connections_and_sends_headers(self):
+        """Tes: create_http_session memasang adapter ber-pool dan header bawaan untuk semua request."""
+        session = create_http_session(pool_size=7)
+
+        adapter = session.get_adapter("https://fashion-studio.dicoding.dev/")
+        self.assertEqual(adapter._pool_connections, 7)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertIs(adapter, session.get_adapter("http://contoh.com/"))
+        self.assertEqual(session.headers["User-Agent"], HEADERS["User-Agent"])
+        self.assertIn("gzip", session.headers["Accept-Encoding"])
+        self.assertEqual(session.headers["Connection"], "keep-alive")
+        session.close()
 
     def test_parse_keyword_text_when_found(self):
         """Tes: parse_text_by_keyword berhasil mengekstrak teks yang diinginkan jika keyword dan pola cocok."""
@@ -237,5 +383,271 @@ class TestDataExtractionLogic(unittest.TestCase):
             self.assertEqual(mock_parser_func.call_count, 2)
             mock_time_sleep.assert_called_once_with(0.01)
 
+    @patch('utils.extract.retrieve_page_content')
+    def test_fetch_pages_async_preserves_url_order(self, mock_fetcher_func):
+        """Tes: fetch_pages_async mengembalikan hasil sesuai urutan URL meskipun request selesai tidak berurutan."""
+        mock_fetcher_func.side_effect = lambda url: f"<html>{url}</html>"
+        urls = [f"http://contoh.com/page{i}" for i in range(1, 6)]
+
+        html_pages = asyncio.run(fetch_pages_async(urls, concurrency=3))
+
+        self.assertEqual(html_pages, [f"<html>{url}</html>" for url in urls])
+        self.assertEqual(mock_fetcher_func.call_count, 5)
+
+    def test_token_bucket_limits_request_rate(self):
+        """Tes: TokenBucket menahan request setelah kapasitas burst habis."""
+        async def acquire_many(bucket, count):
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(count):
+                await bucket.acquire()
+            return loop.time() - start
+
+        bucket = TokenBucket(rate=20, capacity=2)
+        # 2 token pertama langsung tersedia, 2 token berikutnya butuh sekitar 0.1 detik
+        elapsed = asyncio.run(acquire_many(bucket, 4))
+        self.assertGreaterEqual(elapsed, 0.08)
+
+    @patch('utils.extract.retrieve_page_content')
+    @patch('utils.extract.time.sleep')
+    def test_collect_async_mode_matches_sequential_mode(self, mock_time_sleep, mock_fetcher_func):
+        """Tes: mode asyncio menghasilkan DataFrame yang sama dengan mode berurutan, dalam urutan halaman."""
+        def fake_page(url):
+            page_name = url.rstrip('/').rsplit('/', 1)[-1]
+            return f"""
+                <div class="collection-card">
+                    <h3 class="product-title">Produk {page_name}</h3>
+                    <div class="price-container">$10.00</div>
+                    <p>Rating: ⭐ 4.0</p>
+                </div>
+            """
+        mock_fetcher_func.side_effect = fake_page
+
+        fixed_dt = datetime(2024, 5, 25, 12, 0, 0)
+        with patch('utils.extract.datetime') as mock_dt:
+            mock_dt.now.return_value = fixed_dt
+            sequential_df = collect_fashion_data(pages_to_scrape=4, wait_seconds=0)
+            async_df = collect_fashion_data(pages_to_scrape=4, concurrency=3, rate_limit=100)
+
+        pd.testing.assert_frame_equal(async_df, sequential_df)
+        self.assertEqual(async_df['Title'].tolist()[0], "Produk fashion-studio.dicoding.dev")
+        self.assertEqual(async_df['Title'].tolist()[1], "Produk page2")
+
+    @patch('utils.extract.retrieve_page_content')
+    def test_collect_async_mode_stops_at_first_failed_page(self, mock_fetcher_func):
+        """Tes: mode asyncio membuang halaman setelah halaman pertama yang gagal, sama seperti mode berurutan."""
+        card_html = '<div class="collection-card"><h3 class="product-title">A</h3></div>'
+        mock_fetcher_func.side_effect = lambda url: None if url.endswith('page2') else card_html
+
+        result_df = collect_fashion_data(pages_to_scrape=3, concurrency=2)
+
+        self.assertEqual(len(result_df), 1)
+
+    def test_classify_paragraphs_matches_keyword_parser(self):
+        """Tes: classify_paragraphs dalam satu lintasan memberi hasil sama dengan parse_text_by_keyword per kolom."""
+        texts = ["Rating: ⭐ Invalid", "Rating: ⭐ 4.5 / 5", "2 Colors", "Gender: Men", "Size: L", "Gender: Women"]
+        elements = []
+        for text in texts:
+            element = MagicMock()
+            element.get_text.return_value = text
+            elements.append(element)
+
+        result = classify_paragraphs(texts)
+
+        self.assertEqual(result, {
+            "Rating": parse_text_by_keyword(elements, "Rating", r"Rating:\s*(⭐\s*\d+(?:\.\d+)?)", "Rating Tidak Valid"),
+            "Colors": parse_text_by_keyword(elements, "Colors", r"(\d+)\s*Colors", "Warna Tidak Ada"),
+            "Size": parse_text_by_keyword(elements, "Size", r"Size:\s*(\w+)", "Ukuran Tidak Diketahui"),
+            "Gender": parse_text_by_keyword(elements, "Gender", r"Gender:\s*(\w+)", "Gender Tidak Diketahui"),
+        })
+        self.assertEqual(result["Rating"], "⭐ 4.5")
+        self.assertEqual(result["Gender"], "Men")
+
+    def test_parse_page_products_reference_items(self):
+        """Tes: html.parser (acuan paritas backend lain) mengekstrak kartu contoh dengan benar."""
+        reference_items = parse_page_products(SAMPLE_PAGE_HTML, 1, "html.parser")
+
+        self.assertEqual(len(reference_items), 3)
+        self.assertEqual(reference_items[0]["Price"], "$102.15")
+        self.assertEqual(reference_items[1]["Rating"], "⭐ 4.1")
+        self.assertEqual(reference_items[1]["Colors"], "5")
+        self.assertEqual(reference_items[2]["Title"], "Jacket 7")
+
+    @unittest.skipUnless("selectolax" in available_parser_backends(), "selectolax tidak terpasang")
+    def test_collect_with_selectolax_backend(self):
+        """Tes: collect_fashion_data dapat memakai backend selectolax."""
+        with patch('utils.extract.retrieve_page_content', return_value=SAMPLE_PAGE_HTML):
+            result_df = collect_fashion_data(pages_to_scrape=1, wait_seconds=0, parser_backend="selectolax")
+
+        self.assertEqual(result_df['Title'].tolist(), ["T-shirt 2", "Unknown Product", "Jacket 7"])
+
+    def test_collect_rejects_unknown_parser_backend(self):
+        """Tes: backend parser yang tidak dikenal langsung ditolak sebelum scraping dimulai."""
+        with self.assertRaises(ValueError):
+            collect_fashion_data(pages_to_scrape=1, parser_backend="regex")
+
+    def test_parse_pages_in_pool_keeps_page_order(self):
+        """Tes: parsing di ProcessPoolExecutor mengembalikan hasil per halaman sesuai urutan halaman."""
+        page_html = [(page, SAMPLE_PAGE_HTML.replace("T-shirt 2", f"T-shirt halaman {page}")) for page in range(1, 8)]
+
+        parsed_pages = list(parse_pages_in_pool(iter(page_html), "html.parser", workers=2, chunksize=3))
+
+        self.assertEqual([page for page, _ in parsed_pages], list(range(1, 8)))
+        self.assertEqual(parsed_pages[4][1][0]["Title"], "T-shirt halaman 5")
+        self.assertEqual(len(parsed_pages[6][1]), 3)
+
+    @patch('utils.extract.retrieve_page_content')
+    def test_collect_with_parse_workers_matches_inline_parsing(self, mock_fetcher_func):
+        """Tes: mode parser multi-proses menghasilkan DataFrame yang sama dengan parsing inline."""
+        mock_fetcher_func.side_effect = lambda url: SAMPLE_PAGE_HTML.replace("T-shirt 2", url)
+
+        inline_df = collect_fashion_data(pages_to_scrape=5, concurrency=2)
+        pooled_df = collect_fashion_data(pages_to_scrape=5, concurrency=2, parse_workers=2, parse_chunksize=2)
+
+        self.assertEqual(len(pooled_df), 15)
+        pd.testing.assert_frame_equal(
+            pooled_df.drop(columns=['Timestamp']), inline_df.drop(columns=['Timestamp'])
+        )
+
+    @patch('utils.extract.retrieve_page_content', return_value=SAMPLE_PAGE_HTML)
+    def test_iter_fashion_batches_yields_bounded_batches(self, mock_fetcher_func):
+        """Tes: iter_fashion_batches menghasilkan batch per halaman atau per N baris sesuai urutan halaman."""
+        page_batches = list(iter_fashion_batches(pages_to_scrape=3, wait_seconds=0))
+        row_batches = list(iter_fashion_batches(pages_to_scrape=3, batch_size=4, concurrency=2))
+
+        self.assertEqual([len(batch) for batch in page_batches], [3, 3, 3])
+        self.assertEqual([len(batch) for batch in row_batches], [4, 4, 1])
+        full_df = collect_fashion_data(pages_to_scrape=3, concurrency=2)
+        self.assertEqual(pd.concat(row_batches)['Title'].tolist(), full_df['Title'].tolist())
+
+    def _fake_catalog(self, last_page):
+        """Buat pengganti retrieve_page_content untuk katalog dengan last_page halaman."""
+        def fetch(url):
+            page_name = url.rstrip('/').rsplit('/', 1)[-1]
+            page = 1 if not page_name.startswith('page') else int(page_name[4:])
+            if page > last_page:
+                return None
+            next_link = f'<li class="page-item next"><a class="page-link" href="/page{page + 1}">Next</a></li>' if page < last_page else ''
+            return SAMPLE_PAGE_HTML.replace("T-shirt 2", f"T-shirt {page}") + f'<ul class="pagination">{next_link}</ul>'
+        return fetch
+
+    def _fake_status_catalog(self, last_page, failures=None):
+        """Buat pengganti fetch_page_with_status; failures memetakan nomor halaman -> jumlah kegagalan sementara."""
+        fetch_html = self._fake_catalog(last_page)
+        failures = dict(failures or {})
+
+        def fetch(url):
+            page_name = url.rstrip('/').rsplit('/', 1)[-1]
+            page = 1 if not page_name.startswith('page') else int(page_name[4:])
+            if failures.get(page):
+                failures[page] -= 1
+                return None, 503
+            html_content = fetch_html(url)
+            return (html_content, 200) if html_content else (None, 404)
+        return fetch
+
+    def test_find_next_page_url_resolves_relative_link(self):
+        """Tes: find_next_page_url mengembalikan URL absolut dari tautan Next, atau None di halaman terakhir."""
+        html_with_next = '<ul class="pagination"><li class="page-item next"><a class="page-link" href="/page3">Next</a></li></ul>'
+        html_last_page = '<ul class="pagination"><li class="page-item"><a class="page-link" href="/page1">Previous</a></li></ul>'
+
+        self.assertEqual(
+            find_next_page_url(html_with_next, "https://fashion-studio.dicoding.dev/page2"),
+            "https://fashion-studio.dicoding.dev/page3"
+        )
+        self.assertIsNone(find_next_page_url(html_last_page, "https://fashion-studio.dicoding.dev/page2"))
+
+    def test_parse_page_products_shares_one_timestamp_per_page(self):
+        """Tes: semua produk dalam satu halaman memakai timestamp yang sama."""
+        for backend in available_parser_backends():
+            with self.subTest(backend=backend):
+                items = parse_page_products(SAMPLE_PAGE_HTML, 1, backend)
+                self.assertGreater(len(items), 1)
+                self.assertEqual(len({item['Timestamp'] for item in items}), 1)
+
+    def test_record_builder_matches_dataframe_from_dicts(self):
+        """Tes: ProductRecordBuilder menghasilkan DataFrame bertipe yang sama dengan pd.DataFrame(list of dict)."""
+        items = parse_page_products(SAMPLE_PAGE_HTML, 1) + parse_page_products(SAMPLE_PAGE_HTML, 2)
+        builder = ProductRecordBuilder()
+        builder.extend(items)
+
+        result_df = builder.to_frame()
+
+        pd.testing.assert_frame_equal(result_df, pd.DataFrame(items))
+        self.assertEqual(result_df['Timestamp'].dtype, 'datetime64[ns]')
+        self.assertEqual(len(builder), 0)
+        self.assertTrue(builder.to_frame().empty)
+
+    def test_record_builder_fills_columns_missing_from_earlier_rows(self):
+        """Tes: kolom yang baru muncul di tengah jalan diisi None untuk baris sebelumnya."""
+        builder = ProductRecordBuilder()
+        builder.append({"Title": "A", "Price": "$1"})
+        builder.append({"Title": "B", "Rating": "4.5"})
+
+        result_df = builder.to_frame()
+
+        self.assertEqual(list(result_df.columns), ["Title", "Price", "Rating"])
+        self.assertEqual(result_df['Price'].tolist(), ["$1", None])
+        self.assertEqual(result_df['Rating'].tolist(), [None, "4.5"])
+
+    @patch('utils.extract.fetch_page_with_status')
+    def test_discover_page_count_finds_last_page_with_few_probes(self, mock_fetcher_func):
+        """Tes: discover_page_count menemukan jumlah halaman sebenarnya dengan probe jauh lebih sedikit dari jumlah halaman."""
+        for last_page in (0, 1, 37, 50, 64, 1000):
+            with self.subTest(last_page=last_page):
+                mock_fetcher_func.reset_mock()
+                mock_fetcher_func.side_effect = self._fake_status_catalog(last_page)
+
+                self.assertEqual(discover_page_count(concurrency=5, max_pages=1000), last_page)
+                self.assertLess(mock_fetcher_func.call_count, 40)
+
+    @patch('utils.extract.fetch_page_with_status')
+    @patch('utils.extract.time.sleep')
+    def test_discover_page_count_retries_failed_probe(self, mock_time_sleep, mock_fetcher_func):
+        """Tes: probe yang gagal sementara diulang dan tidak dianggap sebagai halaman yang tidak ada."""
+        mock_fetcher_func.side_effect = self._fake_status_catalog(50, failures={32: 1})
+
+        self.assertEqual(discover_page_count(concurrency=5, max_pages=1000), 50)
+        mock_time_sleep.assert_called()
+
+    @patch('utils.extract.fetch_page_with_status')
+    @patch('utils.extract.time.sleep')
+    def test_discover_page_count_aborts_when_probe_keeps_failing(self, mock_time_sleep, mock_fetcher_func):
+        """Tes: probe yang terus gagal menghentikan discovery alih-alih mempersempit jumlah halaman."""
+        mock_fetcher_func.side_effect = self._fake_status_catalog(50, failures={32: 10})
+
+        with self.assertRaises(PageDiscoveryError):
+            discover_page_count(concurrency=5, max_pages=1000, probe_attempts=3)
+
+    @patch('utils.extract.fetch_page_with_status')
+    @patch('utils.extract.retrieve_page_content')
+    @patch('utils.extract.time.sleep')
+    def test_collect_discovers_pages_in_both_modes(self, mock_time_sleep, mock_fetcher_func, mock_status_func):
+        """Tes: tanpa pages_to_scrape, mode berurutan mengikuti tautan Next dan mode asyncio memakai probing."""
+        mock_fetcher_func.side_effect = self._fake_catalog(7)
+        mock_status_func.side_effect = self._fake_status_catalog(7)
+
+        linked_df = collect_fashion_data(wait_seconds=0)
+        self.assertEqual(mock_fetcher_func.call_count, 7)
+        probed_df = collect_fashion_data(concurrency=3)
+
+        self.assertEqual(len(linked_df), 21)
+        self.assertEqual(linked_df['Title'].iloc[-3], "T-shirt 7")
+        pd.testing.assert_frame_equal(
+            probed_df.drop(columns=['Timestamp']), linked_df.drop(columns=['Timestamp'])
+        )
+
+@pytest.mark.parametrize("backend, module", [("lxml", "lxml"), ("selectolax", "selectolax")])
+def test_parser_backends_produce_identical_items(backend, module):
+    """Tes paritas: backend parser opsional menghasilkan data yang sama dengan html.parser."""
+    pytest.importorskip(module)
+    fixed_dt = datetime(2024, 5, 25, 12, 0, 0)
+    with patch('utils.extract.datetime') as mock_dt:
+        mock_dt.now.return_value = fixed_dt
+        reference_items = parse_page_products(SAMPLE_PAGE_HTML, 1, "html.parser")
+        backend_items = parse_page_products(SAMPLE_PAGE_HTML, 1, backend)
+
+    assert backend_items == reference_items
+
 if __name__ == '__main__':
-    unittest.main(verbosity=2) # Menjalankan tes dengan output yang lebih detail
\ No newline at end of file
+    unittest.main(verbosity=2) # Menjalankan tes dengan output yang lebih detail
\ No newline at end of file
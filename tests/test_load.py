@@ -3,6 +3,8 @@ import pandas as pd
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import threading
+import time
 
 
 current_dir = os.path.dirname(__file__)
@@ -10,7 +12,9 @@ parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.insert(0, parent_dir)
 
 
-from utils.load import DataSaver, process_data
+from utils.load import (
+    DataSaver, process_data, process_stream, run_sinks, report_sink_summary, clear_sheets_service_cache, parse_sheet_anchor, column_letter
+)
 
 # --- Fixture DataFrame untuk Pengujian ---
 @pytest.fixture
@@ -81,24 +85,222 @@ def test_data_saver_csv_error_handling(mock_to_csv_method, sample_product_datafr
     mock_to_csv_method.assert_called_once()
 
 
+# Tes untuk metode save_as_parquet
+def test_data_saver_saves_partitioned_parquet(tmp_path, sample_product_dataframe):
+    """
+    Menguji apakah save_as_parquet menulis dataset terpartisi gaya Hive (ScrapeDate, Gender)
+    dengan tipe kolom yang tetap, dan partisi bisa dibaca tanpa membaca seluruh data.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    dataset_path = tmp_path / "products_parquet"
+    saver = DataSaver(sample_product_dataframe)
+    saver.save_as_parquet(str(dataset_path), compression="zstd", row_group_size=1)
+
+    assert (dataset_path / "ScrapeDate=2025-05-10" / "Gender=Male").is_dir()
+    table = pq.read_table(dataset_path, columns=["Title", "Price", "Colors", "Timestamp"],
+                          filters=[("Gender", "=", "Female")])
+    read_df = table.to_pandas()
+    assert read_df["Title"].tolist() == ["Dress Musim Panas"]
+    assert read_df["Price"].dtype == "float64"
+    assert read_df["Colors"].dtype == "int64"
+    assert read_df["Timestamp"].tolist() == [pd.Timestamp("2025-05-10T11:00:00")]
+
+    parquet_file = pq.ParquetFile(next((dataset_path / "ScrapeDate=2025-05-10" / "Gender=Male").iterdir()))
+    assert parquet_file.metadata.row_group(0).column(0).compression == "ZSTD"
+
+def test_data_saver_parquet_appends_or_overwrites_partitions(tmp_path, sample_product_dataframe):
+    """
+    Menguji apakah penulisan berikutnya menambah file di partisi yang sama, dan
+    overwrite_partitions=True mengganti isi partisi yang ditulis.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    dataset_path = str(tmp_path / "products_parquet")
+    DataSaver(sample_product_dataframe).save_as_parquet(dataset_path)
+    DataSaver(sample_product_dataframe).save_as_parquet(dataset_path)
+    assert pq.read_table(dataset_path).num_rows == 4
+
+    DataSaver(sample_product_dataframe.iloc[:1]).save_as_parquet(dataset_path, overwrite_partitions=True)
+    read_df = pq.read_table(dataset_path).to_pandas()
+    assert sorted(read_df["Title"].tolist()) == ["Dress Musim Panas", "Dress Musim Panas", "Kemeja Denim"]
+
+@patch.object(DataSaver, 'save_to_google_sheets')
+def test_repeated_runs_replace_parquet_partitions(mock_save_to_gsheets, tmp_path, monkeypatch, sample_product_dataframe):
+    """
+    Menguji apakah dua run penuh (process_data) atau dua run bertahap (process_stream) tidak
+    menggandakan baris Parquet, sementara batch dalam satu run bertahap tetap ditambahkan.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.chdir(tmp_path)
+    snapshot_path = str(tmp_path / "snapshot_parquet")
+    for _ in range(2):
+        process_data(sample_product_dataframe, parquet_path=snapshot_path)
+    assert pq.read_table(snapshot_path).num_rows == 2
+
+    stream_path = str(tmp_path / "stream_parquet")
+    same_partition = sample_product_dataframe.assign(Gender="Male")
+    for _ in range(2):
+        batches = (same_partition.iloc[[i]] for i in range(len(same_partition)))
+        process_stream(batches, filename=str(tmp_path / "stream.csv"), spreadsheet_info=None, parquet_path=stream_path)
+    assert pq.read_table(stream_path).num_rows == 2
+
+def test_data_saver_parquet_handles_empty_dataframe_and_bad_compression(tmp_path, empty_product_dataframe,
+                                                                         sample_product_dataframe, capsys):
+    """
+    Menguji apakah DataFrame kosong dan kompresi yang tidak dikenal dilaporkan tanpa menulis file.
+    """
+    dataset_path = tmp_path / "products_parquet"
+    DataSaver(empty_product_dataframe).save_as_parquet(str(dataset_path))
+    DataSaver(sample_product_dataframe).save_as_parquet(str(dataset_path), compression="rar")
+
+    captured = capsys.readouterr()
+    assert "[Parquet] DataFrame kosong, tidak ada yang disimpan." in captured.out
+    assert "[Parquet Error] Kompresi tidak dikenal: rar" in captured.out
+    assert not dataset_path.exists()
+
+
+# Tes untuk metode save_to_postgres
+def render_sql(statement) -> str:
+    """Ubah psycopg2.sql.Composable menjadi teks tanpa koneksi database."""
+    from psycopg2 import sql
+    if isinstance(statement, sql.Composed):
+        return "".join(render_sql(part) for part in statement.seq)
+    if isinstance(statement, sql.Identifier):
+        return ".".join(f'"{name}"' for name in statement.strings)
+    return statement.string
+
+def make_mock_postgres_pool():
+    """Pool psycopg2 tiruan yang mencatat perintah SQL dan isi COPY."""
+    cursor = MagicMock()
+    cursor.rowcount = 2
+    copied = []
+    cursor.copy_expert.side_effect = lambda statement, buffer: copied.append(buffer.getvalue())
+    connection = MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    connection_pool = MagicMock()
+    connection_pool.getconn.return_value = connection
+    return connection_pool, connection, cursor, copied
+
+def test_data_saver_postgres_copies_batches_then_merges(sample_product_dataframe, capsys):
+    """
+    Menguji apakah save_to_postgres mengirim data per batch dengan COPY ke tabel staging,
+    lalu melakukan satu upsert ke tabel tujuan dan mengembalikan koneksi ke pool.
+    """
+    connection_pool, connection, cursor, copied = make_mock_postgres_pool()
+    saver = DataSaver(sample_product_dataframe)
+
+    merged_rows = saver.save_to_postgres("postgresql://lokal/etl", batch_size=1, connection_pool=connection_pool)
+
+    assert merged_rows == 2
+    assert copied == [
+        "Kemeja Denim,256000.0,4.5,2,M,Male,2025-05-10T10:00:00.000000\n",
+        "Dress Musim Panas,320000.0,3.9,4,S,Female,2025-05-10T11:00:00.000000\n",
+    ]
+    statements = [render_sql(call.args[0]) for call in cursor.execute.call_args_list]
+    assert statements[0].startswith('CREATE TABLE IF NOT EXISTS "products" ("Title" TEXT, "Price" DOUBLE PRECISION')
+    assert statements[0].endswith('PRIMARY KEY ("Title", "Size", "Gender"))')
+    assert statements[1].startswith('CREATE TEMP TABLE "products_staging"')
+    assert 'ON CONFLICT ("Title", "Size", "Gender") DO UPDATE SET "Price" = EXCLUDED."Price"' in statements[2]
+    connection.__enter__.assert_called_once()
+    connection_pool.putconn.assert_called_once_with(connection)
+    assert "[PostgreSQL] 2 baris disimpan ke tabel products" in capsys.readouterr().out
+
+def test_data_saver_postgres_error_returns_connection(sample_product_dataframe, capsys):
+    """
+    Menguji apakah kegagalan COPY dilaporkan tanpa exception dan koneksi tetap dikembalikan ke pool.
+    """
+    connection_pool, connection, cursor, _ = make_mock_postgres_pool()
+    cursor.copy_expert.side_effect = Exception("Simulasi COPY gagal")
+
+    merged_rows = DataSaver(sample_product_dataframe).save_to_postgres("postgresql://lokal/etl",
+                                                                      connection_pool=connection_pool)
+
+    assert merged_rows == 0
+    assert "[PostgreSQL Error] Simulasi COPY gagal" in capsys.readouterr().out
+    connection_pool.putconn.assert_called_once_with(connection)
+
+def test_data_saver_sqlite_upserts_and_records_stats(tmp_path, sample_product_dataframe, capsys):
+    """
+    Menguji apakah save_to_sqlite meng-upsert ke gudang data SQLite dan mencatat statistik sink.
+    """
+    import sqlite3
+    database_path = str(tmp_path / "warehouse.sqlite")
+    saver = DataSaver(sample_product_dataframe)
+
+    assert saver.save_to_sqlite(database_path) == 2
+    assert DataSaver(sample_product_dataframe.iloc[:1]).save_to_sqlite(database_path) == 1
+    with sqlite3.connect(database_path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM products").fetchone() == (2,)
+    assert saver.sink_stats['sqlite']['rows'] == 2
+    assert "[SQLite] 2 baris disimpan ke tabel products" in capsys.readouterr().out
+
+def test_data_saver_sqlite_error_handling(tmp_path, sample_product_dataframe, capsys):
+    """
+    Menguji apakah kegagalan SQLite dicetak sebagai [SQLite Error] dan mengembalikan 0.
+    """
+    assert DataSaver(sample_product_dataframe).save_to_sqlite(str(tmp_path)) == 0
+    assert "[SQLite Error]" in capsys.readouterr().out
+
+@pytest.mark.skipif(not os.environ.get("POSTGRES_TEST_DSN"),
+                    reason="Set POSTGRES_TEST_DSN untuk menguji ke PostgreSQL lokal")
+def test_data_saver_postgres_upserts_into_local_database(sample_product_dataframe):
+    """
+    Menguji ke PostgreSQL sungguhan: load kedua memperbarui baris yang kuncinya sama
+    dan menambah baris baru tanpa duplikat.
+    """
+    import psycopg2
+    from utils.load import get_postgres_pool, close_postgres_pools
+    dsn = os.environ["POSTGRES_TEST_DSN"]
+    table = "products_load_test"
+    try:
+        with psycopg2.connect(dsn) as connection, connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+        DataSaver(sample_product_dataframe).save_to_postgres(dsn, table=table, batch_size=1)
+        updated = sample_product_dataframe.copy()
+        updated.loc[0, "Price"] = 199000.0
+        updated.loc[2] = ["Topi Rajut", 96000.0, 4.0, 1, "L", "Unisex", "2025-05-11T10:00:00.000000"]
+        assert DataSaver(updated).save_to_postgres(dsn, table=table, connection_pool=get_postgres_pool(dsn)) == 3
+
+        with psycopg2.connect(dsn) as connection, connection.cursor() as cursor:
+            cursor.execute(f'SELECT "Title", "Price" FROM {table} ORDER BY "Title"')
+            assert cursor.fetchall() == [
+                ("Dress Musim Panas", 320000.0), ("Kemeja Denim", 199000.0), ("Topi Rajut", 96000.0)
+            ]
+            cursor.execute(f"DROP TABLE {table}")
+    finally:
+        close_postgres_pools()
+
+
 # Tes untuk metode save_to_google_sheets
+@pytest.fixture(autouse=True)
+def fresh_sheets_service_cache():
+    """Setiap tes memulai tanpa client Google Sheets yang tersimpan."""
+    clear_sheets_service_cache()
+    yield
+    clear_sheets_service_cache()
+
+def make_mock_sheets_values_api(mock_build, current_values):
+    """Pasang client Sheets tiruan yang isi sheet-nya current_values."""
+    mock_values_api = MagicMock()
+    mock_build.return_value.spreadsheets.return_value.values.return_value = mock_values_api
+    mock_values_api.get.return_value.execute.return_value = {'values': current_values}
+    return mock_values_api
+
+def sent_ranges(mock_values_api):
+    """Daftar (range, jumlah baris) per permintaan batchUpdate."""
+    return [
+        [(data['range'], len(data['values'])) for data in call.kwargs['body']['data']]
+        for call in mock_values_api.batchUpdate.call_args_list
+    ]
+
 @patch("utils.load.Credentials.from_service_account_file")
 @patch("utils.load.build")
 def test_data_saver_saves_to_google_sheets_successfully(mock_build, mock_creds_from_file, sample_product_dataframe, capsys):
     """
-    Menguji apakah DataSaver.save_to_google_sheets berhasil memanggil API Google Sheets
-    untuk menghapus dan memperbarui data.
+    Menguji apakah DataSaver.save_to_google_sheets membaca isi sheet, lalu menulis seluruh
+    data ke sheet kosong dengan batchUpdate.
     """
-    mock_service = MagicMock()
-    mock_spreadsheets_api = MagicMock()
-    mock_values_api = MagicMock()
-
-    mock_service.spreadsheets.return_value = mock_spreadsheets_api
-    mock_spreadsheets_api.values.return_value = mock_values_api
-    mock_values_api.clear.return_value.execute.return_value = None
-    mock_values_api.update.return_value.execute.return_value = None
-
-    mock_build.return_value = mock_service
+    mock_values_api = make_mock_sheets_values_api(mock_build, [])
 
     spreadsheet_config = {
         'spreadsheet_id': 'test_sheet_id',
@@ -114,25 +316,101 @@ def test_data_saver_saves_to_google_sheets_successfully(mock_build, mock_creds_f
         scopes=["https://www.googleapis.com/auth/spreadsheets"]
     )
     mock_build.assert_called_once_with('sheets', 'v4', credentials=mock_creds_from_file.return_value)
-    mock_values_api.clear.assert_called_once_with(
-        spreadsheetId=spreadsheet_config['spreadsheet_id'],
-        range=spreadsheet_config['range_name']
+    mock_values_api.get.assert_called_once_with(
+        spreadsheetId='test_sheet_id', range='Sheet1', valueRenderOption='UNFORMATTED_VALUE'
     )
-    mock_values_api.update.assert_called_once()
-    # Verifikasi body yang dikirim ke update
-    update_call_args = mock_values_api.update.call_args[1]
-    assert update_call_args['spreadsheetId'] == spreadsheet_config['spreadsheet_id']
-    assert update_call_args['range'] == spreadsheet_config['range_name']
-    assert update_call_args['valueInputOption'] == "RAW"
-    # Cek bahwa kolom dan data DataFrame ada di body['values']
-    expected_header = sample_product_dataframe.columns.tolist()
-    expected_data = sample_product_dataframe.values.tolist()
-    assert update_call_args['body']['values'][0] == expected_header
-    assert update_call_args['body']['values'][1:] == expected_data
+    mock_values_api.batchUpdate.assert_called_once()
+    mock_values_api.batchClear.assert_not_called()
+    body = mock_values_api.batchUpdate.call_args.kwargs['body']
+    assert body['valueInputOption'] == "RAW"
+    assert body['data'][0]['range'] == 'Sheet1!A1:G3'
+    # Cek bahwa kolom dan data DataFrame ada di body
+    assert body['data'][0]['values'][0] == sample_product_dataframe.columns.tolist()
+    assert body['data'][0]['values'][1:] == [
+        [float(value) if isinstance(value, (int, float)) else value for value in row]
+        for row in sample_product_dataframe.values.tolist()
+    ]
 
     captured = capsys.readouterr()
-    assert "[Google Sheets] Data berhasil disimpan ke Sheet1!A1." in captured.out
+    assert "[Google Sheets] 3 dari 3 baris berubah, 1 permintaan dikirim ke Sheet1!A1." in captured.out
+
+@patch("utils.load.Credentials.from_service_account_file")
+@patch("utils.load.build")
+def test_google_sheets_sends_only_changed_rows_and_clears_leftovers(mock_build, mock_creds_from_file,
+                                                                   sample_product_dataframe):
+    """
+    Menguji apakah hanya baris yang berubah yang dikirim, angka dari sheet (int) dianggap sama
+    dengan float lokal, dan baris lama di bawah data baru dikosongkan.
+    """
+    current = [
+        sample_product_dataframe.columns.tolist(),
+        ["Kemeja Denim", 256000, 4.5, 2, "M", "Male", "2025-05-10T10:00:00.000000"],
+        ["Dress Musim Panas", 300000, 3.9, 4, "S", "Female", "2025-05-10T11:00:00.000000"],
+        ["Produk Lama", 1000, 1.0, 1, "S", "Female", "2025-05-01T11:00:00.000000", "kolom lebih"],
+    ]
+    mock_values_api = make_mock_sheets_values_api(mock_build, current)
+
+    DataSaver(sample_product_dataframe).save_to_google_sheets({'spreadsheet_id': 'x', 'range_name': 'Sheet1!A1'})
+
+    # Lebar mengikuti sheet lama (8 kolom) agar sel tambahan ikut ditimpa
+    assert sent_ranges(mock_values_api) == [[('Sheet1!A3:H3', 1)]]
+    assert mock_values_api.batchUpdate.call_args.kwargs['body']['data'][0]['values'][0][-1] == ''
+    mock_values_api.batchClear.assert_called_once_with(spreadsheetId='x', body={'ranges': ['Sheet1!A4:H4']})
+
+@patch("utils.load.Credentials.from_service_account_file")
+@patch("utils.load.build")
+def test_google_sheets_unchanged_data_sends_nothing_and_reuses_client(mock_build, mock_creds_from_file,
+                                                                      sample_product_dataframe):
+    """
+    Menguji apakah data yang sama tidak menghasilkan permintaan tulis, dan client API
+    hanya dibuat sekali untuk beberapa pemanggilan.
+    """
+    current = [sample_product_dataframe.columns.tolist()] + sample_product_dataframe.values.tolist()
+    mock_values_api = make_mock_sheets_values_api(mock_build, current)
+    saver = DataSaver(sample_product_dataframe)
+    spreadsheet_config = {'spreadsheet_id': 'x', 'range_name': 'Sheet1!A1'}
+
+    saver.save_to_google_sheets(spreadsheet_config)
+    saver.save_to_google_sheets(spreadsheet_config)
+
+    mock_build.assert_called_once()
+    assert mock_values_api.get.call_count == 2
+    mock_values_api.batchUpdate.assert_not_called()
+    mock_values_api.batchClear.assert_not_called()
+
+@patch("utils.load.time.sleep")
+@patch("utils.load.Credentials.from_service_account_file")
+@patch("utils.load.build")
+def test_google_sheets_splits_requests_by_cell_budget_and_throttles(mock_build, mock_creds_from_file, mock_sleep):
+    """
+    Menguji apakah perubahan besar dipecah per batas sel per permintaan, rentang yang
+    bersebelahan digabung, offset sel awal dihormati, dan permintaan diberi jeda.
+    """
+    df = pd.DataFrame({"Title": [f"Produk {i}" for i in range(10)], "Price": [float(i) for i in range(10)]})
+    current = [["Title", "Price"]] + [[f"Produk {i}", i if i not in (3, 4) else -1] for i in range(10)]
+    mock_values_api = make_mock_sheets_values_api(mock_build, [[], []] + [[""] + row for row in current])
+
+    DataSaver(df).save_to_google_sheets({'spreadsheet_id': 'x', 'range_name': 'Sheet1!B3'},
+                                        max_cells_per_request=2, requests_per_minute=6000)
+
+    assert sent_ranges(mock_values_api) == [[('Sheet1!B7:C7', 1)], [('Sheet1!B8:C8', 1)]]
+    mock_values_api.batchUpdate.reset_mock()
+
+    current[1:] = [[f"Lama {i}", i] for i in range(10)]
+    mock_values_api.get.return_value.execute.return_value = {'values': current}
+    DataSaver(df).save_to_google_sheets({'spreadsheet_id': 'x', 'range_name': 'Sheet1!A1'},
+                                        max_cells_per_request=8, requests_per_minute=6000)
 
+    assert sent_ranges(mock_values_api) == [
+        [('Sheet1!A2:B5', 4)], [('Sheet1!A6:B9', 4)], [('Sheet1!A10:B11', 2)]
+    ]
+    assert mock_sleep.called
+
+def test_sheet_anchor_and_column_letters():
+    assert parse_sheet_anchor('Sheet1!A1') == ('Sheet1', 0, 0)
+    assert parse_sheet_anchor('Data!AB12') == ('Data', 27, 11)
+    assert parse_sheet_anchor('Data') == ('Data', 0, 0)
+    assert [column_letter(index) for index in (0, 25, 26, 701, 702)] == ['A', 'Z', 'AA', 'ZZ', 'AAA']
 
 def test_data_saver_google_sheets_handles_empty_dataframe(empty_product_dataframe, capsys):
     """
@@ -181,7 +459,7 @@ def test_process_data_calls_all_savers(mock_data_saver_class, mock_save_to_gshee
     semua metode penyimpanan yang relevan (CSV dan Google Sheets).
     """
     # Mock instance DataSaver yang akan dibuat oleh process_data
-    mock_saver_instance = MagicMock()
+    mock_saver_instance = MagicMock(df=sample_product_dataframe)
     mock_data_saver_class.return_value = mock_saver_instance
 
     process_data(sample_product_dataframe)
@@ -195,4 +473,125 @@ def test_process_data_calls_all_savers(mock_data_saver_class, mock_save_to_gshee
     # Verifikasi argumen untuk save_to_google_sheets
     gsheet_call_args = mock_saver_instance.save_to_google_sheets.call_args[0][0]
     assert gsheet_call_args['spreadsheet_id'] == '1jo5MFyc1SXzgAeFqR9QLKlHIyPexXeh3LCbKrKW_hdI'
-    assert gsheet_call_args['range_name'] == 'Sheet1!A1'
\ No newline at end of file
+    assert gsheet_call_args['range_name'] == 'Sheet1!A1'
+
+
+def test_run_sinks_runs_concurrently_and_isolates_failures(sample_product_dataframe, capsys):
+    """
+    Menguji apakah sink dijalankan bersamaan (total waktu mendekati sink terlambat), sink yang
+    gagal atau melewati batas waktu tidak menghentikan sink lain, dan ringkasannya dilaporkan.
+    """
+    saver = DataSaver(sample_product_dataframe)
+    release = threading.Event()
+
+    def slow_sink(name, seconds):
+        def sink():
+            time.sleep(seconds)
+            saver._record_sink(name, len(saver.df), 100)
+        return sink
+
+    def failing_sink():
+        raise RuntimeError("Simulasi sink rusak")
+
+    started = time.perf_counter()
+    results = run_sinks(saver, {
+        'a': slow_sink('a', 0.3),
+        'b': slow_sink('b', 0.3),
+        'rusak': failing_sink,
+        'macet': lambda: release.wait(5),
+    }, timeouts={'macet': 0.4})
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    assert elapsed < 0.55
+    by_sink = {result['sink']: result for result in results}
+    assert by_sink['a']['status'] == by_sink['b']['status'] == 'ok'
+    assert by_sink['a']['rows'] == 2 and by_sink['a']['bytes'] == 100
+    assert 0.25 < by_sink['a']['duration'] < 0.5
+    assert by_sink['rusak']['status'] == 'failed'
+    assert by_sink['macet']['status'] == 'timeout'
+
+    report_sink_summary(results)
+    captured = capsys.readouterr()
+    assert "[Sink Error] rusak: Simulasi sink rusak" in captured.out
+    assert "[Sink] a: ok" in captured.out
+
+def test_run_sinks_reports_empty_input_as_skipped(empty_product_dataframe):
+    """
+    Menguji apakah DataFrame kosong membuat semua sink dilaporkan 'skipped', bukan 'failed'.
+    """
+    saver = DataSaver(empty_product_dataframe)
+    results = run_sinks(saver, {'csv': saver.save_as_csv, 'parquet': saver.save_as_parquet})
+
+    assert [result['status'] for result in results] == ['skipped', 'skipped']
+
+def test_sinks_record_rows_and_bytes_written(tmp_path, sample_product_dataframe):
+    """
+    Menguji apakah save_as_csv mencatat jumlah baris dan byte, termasuk hanya byte tambahan
+    pada mode append, dan sink yang menangani error sendiri dilaporkan gagal.
+    """
+    output_csv_path = tmp_path / "fashion_items.csv"
+    saver = DataSaver(sample_product_dataframe)
+    results = run_sinks(saver, {
+        'csv': lambda: saver.save_as_csv(str(output_csv_path)),
+        'google_sheets': lambda: saver.save_to_google_sheets({'spreadsheet_id': 'x', 'range_name': 'Sheet1!A1'},
+                                                             credential_file=str(tmp_path / "tidak_ada.json")),
+    })
+
+    assert results[0] == {**results[0], 'status': 'ok', 'rows': 2, 'bytes': output_csv_path.stat().st_size}
+    assert results[1]['status'] == 'failed'
+
+    size_before = output_csv_path.stat().st_size
+    appender = DataSaver(sample_product_dataframe.iloc[:1])
+    appender.save_as_csv(str(output_csv_path), append=True)
+    assert appender.sink_stats['csv'] == {'rows': 1, 'bytes': output_csv_path.stat().st_size - size_before}
+
+
+# --- Tes untuk Fungsi process_stream ---
+
+def test_data_saver_appends_to_existing_csv(tmp_path, sample_product_dataframe):
+    """
+    Menguji apakah save_as_csv(append=True) menambahkan baris tanpa menulis ulang header.
+    """
+    output_csv_path = tmp_path / "fashion_items.csv"
+    DataSaver(sample_product_dataframe.iloc[:1]).save_as_csv(filename=str(output_csv_path))
+    DataSaver(sample_product_dataframe.iloc[1:]).save_as_csv(filename=str(output_csv_path), append=True)
+
+    read_df = pd.read_csv(output_csv_path)
+    pd.testing.assert_frame_equal(read_df, sample_product_dataframe)
+
+@patch.object(DataSaver, 'append_to_google_sheets')
+@patch.object(DataSaver, 'save_to_google_sheets')
+def test_process_stream_writes_batches_incrementally(mock_save_to_gsheets, mock_append_to_gsheets, tmp_path, sample_product_dataframe):
+    """
+    Menguji apakah process_stream menimpa data lama pada batch pertama lalu menambahkan
+    batch berikutnya ke CSV dan Google Sheets.
+    """
+    output_csv_path = tmp_path / "fashion_items.csv"
+    output_csv_path.write_text("data lama\n")
+    batches = (sample_product_dataframe.iloc[[i]] for i in range(len(sample_product_dataframe)))
+
+    total_rows = process_stream(batches, filename=str(output_csv_path), spreadsheet_info={'spreadsheet_id': 'x', 'range_name': 'Sheet1!A1'})
+
+    assert total_rows == 2
+    pd.testing.assert_frame_equal(pd.read_csv(output_csv_path), sample_product_dataframe)
+    mock_save_to_gsheets.assert_called_once()
+    mock_append_to_gsheets.assert_called_once()
+
+
+@patch.object(DataSaver, 'save_to_google_sheets')
+def test_process_stream_keeps_committed_batches_on_failure(mock_save_to_gsheets, tmp_path, sample_product_dataframe):
+    """
+    Menguji apakah batch yang sudah di-commit tetap ada di CSV jika sumber batch gagal di tengah run.
+    """
+    output_csv_path = tmp_path / "fashion_items.csv"
+
+    def failing_batches():
+        yield sample_product_dataframe.iloc[[0]]
+        raise RuntimeError("ekstraksi terhenti")
+
+    with pytest.raises(RuntimeError):
+        process_stream(failing_batches(), filename=str(output_csv_path), spreadsheet_info=None)
+
+    pd.testing.assert_frame_equal(pd.read_csv(output_csv_path), sample_product_dataframe.iloc[[0]])
+    assert not os.path.exists(f"{output_csv_path}.tmp")
@@ -0,0 +1,65 @@
+import pytest
+import pandas as pd
+import sqlite3
+from unittest.mock import patch
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from main import parse_args, load_incremental
+from utils.load import DataSaver
+from utils.state import ProductStateStore
+
+@pytest.fixture
+def cleaned_products():
+    """Data produk bersih untuk satu run."""
+    return pd.DataFrame({
+        "Title": ["Kemeja Denim", "Dress Musim Panas"],
+        "Price": [256000.0, 320000.0],
+        "Rating": [4.5, 3.9],
+        "Colors": [2, 4],
+        "Size": ["M", "S"],
+        "Gender": ["Men", "Women"],
+        "Timestamp": ["2025-05-10T10:00:00.000000", "2025-05-10T11:00:00.000000"],
+    })
+
+@pytest.mark.parametrize("argv", [
+    ["--incremental", "--stream"],
+    ["--incremental", "--parquet", "products_parquet"],
+])
+def test_incremental_rejects_unsupported_options(argv):
+    """Kombinasi opsi yang akan diabaikan diam-diam oleh --incremental ditolak."""
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+def test_failed_delta_write_keeps_state(tmp_path, cleaned_products):
+    """Jika delta gagal ditulis, state tidak diperbarui sehingga perubahan terdeteksi lagi di run berikutnya."""
+    state_path = str(tmp_path / "state.sqlite")
+    delta_file = str(tmp_path / "delta.csv")
+
+    with patch.object(DataSaver, 'save_as_csv', autospec=True):  # tidak mencatat sink_stats, seperti saat gagal
+        with pytest.raises(RuntimeError):
+            load_incremental(cleaned_products, state_path, delta_file)
+
+    load_incremental(cleaned_products, state_path, delta_file)
+    assert len(pd.read_csv(delta_file)) == 2
+
+    store = ProductStateStore(state_path)
+    try:
+        delta = store.compute_delta(cleaned_products)
+    finally:
+        store.close()
+    assert delta['new'].empty and delta['changed'].empty
+
+def test_incremental_upserts_delta_to_sqlite(tmp_path, cleaned_products):
+    """Produk baru dan berubah ikut di-upsert ke gudang SQLite pada mode incremental."""
+    sqlite_path = str(tmp_path / "warehouse.sqlite")
+    load_incremental(cleaned_products, str(tmp_path / "state.sqlite"), str(tmp_path / "delta.csv"),
+                     sqlite_path=sqlite_path)
+
+    with sqlite3.connect(sqlite_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 2
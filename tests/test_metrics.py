@@ -0,0 +1,130 @@
+import pytest
+import pandas as pd
+import json
+import time
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.metrics import PipelineMetrics, configure_metrics, get_metrics, record_dropped_rows
+from utils.extract import retrieve_page_content
+from utils.transform import clean_and_transform
+from utils.load import DataSaver
+
+@pytest.fixture
+def metrics(tmp_path):
+    """Memasang PipelineMetrics dengan log JSON sementara selama satu tes."""
+    registry = PipelineMetrics(str(tmp_path / "logs" / "metrics.jsonl"))
+    configure_metrics(registry)
+    yield registry
+    configure_metrics(None)
+    registry.close()
+
+def counter_values(registry, name):
+    return {tuple(sorted(entry['labels'].items())): entry['value'] for entry in registry.snapshot().get(name, [])}
+
+def test_prometheus_textfile_has_counters_and_cumulative_histogram(tmp_path):
+    """Menguji format textfile Prometheus: HELP/TYPE, label yang di-escape, dan bucket histogram kumulatif."""
+    registry = PipelineMetrics()
+    registry.inc('etl_sink_rows_written_total', 5, sink='csv')
+    registry.inc('etl_rows_dropped_total', 2, stage='validate', rule='nama "aneh"')
+    for latency in (0.01, 0.2, 0.3, 20.0):
+        registry.observe('etl_page_fetch_seconds', latency)
+
+    path = tmp_path / "textfile" / "etl.prom"
+    registry.write_prometheus(str(path))
+    text = path.read_text()
+
+    assert "# TYPE etl_sink_rows_written_total counter" in text
+    assert 'etl_sink_rows_written_total{sink="csv"} 5' in text
+    assert 'etl_rows_dropped_total{rule="nama \\"aneh\\"",stage="validate"} 2' in text
+    assert "# TYPE etl_page_fetch_seconds histogram" in text
+    assert 'etl_page_fetch_seconds_bucket{le="0.05"} 1' in text
+    assert 'etl_page_fetch_seconds_bucket{le="0.25"} 2' in text
+    assert 'etl_page_fetch_seconds_bucket{le="10"} 3' in text
+    assert 'etl_page_fetch_seconds_bucket{le="+Inf"} 4' in text
+    assert "etl_page_fetch_seconds_count 4" in text
+    assert not os.path.exists(f"{path}.tmp")
+
+def test_stage_times_exclude_upstream_stages():
+    """Menguji apakah waktu tahap hulu yang ditarik dari dalam tahap hilir tidak dihitung dua kali."""
+    registry = PipelineMetrics()
+
+    def slow_batches():
+        for batch in range(3):
+            time.sleep(0.02)
+            yield batch
+
+    batches = registry.timed_batches("extract", slow_batches())
+    with registry.stage("load"):
+        for _ in batches:
+            time.sleep(0.01)
+
+    seconds = counter_values(registry, 'etl_stage_seconds_total')
+    assert seconds[(('stage', 'extract'),)] == pytest.approx(0.06, abs=0.03)
+    assert seconds[(('stage', 'load'),)] == pytest.approx(0.03, abs=0.03)
+
+def test_stage_writes_json_log(metrics):
+    """Menguji apakah setiap tahap menulis satu baris JSON stage_finished."""
+    with metrics.stage("transform", rows=3):
+        pass
+
+    records = [json.loads(line) for line in open(metrics.log_path)]
+    assert records[-1]['event'] == 'stage_finished'
+    assert records[-1]['stage'] == 'transform'
+    assert records[-1]['rows'] == 3
+
+def test_record_dropped_rows_splits_combined_reasons():
+    registry = PipelineMetrics()
+    record_dropped_rows(registry, ["a", "a,b", "b", "a"], stage="transform")
+
+    assert counter_values(registry, 'etl_rows_dropped_total') == {
+        (('rule', 'a'), ('stage', 'transform')): 3,
+        (('rule', 'b'), ('stage', 'transform')): 2,
+    }
+
+@patch('utils.extract.get_http_session')
+def test_retrieve_page_content_records_fetch_metrics(mock_get_session, metrics):
+    """Menguji apakah halaman yang diambil, byte yang diunduh, dan latensi per halaman dicatat."""
+    mock_response = MagicMock(status_code=200, text="<html>ok</html>", content=b"<html>ok</html>")
+    mock_get_session.return_value.get.return_value = mock_response
+
+    retrieve_page_content("http://contoh.com/1")
+
+    assert counter_values(metrics, 'etl_pages_fetched_total') == {(('status', 'ok'),): 1}
+    assert counter_values(metrics, 'etl_bytes_downloaded_total') == {(): 15}
+    assert metrics.snapshot()['etl_page_fetch_seconds'][0]['count'] == 1
+
+def test_transform_and_sinks_record_rows(metrics, tmp_path):
+    """Menguji apakah baris yang dibuang per aturan dan baris yang ditulis per sink dicatat."""
+    raw = pd.DataFrame({
+        "Title": ["Kaos", "Celana", "Jaket"],
+        "Price": ["$12.50", "Harga Tidak Ada", "$48.75"],
+        "Rating": ["⭐ 4.8", "⭐ 4.2", "Rating Tidak Valid"],
+        "Colors": ["2 Colors", "1 Color", "4 Colors"],
+        "Size": ["L", "M", "XL"],
+        "Gender": ["Unisex", "Men", "Women"],
+        "Timestamp": pd.to_datetime(["2025-05-10 10:00"] * 3),
+    })
+    cleaned = clean_and_transform(raw)
+    DataSaver(cleaned).save_as_csv(str(tmp_path / "products.csv"))
+
+    assert counter_values(metrics, 'etl_rows_dropped_total') == {
+        (('rule', 'price_unparseable'), ('stage', 'transform')): 1,
+        (('rule', 'rating_invalid'), ('stage', 'transform')): 1,
+    }
+    assert counter_values(metrics, 'etl_sink_rows_written_total') == {(('sink', 'csv'),): 1}
+
+def test_disabled_metrics_ignore_records():
+    """Menguji apakah tanpa metrik terpasang semua catatan diabaikan."""
+    configure_metrics(None)
+    registry = get_metrics()
+    registry.inc('etl_pages_fetched_total', status='ok')
+
+    assert not registry.enabled
+    assert registry.snapshot() == {}
@@ -0,0 +1,83 @@
+import pstats
+import threading
+import time
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.profiling import StageProfiler, FrameSampler
+
+def build_strings(count):
+    return [f"produk-{index}" * 4 for index in range(count)]
+
+def test_stage_writes_pstats_and_allocation_snapshot(tmp_path, capsys):
+    """Menguji apakah setiap tahap menghasilkan file pstats dan daftar pengalokasi memori teratas."""
+    profiler = StageProfiler(str(tmp_path / "profil"), top_n=5)
+    with profiler.stage("transform"):
+        kept = build_strings(20_000)
+
+    stats = pstats.Stats(str(tmp_path / "profil" / "transform.pstats"))
+    assert any(function == "build_strings" for _, _, function in stats.stats)
+    allocations = (tmp_path / "profil" / "transform_allocations.txt").read_text()
+    assert "Puncak memori tahap transform" in allocations
+    assert "test_profiling.py" in allocations
+    assert len(allocations.splitlines()) <= 2 + 5
+    assert "[Profil] transform" in capsys.readouterr().out
+    assert len(kept) == 20_000
+
+def test_repeated_stage_accumulates_calls(tmp_path):
+    """Menguji apakah tahap yang dimasuki dua kali diakumulasi ke profil yang sama."""
+    profiler = StageProfiler(str(tmp_path))
+    for _ in range(2):
+        with profiler.stage("load"):
+            build_strings(10)
+
+    stats = pstats.Stats(str(tmp_path / "load.pstats"))
+    calls = [stat[1] for (_, _, function), stat in stats.stats.items() if function == "build_strings"]
+    assert calls == [2]
+
+def test_repeated_stage_keeps_highest_peak(tmp_path):
+    """Menguji apakah puncak memori tahap yang dimasuki dua kali tidak ditimpa oleh kali masuk yang lebih ringan."""
+    profiler = StageProfiler(str(tmp_path))
+    with profiler.stage("transform"):
+        buffer = bytearray(8 * 2**20)
+        del buffer
+    with profiler.stage("transform"):
+        build_strings(10)
+
+    allocations = (tmp_path / "transform_allocations.txt").read_text()
+    peak_mb = float(allocations.split(": ")[1].split(" MB")[0])
+    assert peak_mb >= 8.0
+
+def test_sampler_sees_worker_threads(tmp_path):
+    """Menguji apakah sampling stage extract menangkap fungsi yang berjalan di thread lain."""
+    profiler = StageProfiler(str(tmp_path), sample_interval=0.001)
+    stop = threading.Event()
+
+    def busy_fetch_worker():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_fetch_worker)
+    with profiler.stage("extract"):
+        worker.start()
+        time.sleep(0.1)
+        stop.set()
+        worker.join()
+
+    samples = (tmp_path / "extract_samples.txt").read_text()
+    assert "busy_fetch_worker" in samples
+    assert not os.path.exists(tmp_path / "transform_samples.txt")
+
+def test_frame_sampler_counts_collapsed_stacks():
+    sampler = FrameSampler(interval=0.001)
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+
+    assert sampler.samples > 0
+    assert any("test_frame_sampler_counts_collapsed_stacks" in stack for stack in sampler.stacks)
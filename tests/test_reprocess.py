@@ -0,0 +1,144 @@
+import pytest
+import pandas as pd
+import json
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.reprocess import reprocess_files, iter_raw_chunks, plan_chunk_rows, MIN_CHUNK_ROWS
+from utils.transform import clean_and_transform
+
+def generate_raw_dataframe(rows: int, offset: int = 0) -> pd.DataFrame:
+    """Data mentah dengan sebagian baris yang akan dibuang saat dibersihkan."""
+    return pd.DataFrame({
+        "Title": [f"Produk {offset + i}" for i in range(rows)],
+        "Price": ["Price Unavailable" if i % 7 == 0 else f"${10 + i % 50}.50" for i in range(rows)],
+        "Rating": ["Rating Tidak Valid" if i % 5 == 0 else "⭐ 4.5" for i in range(rows)],
+        "Colors": [f"{1 + i % 4} Colors" for i in range(rows)],
+        "Size": ["M"] * rows,
+        "Gender": ["Unisex"] * rows,
+        "Timestamp": [datetime(2024, 1, 1, 10, 0, i % 60).isoformat() for i in range(rows)],
+    })
+
+@pytest.fixture
+def raw_csv_files(tmp_path):
+    """Dua file CSV mentah historis."""
+    paths = []
+    for index in range(2):
+        path = tmp_path / f"raw_{index}.csv"
+        generate_raw_dataframe(250, offset=index * 250).to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+def expected_output(paths) -> pd.DataFrame:
+    """Hasil acuan: semua file dimuat sekaligus lalu dibersihkan sekali."""
+    raw_df = pd.concat([pd.read_csv(path, dtype=object) for path in paths], ignore_index=True)
+    return clean_and_transform(raw_df).reset_index(drop=True)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reprocess_matches_single_frame_cleaning(tmp_path, raw_csv_files, workers):
+    """Pembersihan per chunk (dengan atau tanpa pool) menghasilkan data yang sama dengan sekali proses."""
+    output_path = tmp_path / "cleaned.csv"
+    summary = reprocess_files(raw_csv_files, str(output_path), workers=workers, chunk_rows=60)
+
+    expected_path = tmp_path / "expected.csv"
+    expected_output(raw_csv_files).to_csv(expected_path, index=False)
+    result_df = pd.read_csv(output_path)
+    pd.testing.assert_frame_equal(result_df, pd.read_csv(expected_path))
+    assert summary["rows_read"] == 500
+    assert summary["rows_written"] == len(result_df)
+    assert summary["chunks"] == 10
+    assert not os.path.exists(f"{output_path}.tmp")
+
+def test_reprocess_cleans_chunks_with_compact_dtypes(tmp_path, raw_csv_files):
+    """Chunk dibersihkan dengan compact_dtypes agar hasil yang menunggu ditulis memakai memori lebih sedikit."""
+    with patch('utils.reprocess.clean_and_transform', wraps=clean_and_transform) as cleaner:
+        reprocess_files(raw_csv_files, str(tmp_path / "cleaned.csv"), workers=1, chunk_rows=100)
+
+    assert cleaner.call_count == 6
+    assert all(call.kwargs['compact_dtypes'] for call in cleaner.call_args_list)
+
+def test_reprocess_writes_gzip_output(tmp_path, raw_csv_files):
+    """Output berakhiran .gz ditulis terkompresi dan bisa dibaca kembali."""
+    output_path = tmp_path / "cleaned.csv.gz"
+    summary = reprocess_files(raw_csv_files, str(output_path), workers=1, chunk_rows=100)
+
+    assert len(pd.read_csv(output_path)) == summary["rows_written"]
+
+def test_reprocess_reads_checkpoint_journal(tmp_path):
+    """Jurnal checkpoint (JSON Lines) dibaca sebagai data mentah, baris header dan rusak dilewati."""
+    journal_path = tmp_path / "checkpoint.jsonl"
+    items = generate_raw_dataframe(4).to_dict(orient="records")
+    with open(journal_path, "w", encoding="utf-8") as journal_file:
+        journal_file.write(json.dumps({"type": "run", "base_url": "https://contoh"}) + "\n")
+        journal_file.write(json.dumps({"type": "page", "page": 1, "items": items[:2]}) + "\n")
+        journal_file.write(json.dumps({"type": "page", "page": 2, "items": items[2:]}) + "\n")
+        journal_file.write('{"type": "page", "pa')
+
+    chunks = list(iter_raw_chunks(str(journal_path), chunk_rows=3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert chunks[0]["Title"].tolist() == ["Produk 0", "Produk 1", "Produk 2"]
+
+def test_failed_reprocess_keeps_existing_output(tmp_path, raw_csv_files):
+    """Jika proses gagal di tengah, output lama tidak tertimpa dan file sementara dihapus."""
+    output_path = tmp_path / "cleaned.csv"
+    output_path.write_text("lama\n")
+
+    with pytest.raises(FileNotFoundError):
+        reprocess_files(raw_csv_files + [str(tmp_path / "hilang.csv")], str(output_path),
+                        workers=1, chunk_rows=100)
+
+    assert output_path.read_text() == "lama\n"
+    assert not os.path.exists(f"{output_path}.tmp")
+
+def test_reprocess_passes_cleaned_dump_through(tmp_path, raw_csv_files):
+    """File yang sudah bersih (seperti products.csv) diteruskan apa adanya, bukan dibuang seluruhnya."""
+    cleaned_path = tmp_path / "products.csv"
+    expected_output(raw_csv_files[:1]).to_csv(cleaned_path, index=False)
+    output_path = tmp_path / "cleaned.csv"
+
+    summary = reprocess_files([str(cleaned_path), raw_csv_files[1]], str(output_path), workers=1, chunk_rows=100)
+
+    expected = pd.concat([pd.read_csv(cleaned_path), expected_output(raw_csv_files[1:])], ignore_index=True)
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
+    assert summary["chunks_passed_through"] == 2
+
+def test_failed_chunk_keeps_existing_output(tmp_path, raw_csv_files):
+    """Kesalahan saat membersihkan satu chunk menghentikan proses tanpa mengganti output lama."""
+    broken_path = tmp_path / "rusak.csv"
+    generate_raw_dataframe(10).drop(columns=["Rating"]).to_csv(broken_path, index=False)
+    output_path = tmp_path / "cleaned.csv"
+    output_path.write_text("lama\n")
+
+    with pytest.raises(KeyError):
+        reprocess_files(raw_csv_files + [str(broken_path)], str(output_path), workers=1, chunk_rows=100)
+
+    assert output_path.read_text() == "lama\n"
+    assert not os.path.exists(f"{output_path}.tmp")
+
+def test_reprocess_refuses_to_publish_empty_output(tmp_path):
+    """Jika semua baris dibuang, output lama tidak diganti dengan file kosong."""
+    raw_path = tmp_path / "raw.csv"
+    raw_df = generate_raw_dataframe(10)
+    raw_df["Price"] = "Price Unavailable"
+    raw_df.to_csv(raw_path, index=False)
+    output_path = tmp_path / "cleaned.csv"
+    output_path.write_text("lama\n")
+
+    with pytest.raises(ValueError):
+        reprocess_files([str(raw_path)], str(output_path), workers=1)
+
+    assert output_path.read_text() == "lama\n"
+
+def test_chunk_size_follows_memory_budget(raw_csv_files):
+    """Budget memori yang lebih besar menghasilkan chunk lebih besar, dengan batas bawah MIN_CHUNK_ROWS."""
+    small = plan_chunk_rows(raw_csv_files, memory_budget_mb=1, workers=4)
+    large = plan_chunk_rows(raw_csv_files, memory_budget_mb=1024, workers=4)
+    assert small == MIN_CHUNK_ROWS
+    assert large > small
@@ -0,0 +1,103 @@
+import asyncio
+import sys
+import os
+from unittest.mock import patch
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+def test_backoff_delay_grows_exponentially_with_jitter_and_cap():
+    """Menguji apakah jeda backoff berada di rentang full jitter dan dibatasi backoff_max."""
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+
+    with patch('utils.resilience.random.uniform', side_effect=lambda low, high: high):
+        assert [policy.compute_delay(attempt) for attempt in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+    for attempt in range(1, 6):
+        assert 0 <= policy.compute_delay(attempt) <= 5.0
+
+def test_retry_after_header_sets_minimum_delay():
+    """Menguji apakah Retry-After (detik atau tanggal HTTP) menjadi jeda minimum."""
+    policy = RetryPolicy(backoff_base=0.01)
+
+    assert policy.compute_delay(1, "3") >= 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("bukan angka") == 0.0
+    assert parse_retry_after(None) == 0.0
+
+def test_retryable_outcomes():
+    """Menguji klasifikasi hasil yang layak diulang: timeout, koneksi, 429, dan 5xx."""
+    policy = RetryPolicy()
+
+    assert policy.is_retryable("timeout")
+    assert policy.is_retryable("http_429", 429)
+    assert policy.is_retryable("http_5xx", 503)
+    assert not policy.is_retryable("http_4xx", 404)
+
+def test_circuit_breaker_opens_and_half_opens():
+    """Menguji apakah circuit terbuka setelah kegagalan beruntun dan mengizinkan satu percobaan setelah timeout."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.allow()
+    assert breaker.state == "half-open"
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+def test_half_open_trial_with_404_closes_circuit():
+    """Menguji apakah percobaan half-open yang dibalas 404 menutup circuit, bukan membiarkannya half-open selamanya."""
+    policy = RetryPolicy(circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+
+    policy.record("connection_error", 0.0)
+    assert policy.circuit_breaker.state == "open"
+
+    asyncio.run(asyncio.sleep(0.06))
+    policy.before_attempt()
+    policy.record("http_4xx", 0.0)
+
+    assert policy.circuit_breaker.state == "closed"
+    policy.before_attempt()
+
+def test_adaptive_limiter_increases_additively_and_decreases_multiplicatively():
+    """Menguji perilaku AIMD: naik satu per `limit` request sehat, dipotong setengah saat tertekan."""
+    limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=8, latency_target=1.0)
+
+    for _ in range(2 + 3 + 4):
+        limiter.record(0.1, True)
+    assert limiter.limit == 5
+
+    limiter.record(3.0, True)  # latensi di atas target
+    assert limiter.limit == 2
+    limiter.record(0.1, False)
+    assert limiter.limit == 1
+    assert limiter.history == [2, 3, 4, 5, 2, 1]
+
+def test_adaptive_limiter_caps_in_flight_requests():
+    """Menguji apakah jumlah request yang berjalan bersamaan tidak melebihi batas limiter."""
+    limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=2)
+    peak = {"value": 0}
+
+    async def worker():
+        async with limiter.slot():
+            peak["value"] = max(peak["value"], limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run_all():
+        await asyncio.gather(*(worker() for _ in range(6)))
+
+    asyncio.run(run_all())
+    assert peak["value"] == 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,72 @@
+import pytest
+import pandas as pd
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.state import ProductStateStore, build_delta_frame
+
+@pytest.fixture
+def cleaned_snapshot():
+    """Menyediakan snapshot data produk yang sudah dibersihkan."""
+    return pd.DataFrame({
+        "Title": ["Kemeja Denim", "Dress Musim Panas", "Jaket Bomber"],
+        "Price": [256000.0, 320000.0, 780000.0],
+        "Rating": [4.5, 3.9, 4.7],
+        "Colors": [2, 4, 3],
+        "Size": ["M", "S", "XL"],
+        "Gender": ["Men", "Women", "Unisex"],
+        "Timestamp": ["2025-05-10T10:00:00.000000"] * 3
+    })
+
+@pytest.fixture
+def state_store(tmp_path):
+    """Menyediakan ProductStateStore sementara."""
+    store = ProductStateStore(str(tmp_path / "state" / "products.sqlite"))
+    yield store
+    store.close()
+
+def test_first_run_reports_every_product_as_new(state_store, cleaned_snapshot):
+    """Menguji apakah semua produk dianggap baru ketika state masih kosong."""
+    delta = state_store.compute_delta(cleaned_snapshot)
+
+    assert len(delta['new']) == 3
+    assert delta['changed'].empty
+    assert delta['removed'].empty
+    assert delta['unchanged'] == 0
+
+def test_delta_detects_new_changed_and_removed_products(state_store, cleaned_snapshot):
+    """Menguji apakah perubahan harga, produk baru, dan produk hilang terdeteksi, sementara Timestamp diabaikan."""
+    state_store.commit(cleaned_snapshot)
+
+    next_snapshot = cleaned_snapshot.iloc[[0, 1]].copy()
+    next_snapshot['Timestamp'] = "2025-05-11T10:00:00.000000"
+    next_snapshot.loc[1, 'Price'] = 300000.0
+    new_product = pd.DataFrame({
+        "Title": ["Topi Rajut"], "Price": [96000.0], "Rating": [4.0], "Colors": [1],
+        "Size": ["M"], "Gender": ["Unisex"], "Timestamp": ["2025-05-11T10:00:00.000000"]
+    })
+    next_snapshot = pd.concat([next_snapshot, new_product], ignore_index=True)
+
+    delta = state_store.compute_delta(next_snapshot)
+
+    assert delta['new']['Title'].tolist() == ["Topi Rajut"]
+    assert delta['changed']['Title'].tolist() == ["Dress Musim Panas"]
+    assert delta['removed'].to_dict('records') == [{"Title": "Jaket Bomber", "Size": "XL", "Gender": "Unisex"}]
+    assert delta['unchanged'] == 1
+
+    delta_df = build_delta_frame(delta)
+    assert delta_df['ChangeType'].tolist() == ["new", "changed", "removed"]
+
+def test_unchanged_snapshot_produces_empty_delta(state_store, cleaned_snapshot):
+    """Menguji apakah snapshot yang sama persis tidak menghasilkan delta setelah state disimpan."""
+    state_store.commit(cleaned_snapshot)
+
+    delta = state_store.compute_delta(cleaned_snapshot)
+
+    assert build_delta_frame(delta).empty
+    assert delta['unchanged'] == 3
@@ -10,7 +10,8 @@ current_dir = os.path.dirname(__file__)
 parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.insert(0, parent_dir)
 
-from utils.transform import clean_and_transform 
+from utils.transform import clean_and_transform, transform_batches, format_timestamps
+from utils.validate import QuarantineSink
 
 # --- Data Sampel untuk Tes ---
 def generate_sample_raw_data_dict():
@@ -177,4 +178,101 @@ def test_transformation_handles_problematic_timestamp_conversion():
 
     # Kolom Timestamp untuk baris tersebut seharusnya NaN
     # pd.isna() bisa mengecek NaN float maupun pd.NaT (jika strftime tidak dilakukan)
-    assert pd.isna(transformed_df.iloc[0]["Timestamp"]), "Kolom Timestamp seharusnya NaN setelah konversi gagal dan strftime."
\ No newline at end of file
+    assert pd.isna(transformed_df.iloc[0]["Timestamp"]), "Kolom Timestamp seharusnya NaN setelah konversi gagal dan strftime."
+
+def test_transform_batches_applies_same_rules_per_batch():
+    """
+    Menguji apakah transform_batches membersihkan setiap batch dengan aturan yang sama
+    seperti clean_and_transform dan melewati batch yang kosong setelah dibersihkan.
+    """
+    full_df = pd.DataFrame(generate_sample_raw_data_dict())
+    invalid_batch = pd.DataFrame({
+        "Title": ["Produk Dihapus"], "Price": ["$20.00"], "Rating": ["Rating Tidak Valid"],
+        "Colors": ["1 Color"], "Size": ["S"], "Gender": ["Female"], "Timestamp": [datetime(2024, 2, 2)]
+    })
+    batches = [full_df.iloc[:2], invalid_batch, full_df.iloc[2:]]
+
+    cleaned_batches = list(transform_batches(batches))
+
+    assert len(cleaned_batches) == 2
+    pd.testing.assert_frame_equal(pd.concat(cleaned_batches), clean_and_transform(full_df))
+
+
+def test_compact_dtypes_keep_values_identical():
+    """
+    Menguji apakah compact_dtypes menyimpan Size/Gender sebagai category dan Colors sebagai
+    integer kecil tanpa mengubah nilai dibanding output bawaan.
+    """
+    input_df = pd.DataFrame(generate_sample_raw_data_dict())
+    default_df = clean_and_transform(input_df)
+    compact_df = clean_and_transform(input_df, compact_dtypes=True)
+
+    assert isinstance(compact_df["Size"].dtype, pd.CategoricalDtype)
+    assert isinstance(compact_df["Gender"].dtype, pd.CategoricalDtype)
+    assert compact_df["Colors"].dtype == np.int8
+    pd.testing.assert_frame_equal(
+        compact_df.astype({"Size": str, "Gender": str, "Colors": int}), default_df
+    )
+
+def test_vectorized_timestamp_format_matches_strftime():
+    """
+    Menguji apakah format_timestamps menghasilkan string yang sama dengan dt.strftime,
+    termasuk NaN untuk nilai yang tidak bisa dikonversi.
+    """
+    raw_timestamps = pd.Series([
+        datetime(2024, 1, 15, 10, 30, 0),
+        datetime(2025, 5, 26, 0, 37, 51, 484330),
+        "BUKAN_TANGGAL_VALID",
+    ], index=[5, 7, 9])
+
+    expected = pd.to_datetime(raw_timestamps, errors='coerce').dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    pd.testing.assert_series_equal(format_timestamps(raw_timestamps), expected)
+
+def test_transformation_preserves_index_and_extra_columns():
+    """
+    Menguji apakah baris yang lolos filter tetap memakai label index asli dan kolom tambahan
+    tetap ada dalam urutan yang sama.
+    """
+    input_df = pd.DataFrame(generate_sample_raw_data_dict(), index=[10, 20, 30])
+    input_df["Rating"] = ["⭐ 4.8", "Rating Tidak Valid", "⭐ 4.5"]
+    input_df["Sumber"] = ["web", "web", "web"]
+
+    transformed_df = clean_and_transform(input_df)
+
+    assert transformed_df.index.tolist() == [10, 30]
+    assert transformed_df.columns.tolist() == input_df.columns.tolist()
+    assert transformed_df["Price"].tolist() == [200000.0, 780000.0]
+
+
+def test_dropped_rows_are_quarantined_with_reasons(tmp_path):
+    """
+    Menguji apakah baris yang dibuang saat pembersihan dikirim ke karantina beserta kode alasannya,
+    dan kesalahan transformasi mengarantina seluruh baris.
+    """
+    input_df = pd.DataFrame(generate_sample_raw_data_dict())
+    input_df["Rating"] = ["⭐ 4.8", "Rating Tidak Valid", "Not Rated"]
+    input_df["Price"] = ["$12.50", "$35.00", "Price Unavailable"]
+    quarantine = QuarantineSink(str(tmp_path / "quarantine.csv"))
+
+    transformed_df = clean_and_transform(input_df, quarantine=quarantine)
+
+    assert len(transformed_df) == 1
+    quarantined = pd.read_csv(quarantine.path)
+    assert quarantined["Title"].tolist() == ["Celana Jeans Trendi", "Jaket Bomber Kece"]
+    assert quarantined["Reasons"].tolist() == ["rating_invalid", "rating_unparseable,price_unparseable"]
+
+    broken_df = pd.DataFrame(generate_sample_raw_data_dict())
+    broken_df["Price"] = [12.5, 35.0, 48.75]
+    assert clean_and_transform(broken_df, quarantine=quarantine).empty
+    assert quarantine.reason_counts["transform_error"] == 3
+
+
+def test_non_string_text_column_is_reported_by_name():
+    """
+    Menguji apakah kolom teks yang bertipe numerik ditolak dengan pesan yang menyebut nama kolomnya.
+    """
+    broken_df = pd.DataFrame(generate_sample_raw_data_dict())
+    broken_df["Price"] = [12.5, 35.0, 48.75]
+
+    with pytest.raises(TypeError, match="Kolom Price"):
+        clean_and_transform(broken_df, raise_errors=True)
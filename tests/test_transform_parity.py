@@ -0,0 +1,106 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+from datetime import datetime
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.transform import clean_and_transform, resolve_transform_engine, POLARS_MIN_ROWS
+
+pytest.importorskip("polars")
+
+# --- Data sampel: setiap kasus harus menghasilkan output identik di semua engine ---
+
+def generate_edge_case_data():
+    """Data mentah dengan nilai yang sering membedakan aturan parsing antar engine."""
+    return pd.DataFrame({
+        "Title": ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J"],
+        "Price": ["$1,234.50", " $12.5 ", "Price Unavailable", "$nan", "$1e3", None,
+                  "$0.333", "$inf", "$7.", "$5"],
+        "Rating": ["⭐ 4.8", "⭐ 3", "⭐ 4.0", "⭐ 4.1", "Rating Tidak Valid", "⭐ 2.2",
+                   "⭐ Invalid Rating / 5", np.nan, "⭐4.5 / 5", "Not Rated"],
+        "Colors": ["3 Colors", "Colors", None, "12 Colors", "1 Color", "2 Colors",
+                   "10", "7 Colors", "Colors: 0", "4 Colors"],
+        "Size": ["S", None, "M", "L", "XL", np.nan, "S", "M", "L", "XL"],
+        "Gender": ["Men", "Women", None, "Unisex", "Men", "Women", "Unisex", "Men", "Women", "Unisex"],
+        "Timestamp": [datetime(2024, 1, 15, 10, 30, 0, 123456), pd.NaT, datetime(1969, 7, 20, 20, 17),
+                      datetime(2024, 2, 29), datetime(2024, 1, 1), datetime(2024, 1, 2),
+                      datetime(2024, 1, 3), datetime(2024, 1, 4), datetime(2024, 1, 5, 23, 59, 59, 999999),
+                      datetime(2024, 1, 6)],
+    })
+
+def generate_random_data(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Data mentah acak dengan nilai berulang seperti hasil scraping sebenarnya."""
+    rng = np.random.default_rng(seed)
+    ratings = np.array(["⭐ 4.8", "⭐ 3.9", "⭐ 5.0", "Rating Tidak Valid", "⭐ Invalid Rating / 5"], dtype=object)
+    prices = np.array([f"${value:,.2f}" for value in rng.uniform(1, 5000, 300)] + ["Price Unavailable"], dtype=object)
+    colors = np.array(["1 Color", "3 Colors", "5 Colors", "Colors"], dtype=object)
+    return pd.DataFrame({
+        "Title": np.array([f"Produk {i}" for i in rng.integers(0, 500, rows)], dtype=object),
+        "Price": prices[rng.integers(0, len(prices), rows)],
+        "Rating": ratings[rng.integers(0, len(ratings), rows)],
+        "Colors": colors[rng.integers(0, len(colors), rows)],
+        "Size": np.array(["S", "M", "L", "XL"], dtype=object)[rng.integers(0, 4, rows)],
+        "Gender": np.array(["Men", "Women", "Unisex"], dtype=object)[rng.integers(0, 3, rows)],
+        "Timestamp": pd.Timestamp(2024, 1, 1) + pd.to_timedelta(rng.integers(0, 10**12, rows), unit='us'),
+    })
+
+def assert_engines_match(raw_df: pd.DataFrame, **options):
+    reference_df = clean_and_transform(raw_df.copy(), engine="pandas", **options)
+    polars_df = clean_and_transform(raw_df.copy(), engine="polars", **options)
+    assert not reference_df.empty
+    pd.testing.assert_frame_equal(polars_df, reference_df)
+
+# --- Tes paritas engine ---
+
+@pytest.mark.parametrize("compact_dtypes", [False, True])
+def test_engines_match_on_edge_cases(compact_dtypes):
+    """Nilai tepi (spasi, nan, notasi ilmiah, None, NaT, sebelum 1970) diproses sama oleh semua engine."""
+    assert_engines_match(generate_edge_case_data(), compact_dtypes=compact_dtypes)
+
+def test_engines_match_on_random_data():
+    """Data acak berukuran sedang menghasilkan output identik."""
+    assert_engines_match(generate_random_data(20_000))
+
+def test_engines_match_with_custom_index_and_extra_columns():
+    """Index asli dan kolom tambahan dipertahankan dengan cara yang sama."""
+    raw_df = generate_edge_case_data()
+    raw_df.index = raw_df.index * 10 + 5
+    raw_df.insert(1, "Url", [f"https://contoh/{i}" for i in range(len(raw_df))])
+    assert_engines_match(raw_df)
+
+def test_engines_match_on_string_and_timezone_timestamps():
+    """Timestamp berupa string atau ber-timezone diformat sama oleh semua engine."""
+    raw_df = generate_edge_case_data()
+    raw_df["Timestamp"] = raw_df["Timestamp"].astype(str)
+    assert_engines_match(raw_df)
+
+    raw_df = generate_edge_case_data()
+    raw_df["Timestamp"] = pd.to_datetime(raw_df["Timestamp"]).dt.tz_localize("Asia/Jakarta")
+    assert_engines_match(raw_df)
+
+def test_polars_engine_falls_back_for_mixed_type_columns():
+    """Kolom berisi campuran string dan angka tetap diproses seperti engine pandas."""
+    raw_df = generate_edge_case_data()
+    raw_df["Price"] = raw_df["Price"].astype(object)
+    raw_df.loc[1, "Price"] = 12.5
+    assert_engines_match(raw_df)
+
+# --- Tes pemilihan engine ---
+
+def test_auto_engine_uses_pandas_for_small_data():
+    assert resolve_transform_engine("auto", POLARS_MIN_ROWS - 1) == "pandas"
+
+def test_auto_engine_uses_polars_for_large_data_on_multicore(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    assert resolve_transform_engine("auto", POLARS_MIN_ROWS) == "polars"
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    assert resolve_transform_engine("auto", POLARS_MIN_ROWS) == "pandas"
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        clean_and_transform(generate_edge_case_data(), engine="spark")
@@ -0,0 +1,109 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.validate import DataValidator, QuarantineSink, ValidationRule, combine_reason_codes
+
+@pytest.fixture
+def cleaned_snapshot():
+    """Data produk bersih dengan satu baris valid dan beberapa baris yang melanggar aturan."""
+    return pd.DataFrame({
+        "Title": ["Kemeja Denim", "Dress Musim Panas", "Jaket Bomber", "Topi Rajut"],
+        "Price": [256000.0, 0.0, 780000.0, 96000.0],
+        "Rating": [4.5, 3.9, 7.0, 4.0],
+        "Colors": [2, 4, 3, 1],
+        "Size": ["M", "S", "Ukuran Tidak Diketahui", "L"],
+        "Gender": ["Men", "Women", "Unisex", "Kids"],
+        "Timestamp": ["2025-05-10T10:00:00.000000"] * 4
+    })
+
+@pytest.fixture
+def quarantine(tmp_path):
+    """Menyediakan QuarantineSink sementara."""
+    return QuarantineSink(str(tmp_path / "karantina" / "quarantine.csv"))
+
+def test_validator_quarantines_failing_rows_with_reasons(cleaned_snapshot, quarantine):
+    """Menguji apakah baris yang gagal dikarantina dengan semua kode alasannya dan sisanya dikembalikan."""
+    validator = DataValidator(quarantine=quarantine)
+    valid = validator.validate(cleaned_snapshot)
+
+    assert valid.index.tolist() == [0]
+    quarantined = pd.read_csv(quarantine.path)
+    assert quarantined["Title"].tolist() == ["Dress Musim Panas", "Jaket Bomber", "Topi Rajut"]
+    assert quarantined["Reasons"].tolist() == [
+        "price_out_of_range",
+        "rating_out_of_range,unknown_size,unknown_field",
+        "unknown_gender",
+    ]
+    assert set(quarantined["Stage"]) == {"validate"}
+
+def test_validator_counts_failures_per_rule(cleaned_snapshot, capsys):
+    """Menguji apakah jumlah kegagalan dihitung per aturan, termasuk aturan tanpa kegagalan."""
+    validator = DataValidator()
+    validator.validate(cleaned_snapshot)
+    validator.validate(cleaned_snapshot)
+    validator.report()
+
+    assert validator.rule_counts == {
+        "price_out_of_range": 2,
+        "rating_out_of_range": 2,
+        "unknown_size": 2,
+        "unknown_gender": 2,
+        "unknown_field": 2,
+    }
+    assert validator.rows_rejected == 6
+    assert "6 dari 8 baris ditolak" in capsys.readouterr().out
+
+def test_quarantine_sink_appends_across_batches(cleaned_snapshot, quarantine):
+    """Menguji apakah batch berikutnya ditambahkan ke file karantina tanpa header ganda."""
+    validator = DataValidator(quarantine=quarantine)
+    batches = [cleaned_snapshot.iloc[:2], cleaned_snapshot.iloc[2:]]
+    valid = list(validator.validate_batches(batches))
+
+    assert len(valid) == 1
+    assert len(pd.read_csv(quarantine.path)) == 3
+    assert quarantine.reason_counts["unknown_gender"] == 1
+
+def test_custom_rules_skip_missing_columns(cleaned_snapshot):
+    """Menguji apakah aturan kustom bisa dipakai dan aturan dengan kolom yang tidak ada dilewati."""
+    rules = (
+        ValidationRule.in_range("colors_range", "Colors", 2, 4),
+        ValidationRule.one_of("unknown_material", "Material", ("Katun",)),
+    )
+    valid = DataValidator(rules=rules).validate(cleaned_snapshot)
+
+    assert valid.index.tolist() == [0, 1, 2]
+
+def test_combine_reason_codes():
+    reasons = combine_reason_codes((
+        ("a", np.array([True, False, True])),
+        ("b", np.array([False, False, True])),
+    ))
+    assert reasons.tolist() == ["a", "", "a,b"]
+
+def test_validator_handles_large_frames_and_categories():
+    """Menguji apakah validasi berjalan vektor pada frame besar dengan kolom category."""
+    rows = 200_000
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Title": pd.Categorical(np.array(["Kaos", "Unknown Tidak Diketahui"])[rng.integers(0, 2, rows)]),
+        "Price": rng.uniform(-10, 1000, rows),
+        "Rating": rng.uniform(0, 6, rows),
+        "Size": pd.Categorical(np.array(["S", "M", "XXXL"])[rng.integers(0, 3, rows)]),
+        "Gender": pd.Categorical(np.array(["Men", "Women"])[rng.integers(0, 2, rows)]),
+    })
+    validator = DataValidator()
+    valid = validator.validate(frame)
+
+    expected = (
+        frame["Price"].between(1, 100_000_000) & frame["Rating"].between(0, 5)
+        & (frame["Size"] != "XXXL") & (frame["Title"] == "Kaos")
+    )
+    assert len(valid) == int(expected.sum())
@@ -0,0 +1,115 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sqlite3
+import sys
+import os
+
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+from utils.warehouse import SqliteWarehouse
+
+def random_snapshot(rng, rows, day):
+    """Snapshot produk acak; judul berulang sehingga pemuatan berikutnya memperbarui baris lama."""
+    return pd.DataFrame({
+        "Title": [f"Produk {i}" for i in rng.integers(0, 300, rows)],
+        "Price": rng.uniform(10_000, 900_000, rows).round(0),
+        "Rating": np.where(rng.random(rows) < 0.1, np.nan, rng.uniform(0, 5, rows).round(1)),
+        "Colors": rng.integers(1, 6, rows),
+        "Size": rng.choice(["S", "M", "L"], rows),
+        "Gender": rng.choice(["Men", "Women"], rows),
+        "Timestamp": (pd.Timestamp(2025, 5, day) + pd.to_timedelta(rng.integers(0, 80_000, rows), unit='s'))
+                     .strftime('%Y-%m-%dT%H:%M:%S.%f'),
+    })
+
+@pytest.fixture
+def warehouse(tmp_path):
+    """Menyediakan SqliteWarehouse sementara."""
+    store = SqliteWarehouse(str(tmp_path / "gudang" / "warehouse.sqlite"))
+    yield store
+    store.close()
+
+def read_sql(path, query):
+    with sqlite3.connect(path) as connection:
+        return pd.read_sql_query(query, connection)
+
+def test_summary_matches_full_recompute_after_upserts_and_deletes(warehouse):
+    """Menguji apakah ringkasan yang diperbarui bertahap sama dengan agregasi ulang seluruh tabel."""
+    rng = np.random.default_rng(0)
+    for day in (10, 11, 12):
+        warehouse.upsert(random_snapshot(rng, 1000, day))
+    with sqlite3.connect(warehouse.path) as connection:
+        connection.execute("DELETE FROM products WHERE Price < 200000")
+
+    incremental = read_sql(warehouse.path, "SELECT * FROM products_summary ORDER BY Gender, Size")
+    recomputed = read_sql(warehouse.path, """
+        SELECT Gender, Size, COUNT(*) AS product_count,
+               AVG(Price) AS price_avg, MIN(Price) AS price_min, MAX(Price) AS price_max,
+               AVG(Rating) AS rating_avg, MIN(Rating) AS rating_min, MAX(Rating) AS rating_max
+        FROM products GROUP BY Gender, Size ORDER BY Gender, Size
+    """)
+    pd.testing.assert_frame_equal(incremental, recomputed)
+
+def test_upsert_keeps_latest_row_per_key(warehouse):
+    """Menguji apakah kunci yang sama hanya disimpan sekali, dengan baris Timestamp terbaru."""
+    snapshot = pd.DataFrame({
+        "Title": ["Kemeja Denim", "Kemeja Denim"],
+        "Price": [300000.0, 256000.0],
+        "Rating": [4.5, 4.5],
+        "Size": ["M", "M"],
+        "Gender": ["Men", "Men"],
+        "Timestamp": ["2025-05-10T12:00:00.000000", "2025-05-10T10:00:00.000000"],
+    })
+
+    assert warehouse.upsert(snapshot) == 1
+    assert warehouse.upsert(snapshot.assign(Price=[310000.0, 256000.0])) == 1
+    stored = read_sql(warehouse.path, "SELECT Title, Price FROM products")
+    assert stored.to_dict("records") == [{"Title": "Kemeja Denim", "Price": 310000.0}]
+    summary = read_sql(warehouse.path, "SELECT product_count, price_min, price_max FROM products_summary")
+    assert summary.to_dict("records") == [{"product_count": 1, "price_min": 310000.0, "price_max": 310000.0}]
+
+def test_scrape_counts_only_count_upserted_scrapes(warehouse):
+    """Menguji apakah rows_loaded menghitung baris yang benar-benar di-upsert: duplikat sekali, muat ulang tidak dihitung."""
+    first_day = pd.DataFrame({
+        "Title": ["Kemeja Denim", "Kemeja Denim", "Dress Musim Panas"],
+        "Price": [256000.0, 250000.0, 320000.0],
+        "Rating": [4.5, 4.5, 3.9],
+        "Size": ["M", "M", "S"],
+        "Gender": ["Men", "Men", "Women"],
+        "Timestamp": ["2025-05-10T09:00:00.000000", "2025-05-10T10:00:00.000000", "2025-05-10T11:00:00.000000"],
+    })
+    second_day = first_day.iloc[[1]].assign(Price=[270000.0], Timestamp=["2025-05-11T10:00:00.000000"])
+
+    warehouse.upsert(first_day)
+    warehouse.upsert(first_day)
+    warehouse.upsert(second_day)
+
+    counts = read_sql(warehouse.path, "SELECT ScrapeDate, rows_loaded FROM products_scrape_counts ORDER BY ScrapeDate")
+    assert counts.to_dict("records") == [
+        {"ScrapeDate": "2025-05-10", "rows_loaded": 2},
+        {"ScrapeDate": "2025-05-11", "rows_loaded": 1},
+    ]
+
+def test_dashboard_queries_use_indexes(warehouse):
+    """Menguji apakah filter Title, (Gender, Size), dan Price dilayani indeks, bukan pemindaian tabel."""
+    warehouse.upsert(random_snapshot(np.random.default_rng(2), 100, 10))
+    queries = {
+        "idx_products_title": "SELECT * FROM products WHERE Title = 'Produk 1'",
+        "idx_products_gender_size": "SELECT * FROM products WHERE Gender = 'Men' AND Size = 'M'",
+        "idx_products_price": "SELECT * FROM products WHERE Price BETWEEN 100000 AND 200000",
+    }
+    with sqlite3.connect(warehouse.path) as connection:
+        for index_name, query in queries.items():
+            plan = " ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}"))
+            assert index_name in plan
+
+def test_new_columns_are_added_to_existing_table(warehouse):
+    """Menguji apakah kolom baru pada batch berikutnya ditambahkan ke tabel yang sudah ada."""
+    snapshot = random_snapshot(np.random.default_rng(3), 10, 10)
+    warehouse.upsert(snapshot.drop(columns=["Colors"]))
+    warehouse.upsert(snapshot)
+
+    assert "Colors" in read_sql(warehouse.path, "SELECT * FROM products").columns
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import threading
+import time
+
+class PageCache:
+    """Cache respons HTTP di disk (SQLite) dengan revalidasi ETag/Last-Modified.
+
+    Body disimpan per URL. Entri yang masih di dalam TTL dipakai langsung tanpa
+    request, entri yang kedaluwarsa direvalidasi dengan If-None-Match /
+    If-Modified-Since. Total ukuran body dibatasi dengan eviction LRU.
+    """
+
+    def __init__(self, path: str = '.cache/pages.sqlite', ttl: float = 3600, max_bytes: int = 50 * 1024 * 1024):
+        """Inisialisasi cache.
+
+        Args:
+            path (str): Lokasi file database cache
+            ttl (float): Lama (detik) entri dianggap segar tanpa revalidasi
+            max_bytes (int): Batas total ukuran body yang disimpan
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT,"
+            " stored_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str):
+        """Ambil entri cache untuk URL, atau None jika belum pernah disimpan."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return {"body": row[0], "etag": row[1], "last_modified": row[2], "stored_at": row[3]}
+
+    def is_fresh(self, entry: dict) -> bool:
+        """Cek apakah entri masih berada di dalam TTL."""
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def conditional_headers(self, entry: dict) -> dict:
+        """Header validasi kondisional untuk entri yang sudah kedaluwarsa."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record_hit(self):
+        """Catat entri segar yang dipakai tanpa request."""
+        with self._lock:
+            self.stats["hits"] += 1
+
+    def record_miss(self):
+        """Catat URL yang harus diunduh ulang."""
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def mark_revalidated(self, url: str):
+        """Perbarui waktu simpan setelah server membalas 304 Not Modified."""
+        with self._lock:
+            now = time.time()
+            self._conn.execute("UPDATE pages SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+            self.stats["revalidated"] += 1
+
+    def put(self, url: str, body: str, etag: str = None, last_modified: str = None):
+        """Simpan body untuk URL lalu buang entri terlama jika melebihi batas ukuran."""
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, stored_at, accessed_at, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, size),
+            )
+            self.stats["stored"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            self.stats["evicted"] += 1
+
+    def total_bytes(self) -> int:
+        """Total ukuran body yang tersimpan di cache."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def report_stats(self):
+        """Cetak ringkasan hit/miss cache."""
+        s = self.stats
+        print(
+            f"[Cache] hit: {s['hits']}, revalidasi (304): {s['revalidated']}, miss: {s['misses']}, "
+            f"disimpan: {s['stored']}, dibuang: {s['evicted']}"
+        )
+
+    def close(self):
+        """Tutup koneksi database cache."""
+        with self._lock:
+            self._conn.close()
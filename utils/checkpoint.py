@@ -0,0 +1,113 @@
+import json
+import os
+from datetime import datetime
+
+class CheckpointJournal:
+    """Jurnal checkpoint (JSON Lines) berisi halaman yang sudah selesai beserta produknya.
+
+    Setiap halaman ditulis sebagai satu baris dan langsung di-fsync, sehingga
+    run yang gagal di tengah bisa dilanjutkan tanpa mengambil ulang halaman
+    yang sudah tersimpan. Baris terakhir yang terpotong karena crash dibuang
+    saat jurnal dibaca, agar baris berikutnya tidak tersambung ke sisanya.
+    """
+
+    def __init__(self, path: str = '.state/checkpoint.jsonl'):
+        """Inisialisasi jurnal.
+
+        Args:
+            path (str): Lokasi file jurnal
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.base_url = None
+
+    def reset(self):
+        """Hapus jurnal lama sehingga run dimulai dari halaman pertama."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def clear(self):
+        """Hapus jurnal setelah seluruh halaman berhasil diambil."""
+        self.reset()
+        print(f"[Checkpoint] Run selesai, jurnal {self.path} dihapus.")
+
+    def load(self, base_url: str) -> dict:
+        """Baca halaman yang sudah selesai untuk katalog base_url.
+
+        Jurnal milik katalog lain dianggap tidak berlaku dan dimulai ulang.
+
+        Returns:
+            dict: Nomor halaman -> daftar dict produk
+        """
+        self.base_url = base_url
+        completed = {}
+        if os.path.exists(self.path):
+            self._truncate_partial_line()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            self._write_header()
+            return completed
+
+        with open(self.path, encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get('type') == 'run' and entry.get('base_url') != base_url:
+                    print(f"[Checkpoint] Jurnal milik {entry.get('base_url')}, dimulai ulang.")
+                    self.reset()
+                    self._write_header()
+                    return {}
+                if entry.get('type') == 'page':
+                    completed[entry['page']] = [self._decode_item(item) for item in entry['items']]
+
+        if completed:
+            print(f"[Checkpoint] Melanjutkan run: {len(completed)} halaman sudah selesai.")
+        return completed
+
+    def _truncate_partial_line(self, block_size: int = 65536):
+        """Potong jurnal sampai baris utuh terakhir (kosong atau diakhiri baris baru)."""
+        with open(self.path, 'rb+') as journal_file:
+            end = journal_file.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - block_size)
+                journal_file.seek(start)
+                newline = journal_file.read(position - start).rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                print(f"[Checkpoint] Baris terakhir jurnal terpotong, {end - position} byte dibuang.")
+                journal_file.truncate(position)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+    def record(self, page: int, items: list):
+        """Tulis halaman yang sudah selesai ke jurnal secara durable."""
+        self._append({'type': 'page', 'page': page, 'items': items})
+
+    def _write_header(self):
+        self._append({'type': 'run', 'base_url': self.base_url})
+
+    def _append(self, entry: dict):
+        line = json.dumps(entry, default=self._encode_value, ensure_ascii=False)
+        with open(self.path, 'a', encoding='utf-8') as journal_file:
+            journal_file.write(line + '\n')
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _decode_item(item: dict) -> dict:
+        if isinstance(item.get('Timestamp'), str):
+            item['Timestamp'] = datetime.fromisoformat(item['Timestamp'])
+        return item
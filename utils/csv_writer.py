@@ -0,0 +1,260 @@
+import gzip
+import io
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from utils.state import hash_columns
+
+CSV_COMPRESSIONS = ("gzip", "zstd")
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+def infer_compression(path: str):
+    """Tentukan kompresi dari akhiran file: .gz -> gzip, .zst -> zstd, lainnya tanpa kompresi."""
+    if path.endswith('.gz'):
+        return "gzip"
+    if path.endswith('.zst'):
+        return "zstd"
+    return None
+
+def _row_keys(dataframe: pd.DataFrame, key_columns) -> np.ndarray:
+    """Hash 64-bit per baris dari teks kolom kunci seperti yang tertulis di CSV.
+
+    Nilai disamakan ke bentuk teks CSV (NaN menjadi string kosong) agar hash
+    dari DataFrame di memori sama dengan hash dari file yang dibaca ulang.
+    """
+    keys = dataframe[list(key_columns)].astype(object)
+    keys = keys.where(keys.notna(), '').astype(str)
+    return hash_columns(keys, key_columns).to_numpy()
+
+class AtomicCsvWriter:
+    """Penulis CSV bertahap yang menerbitkan file secara atomik.
+
+    Semua batch ditulis ke file sementara (path + '.tmp') lewat buffer dan
+    kompresor streaming (gzip atau zstd), lalu menggantikan file tujuan dengan
+    os.replace saat close(). Pembaca hanya pernah melihat file lama atau file
+    baru yang utuh; jika proses mati di tengah, file tujuan tidak berubah.
+
+    Pada mode append, isi file lama disalin byte demi byte ke file sementara
+    sekali per sesi (gzip ditambah member baru dan zstd ditambah frame baru,
+    tanpa dekompresi). Karena itu satu penulis sebaiknya dipakai untuk seluruh
+    run bertahap: commit() menutup batch di file sementara tanpa menyalin ulang
+    apa pun, sehingga biaya per batch tidak bergantung pada ukuran file. Jika
+    sesi dibatalkan dengan exception, batch yang sudah di-commit tetap
+    diterbitkan dan hanya batch yang belum di-commit yang dibuang.
+
+    Indeks kunci di file sidecar (path + '.keys.npz') menyimpan hash baris yang
+    sudah ada di file, sehingga baris yang sama bisa dilewati saat append.
+    """
+
+    def __init__(self, path: str, append: bool = False, compression: str = "infer", key_columns=None,
+                 skip_existing: bool = False, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """Inisialisasi penulis.
+
+        Args:
+            path (str): File CSV tujuan
+            append (bool): Pertahankan isi file lama dan tambahkan baris di bawahnya
+            compression (str): "infer" (dari akhiran path), None, "gzip", atau "zstd"
+            key_columns (tuple): Kolom kunci untuk indeks sidecar; None berarti semua kolom selain Timestamp
+            skip_existing (bool): Lewati baris yang kuncinya sudah ada di file
+            buffer_size (int): Ukuran buffer tulis dalam byte
+        """
+        compression = infer_compression(path) if compression == "infer" else compression
+        if compression is not None and compression not in CSV_COMPRESSIONS:
+            raise ValueError(f"Kompresi tidak dikenal: {compression}. Pilihan: {', '.join(CSV_COMPRESSIONS)}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("Kompresi zstd membutuhkan pustaka zstandard yang belum terpasang.")
+        self.path = path
+        self.index_path = f"{path}.keys.npz"
+        self.compression = compression
+        self.key_columns = tuple(key_columns) if key_columns is not None else None
+        self.skip_existing = skip_existing
+        self.buffer_size = buffer_size
+        self.rows_written = 0
+        self.rows_skipped = 0
+        self.bytes_written = 0
+
+        self._append = append and os.path.exists(path)
+        self._temp_path = f"{path}.tmp"
+        self._raw = None
+        self._compressor = None
+        self._text = None
+        self._columns = None
+        self._existing_keys = np.empty(0, dtype=np.int64)
+        self._new_keys = []
+        self._committed_batches = 0
+        self._seen_keys = set()
+        self._has_header = False
+        self._size_before = 0
+        self._committed_size = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def open(self):
+        """Siapkan file sementara; pada mode append salin dulu isi file lama ke dalamnya."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._raw = open(self._temp_path, 'wb', buffering=self.buffer_size)
+        if self._append:
+            with open(self.path, 'rb') as source:
+                shutil.copyfileobj(source, self._raw, COPY_BUFFER_SIZE)
+            self._size_before = self._committed_size = self._raw.tell()
+            self._has_header = self._size_before > 0
+
+    def _text_stream(self):
+        """Aliran teks untuk batch berikutnya; setiap commit memulai member gzip atau frame zstd baru."""
+        if self._text is None:
+            if self.compression == "gzip":
+                self._compressor = gzip.GzipFile(fileobj=self._raw, mode='wb')
+            elif self.compression == "zstd":
+                self._compressor = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+            self._text = io.TextIOWrapper(self._compressor or self._raw, encoding='utf-8', newline='',
+                                          write_through=True)
+        return self._text
+
+    def _finish_segment(self):
+        if self._text is not None:
+            self._text.flush()
+            self._text.detach()
+            self._text = None
+        if self._compressor is not None:
+            self._compressor.close()
+            self._compressor = None
+
+    def _key_columns_for(self, columns) -> tuple:
+        if self.key_columns is not None:
+            return self.key_columns
+        return tuple(column for column in columns if column != 'Timestamp')
+
+    def _load_existing_keys(self, key_columns):
+        """Baca indeks sidecar; bangun ulang dari file CSV jika tidak ada atau tidak cocok."""
+        if os.path.exists(self.index_path):
+            with np.load(self.index_path) as index:
+                if (int(index['data_size']) == self._size_before
+                        and tuple(index['key_columns'].tolist()) == key_columns):
+                    return index['keys']
+        print(f"[CSV] Indeks kunci {self.index_path} dibangun ulang dari {self.path}")
+        keys = [
+            _row_keys(chunk, key_columns)
+            for chunk in pd.read_csv(self.path, usecols=list(key_columns), dtype=str,
+                                     keep_default_na=False, chunksize=100_000,
+                                     compression=self.compression)
+        ]
+        return np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+
+    def write(self, dataframe: pd.DataFrame) -> int:
+        """Tulis satu batch; batch baru terlihat di file tujuan setelah commit() atau close().
+
+        Returns:
+            int: Jumlah baris yang ditulis setelah baris yang sudah ada dilewati
+        """
+        if self._columns is None:
+            self._columns = list(dataframe.columns)
+            key_columns = self._key_columns_for(self._columns)
+            self.key_columns = key_columns
+            if self._append:
+                self._existing_keys = self._load_existing_keys(key_columns)
+            if self.skip_existing:
+                self._seen_keys = set(self._existing_keys.tolist())
+
+        keys = _row_keys(dataframe, self.key_columns)
+        if self.skip_existing:
+            # Cek ke set kunci yang diperbarui per batch agar biaya per batch tidak ikut tumbuh dengan ukuran file
+            keep = np.fromiter((key not in self._seen_keys for key in keys.tolist()), dtype=bool, count=len(keys))
+            self.rows_skipped += int(len(keep) - keep.sum())
+            dataframe, keys = dataframe[keep], keys[keep]
+        if dataframe.empty:
+            return 0
+
+        dataframe.to_csv(self._text_stream(), header=not self._has_header, index=False)
+        self._has_header = True
+        self._new_keys.append(keys)
+        if self.skip_existing:
+            self._seen_keys.update(keys.tolist())
+        self.rows_written += len(dataframe)
+        return len(dataframe)
+
+    def commit(self) -> int:
+        """Tutup member/frame yang sedang ditulis dan fsync file sementara.
+
+        Batch yang sudah di-commit tidak dibuang lagi oleh abort(); file tujuan
+        baru diganti saat close() (atau abort()).
+
+        Returns:
+            int: Jumlah byte yang di-commit sejak commit sebelumnya
+        """
+        self._finish_segment()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        size = self._raw.tell()
+        committed_bytes = size - self._committed_size
+        self._committed_size = size
+        self._committed_batches = len(self._new_keys)
+        self.bytes_written += committed_bytes
+        return committed_bytes
+
+    def close(self):
+        """Commit batch terakhir lalu terbitkan file sementara dan indeks sidecar.
+
+        Jika belum ada batch yang ditulis, file tujuan tidak diubah.
+        """
+        if self._raw is None:
+            return
+        if self._columns is None:
+            self.abort()
+            return
+        self.commit()
+        self._publish()
+
+    def _publish(self):
+        self._raw.close()
+        self._raw = None
+        os.replace(self._temp_path, self.path)
+        if self._columns is not None:
+            self._write_index(self._committed_size)
+
+    def _write_index(self, data_size: int):
+        keys = np.concatenate([self._existing_keys] + self._new_keys[:self._committed_batches])
+        temp_index_path = f"{self.index_path}.tmp.npz"
+        np.savez(temp_index_path, keys=keys, data_size=np.int64(data_size),
+                 key_columns=np.array(self.key_columns, dtype=str))
+        os.replace(temp_index_path, self.index_path)
+
+    def abort(self):
+        """Buang batch yang belum di-commit; batch yang sudah di-commit tetap diterbitkan."""
+        if self._raw is not None:
+            try:
+                if self._text is not None:
+                    self._text.detach()
+                if self._compressor is not None:
+                    self._compressor.close()
+            except (ValueError, OSError):
+                pass
+            self._text = self._compressor = None
+            if self._committed_size > self._size_before:
+                self._raw.flush()
+                self._raw.truncate(self._committed_size)
+                os.fsync(self._raw.fileno())
+                self._publish()
+                return
+            self._raw.close()
+            self._raw = None
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
@@ -0,0 +1,194 @@
+import math
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+
+from utils.metrics import get_metrics
+from utils.state import hash_columns
+
+# Produk dianggap sama jika Title dan semua atributnya sama; Timestamp menentukan baris yang dipertahankan
+DEDUP_KEY_COLUMNS = ("Title", "Price", "Rating", "Colors", "Size", "Gender")
+DEDUP_MODES = ("exact", "bloom")
+# Batas jumlah parameter per query IN pada SQLite
+SQLITE_BATCH_SIZE = 500
+
+def latest_rows_mask(keys: np.ndarray, timestamps: pd.Series = None) -> np.ndarray:
+    """Mask baris yang dipertahankan: satu baris per kunci, yaitu yang Timestamp-nya paling baru.
+
+    Timestamp yang kosong atau tidak valid dianggap paling lama. Jika Timestamp
+    sama, baris yang muncul terakhir yang dipertahankan.
+    """
+    if timestamps is None:
+        return ~pd.Series(keys).duplicated(keep='last').to_numpy()
+    times = pd.to_datetime(timestamps, errors='coerce', utc=True)
+    # NaT menjadi int64 terkecil sehingga selalu berada di urutan paling awal
+    order = np.argsort(times.to_numpy(dtype='datetime64[ns]').view('int64'), kind='stable')
+    keep_sorted = ~pd.Series(keys[order]).duplicated(keep='last').to_numpy()
+    keep = np.zeros(len(keys), dtype=bool)
+    keep[order[keep_sorted]] = True
+    return keep
+
+class BloomFilter:
+    """Bloom filter bit-packed di numpy untuk kunci hash 64-bit.
+
+    Posisi bit dihitung dengan double hashing dari dua bagian 32-bit kunci,
+    sehingga semua operasi berjalan vektor untuk satu batch kunci.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """Inisialisasi filter.
+
+        Args:
+            capacity (int): Perkiraan jumlah kunci unik
+            error_rate (float): Peluang false positive pada kapasitas penuh
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        keys = keys.astype(np.uint64)
+        low = keys & np.uint64(0xFFFFFFFF)
+        high = keys >> np.uint64(32)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        return (low[:, None] + steps[None, :] * high[:, None]) % np.uint64(self.size)
+
+    def add(self, keys: np.ndarray):
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self._bits, positions >> np.uint64(3),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+
+    def might_contain(self, keys: np.ndarray) -> np.ndarray:
+        positions = self._positions(keys)
+        bits = (self._bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+class _SpilledKeySet:
+    """Himpunan kunci di SQLite, dipakai untuk memastikan hasil positif Bloom filter."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("DROP TABLE IF EXISTS seen_keys")
+        self._conn.execute("CREATE TABLE seen_keys (key_hash INTEGER PRIMARY KEY)")
+        self._conn.commit()
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        found = set()
+        key_list = keys.tolist()
+        for start in range(0, len(key_list), SQLITE_BATCH_SIZE):
+            batch = key_list[start:start + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            found.update(row[0] for row in self._conn.execute(
+                f"SELECT key_hash FROM seen_keys WHERE key_hash IN ({placeholders})", batch
+            ))
+        return np.fromiter((key in found for key in key_list), dtype=bool, count=len(key_list))
+
+    def add(self, keys: np.ndarray):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_keys (key_hash) VALUES (?)", ((key,) for key in keys.tolist())
+            )
+
+    def close(self):
+        self._conn.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class ProductDeduplicator:
+    """Tahap deduplikasi antara transformasi dan penyimpanan, berbasis indeks hash kunci.
+
+    Di dalam satu DataFrame, hanya baris dengan Timestamp terbaru per kunci yang
+    dipertahankan. Untuk batch berikutnya (mode --stream), kunci yang sudah
+    pernah dilewatkan dibuang karena batch sebelumnya sudah tersimpan.
+
+    Mode "exact" menyimpan semua kunci di memori. Mode "bloom" hanya menyimpan
+    Bloom filter berukuran tetap di memori; kunci yang mungkin sudah ada
+    dipastikan ke himpunan kunci di disk, sehingga hasilnya tetap tepat.
+    """
+
+    def __init__(self, key_columns=DEDUP_KEY_COLUMNS, mode: str = "exact", timestamp_column: str = 'Timestamp',
+                 capacity: int = 1_000_000, error_rate: float = 0.01,
+                 spill_path: str = '.state/dedup_keys.sqlite'):
+        """Inisialisasi deduplikator.
+
+        Args:
+            key_columns (tuple): Kolom yang menentukan dua baris sebagai duplikat
+            mode (str): "exact" atau "bloom"
+            timestamp_column (str): Kolom waktu untuk memilih baris terbaru
+            capacity (int): Perkiraan jumlah kunci unik untuk mode bloom
+            error_rate (float): Peluang false positive Bloom filter
+            spill_path (str): File SQLite sementara untuk kunci pada mode bloom
+        """
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Mode deduplikasi tidak dikenal: {mode}. Pilihan: {', '.join(DEDUP_MODES)}")
+        self.key_columns = tuple(key_columns)
+        self.mode = mode
+        self.timestamp_column = timestamp_column
+        self.dropped = 0
+        self.rows_seen = 0
+        self._seen = set()
+        self._bloom = BloomFilter(capacity, error_rate) if mode == "bloom" else None
+        self._spill = _SpilledKeySet(spill_path) if mode == "bloom" else None
+
+    def _already_seen(self, keys: np.ndarray) -> np.ndarray:
+        if self.mode == "exact":
+            seen = self._seen
+            return np.fromiter((key in seen for key in keys.tolist()), dtype=bool, count=len(keys))
+        candidates = self._bloom.might_contain(keys)
+        already_seen = np.zeros(len(keys), dtype=bool)
+        if candidates.any():
+            already_seen[candidates] = self._spill.contains(keys[candidates])
+        return already_seen
+
+    def _remember(self, keys: np.ndarray):
+        if self.mode == "exact":
+            self._seen.update(keys.tolist())
+        else:
+            self._bloom.add(keys)
+            self._spill.add(keys)
+
+    def filter(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Buang baris duplikat dari dataframe dan dari batch yang sudah dilewatkan sebelumnya.
+
+        Returns:
+            pd.DataFrame: Baris unik dengan urutan asli
+        """
+        if dataframe.empty:
+            return dataframe
+        keys = hash_columns(dataframe, self.key_columns).to_numpy()
+        timestamps = dataframe[self.timestamp_column] if self.timestamp_column in dataframe.columns else None
+        keep = latest_rows_mask(keys, timestamps)
+        keep[keep] = ~self._already_seen(keys[keep])
+        self._remember(keys[keep])
+
+        dropped = int(len(dataframe) - keep.sum())
+        self.rows_seen += len(dataframe)
+        self.dropped += dropped
+        if dropped:
+            get_metrics().inc('etl_rows_dropped_total', dropped, stage="dedup", rule="duplicate")
+        return dataframe[keep]
+
+    def filter_batches(self, batches):
+        """Terapkan filter pada setiap batch; batch yang kosong setelah deduplikasi dilewati."""
+        for batch in batches:
+            unique_batch = self.filter(batch)
+            if not unique_batch.empty:
+                yield unique_batch
+
+    def report(self):
+        """Cetak jumlah baris duplikat yang dibuang."""
+        print(f"[Dedup] {self.dropped} duplikat dibuang dari {self.rows_seen} baris (mode {self.mode})")
+
+    def close(self):
+        """Hapus himpunan kunci sementara pada mode bloom."""
+        if self._spill is not None:
+            self._spill.close()
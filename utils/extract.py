@@ -1,9 +1,29 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime
 import time
+import asyncio
+import heapq
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from urllib.parse import urljoin
+from utils.resilience import AdaptiveConcurrencyLimiter, CircuitOpenError
+from utils.metrics import get_metrics
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
 
 HEADERS = {
     "User-Agent": (
@@ -12,15 +32,239 @@ HEADERS = {
     )
 }
 
-def retrieve_page_content(link: str):
-    """Mengambil konten HTML dari URL dengan penanganan error jaringan."""
+BASE_URL = "https://fashion-studio.dicoding.dev/"
+
+DEFAULT_POOL_SIZE = 10
+
+_http_session = None
+_http_pool_size = 0
+_session_lock = threading.Lock()
+_page_cache = None
+_retry_policy = None
+
+def _supported_encodings() -> str:
+    """Daftar encoding kompresi yang bisa didekode, brotli hanya jika pustakanya terpasang."""
+    encodings = ["gzip", "deflate"]
     try:
-        resp = requests.get(link, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
-        return resp.text
-    except requests.exceptions.RequestException as err:
-        print(f"Kesalahan saat mengakses {link}: {err}")
-        return None
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings)
+
+def create_http_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Buat session HTTP dengan connection pool, keep-alive, dan transfer terkompresi.
+
+    Args:
+        pool_size (int): Jumlah koneksi yang disimpan per host di dalam pool
+
+    Returns:
+        requests.Session: Session yang siap dipakai bersama
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.headers.update({
+        "Accept-Encoding": _supported_encodings(),
+        "Connection": "keep-alive",
+    })
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def configure_http_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Ganti session bersama dengan session baru berukuran pool tertentu."""
+    global _http_session, _http_pool_size
+    with _session_lock:
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = create_http_session(pool_size)
+        _http_pool_size = pool_size
+        return _http_session
+
+def get_http_session(min_pool_size: int = 0) -> requests.Session:
+    """Ambil session bersama, dibuat saat pertama kali dipakai.
+
+    Args:
+        min_pool_size (int): Jika pool saat ini lebih kecil, session dibuat ulang
+                             dengan pool sebesar nilai ini
+    """
+    if _http_session is None or _http_pool_size < min_pool_size:
+        return configure_http_session(max(DEFAULT_POOL_SIZE, min_pool_size))
+    return _http_session
+
+def build_page_url(page: int, base_url: str = BASE_URL) -> str:
+    """Bentuk URL halaman katalog; halaman pertama memakai URL dasar."""
+    if page == 1:
+        return base_url
+    return f"{base_url}page{page}"
+
+class TokenBucket:
+    """Pembatas laju global berbasis token bucket untuk mode asyncio.
+
+    Args:
+        rate (float): Jumlah token (request) yang diisi ulang per detik
+        capacity (int): Jumlah token maksimum, menentukan besarnya burst
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate harus lebih besar dari 0")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """Tunggu sampai satu token tersedia lalu pakai token tersebut."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+async def fetch_pages_async(urls, concurrency=5, rate_limit=None, bucket=None, limiter=None, fetcher=None):
+    """Ambil banyak halaman secara bersamaan dengan batas konkurensi dan laju.
+
+    Setiap request tetap memakai retrieve_page_content di thread terpisah,
+    sehingga penanganan error jaringannya sama dengan mode berurutan.
+
+    Args:
+        urls (list): Daftar URL yang akan diambil
+        concurrency (int): Jumlah request maksimum yang berjalan bersamaan
+        rate_limit (float): Batas request per detik untuk semua worker, None berarti tanpa batas
+        bucket (TokenBucket): Bucket yang dipakai bersama antar pemanggilan; jika None
+                              dibuat dari rate_limit
+        limiter (AdaptiveConcurrencyLimiter): Jika diisi, batas konkurensi diatur secara
+                                              adaptif (AIMD) dengan concurrency sebagai batas atas
+        fetcher (callable): Pengganti retrieve_page_content untuk setiap URL, mis.
+                            fetch_page_with_status; hasilnya dikembalikan apa adanya
+
+    Returns:
+        list: Konten HTML (atau None jika gagal) dengan urutan yang sama seperti urls
+    """
+    fetcher = fetcher or retrieve_page_content
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    if bucket is None and rate_limit:
+        bucket = TokenBucket(rate_limit, capacity=concurrency)
+
+    async def fetch_one(url):
+        async with semaphore:
+            if bucket is not None:
+                await bucket.acquire()
+            print(f"Mengambil data dari: {url}")
+            if limiter is None:
+                return await asyncio.to_thread(fetcher, url)
+            async with limiter.slot():
+                started_at = time.monotonic()
+                html_content = await asyncio.to_thread(fetcher, url)
+                limiter.record(time.monotonic() - started_at, html_content is not None)
+                return html_content
+
+    return await asyncio.gather(*(fetch_one(url) for url in urls))
+
+def configure_page_cache(cache):
+    """Pasang PageCache (atau None untuk mematikan cache) di belakang retrieve_page_content."""
+    global _page_cache
+    _page_cache = cache
+
+def configure_retry_policy(policy):
+    """Pasang RetryPolicy bawaan (atau None untuk satu percobaan saja) untuk retrieve_page_content."""
+    global _retry_policy
+    _retry_policy = policy
+
+def retrieve_page_content(link: str, retry_policy=None):
+    """Mengambil konten HTML dari URL dengan penanganan error jaringan.
+
+    Jika PageCache terpasang, entri yang masih segar dipakai langsung dan entri
+    kedaluwarsa direvalidasi dengan If-None-Match / If-Modified-Since. Jika ada
+    RetryPolicy (argumen atau yang dipasang lewat configure_retry_policy),
+    error sementara, 429, dan 5xx diulang dengan backoff. Latensi dan status
+    setiap halaman dicatat ke metrik pipeline yang terpasang.
+    """
+    return fetch_page_with_status(link, retry_policy)[0]
+
+def fetch_page_with_status(link: str, retry_policy=None):
+    """Sama seperti retrieve_page_content, tetapi juga mengembalikan kode status HTTP terakhir.
+
+    Dipakai jika pemanggil perlu membedakan halaman yang memang tidak ada (404)
+    dari kegagalan pengambilan (error jaringan, circuit terbuka, atau 5xx).
+
+    Returns:
+        tuple: (konten HTML atau None, kode status HTTP atau None jika tidak ada respons)
+    """
+    metrics = get_metrics()
+    started_at = time.monotonic()
+    html_content, status_code = _fetch_page_content(link, retry_policy)
+    metrics.observe('etl_page_fetch_seconds', time.monotonic() - started_at)
+    metrics.inc('etl_pages_fetched_total', status='ok' if html_content else 'failed')
+    if not html_content:
+        metrics.log('page_fetch_failed', url=link, status_code=status_code)
+    return html_content, status_code
+
+def _fetch_page_content(link: str, retry_policy=None):
+    cache = _page_cache
+    policy = retry_policy or _retry_policy
+    entry = cache.get(link) if cache is not None else None
+    if entry is not None and cache.is_fresh(entry):
+        cache.record_hit()
+        return entry["body"], 200
+
+    request_kwargs = {"timeout": 10}
+    if entry is not None:
+        request_kwargs["headers"] = cache.conditional_headers(entry)
+    max_attempts = policy.max_attempts if policy is not None else 1
+    for attempt in range(1, max_attempts + 1):
+        started_at = time.monotonic()
+        try:
+            if policy is not None:
+                policy.before_attempt()
+            resp = get_http_session().get(link, **request_kwargs)
+            if policy is not None:
+                outcome = policy.classify_response(resp)
+                policy.record(outcome, time.monotonic() - started_at)
+                if attempt < max_attempts and policy.is_retryable(outcome, resp.status_code):
+                    policy.metrics.record_retry()
+                    time.sleep(policy.compute_delay(attempt, resp.headers.get("Retry-After")))
+                    continue
+            if entry is not None and resp.status_code == 304:
+                cache.mark_revalidated(link)
+                return entry["body"], resp.status_code
+            resp.raise_for_status()
+            get_metrics().inc('etl_bytes_downloaded_total', len(resp.content))
+            if cache is not None:
+                cache.record_miss()
+                cache.put(link, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            return resp.text, resp.status_code
+        except CircuitOpenError as err:
+            print(f"Kesalahan saat mengakses {link}: {err}")
+            return None, None
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as err:
+            if policy is not None:
+                policy.record(policy.classify_error(err), time.monotonic() - started_at)
+                if attempt < max_attempts:
+                    policy.metrics.record_retry()
+                    time.sleep(policy.compute_delay(attempt))
+                    continue
+            print(f"Kesalahan saat mengakses {link}: {err}")
+            return None, None
+        except requests.exceptions.RequestException as err:
+            if policy is not None and not isinstance(err, requests.exceptions.HTTPError):
+                policy.record(policy.classify_error(err), time.monotonic() - started_at)
+            print(f"Kesalahan saat mengakses {link}: {err}")
+            response = getattr(err, 'response', None)
+            return None, getattr(response, 'status_code', None)
 
 def parse_text_by_keyword(elements, key, regex_pattern, fallback="Tidak Diketahui"):
     """Cari teks yang mengandung kata kunci dan ekstrak dengan regex yang diberikan."""
@@ -32,8 +276,56 @@ def parse_text_by_keyword(elements, key, regex_pattern, fallback="Tidak Diketahu
                 return found.group(1).strip()
     return fallback
 
-def parse_fashion_item(card_div):
-    """Ekstrak data produk dari elemen kartu produk."""
+# (kolom, kata kunci, pola terkompilasi, fallback) untuk setiap paragraf info kartu
+CARD_FIELD_PATTERNS = (
+    ("Rating", "Rating", re.compile(r"Rating:\s*(⭐\s*\d+(?:\.\d+)?)"), "Rating Tidak Valid"),
+    ("Colors", "Colors", re.compile(r"(\d+)\s*Colors"), "Warna Tidak Ada"),
+    ("Size", "Size", re.compile(r"Size:\s*(\w+)"), "Ukuran Tidak Diketahui"),
+    ("Gender", "Gender", re.compile(r"Gender:\s*(\w+)"), "Gender Tidak Diketahui"),
+)
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+def classify_paragraphs(texts):
+    """Klasifikasikan teks paragraf kartu ke kolom Rating, Colors, Size, dan Gender dalam satu lintasan.
+
+    Hasilnya sama dengan memanggil parse_text_by_keyword per kolom: untuk setiap
+    kolom dipakai paragraf pertama yang mengandung kata kunci dan cocok dengan polanya.
+
+    Args:
+        texts (list): Teks paragraf yang sudah di-strip, sesuai urutan di kartu
+
+    Returns:
+        dict: Nilai per kolom, memakai fallback jika tidak ditemukan
+    """
+    found_values = {}
+    for text in texts:
+        for column, key, pattern, _ in CARD_FIELD_PATTERNS:
+            if column in found_values or key not in text:
+                continue
+            found = pattern.search(text)
+            if found:
+                found_values[column] = found.group(1).strip()
+        if len(found_values) == len(CARD_FIELD_PATTERNS):
+            break
+    return {
+        column: found_values.get(column, fallback)
+        for column, _, _, fallback in CARD_FIELD_PATTERNS
+    }
+
+def _build_item(product_name, product_price, paragraph_texts, scrape_time=None):
+    item = {"Title": product_name, "Price": product_price}
+    item.update(classify_paragraphs(paragraph_texts))
+    item["Timestamp"] = scrape_time or datetime.now()
+    return item
+
+def parse_fashion_item(card_div, scrape_time=None):
+    """Ekstrak data produk dari elemen kartu produk.
+
+    Args:
+        card_div: Elemen kartu produk (BeautifulSoup)
+        scrape_time (datetime): Waktu pengambilan halaman; None berarti waktu saat ini
+    """
     try:
         # Judul produk
         title_tag = card_div.select_one('h3.product-title')
@@ -43,61 +335,499 @@ def parse_fashion_item(card_div):
         price_tag = card_div.find('div', class_='price-container')
         product_price = price_tag.get_text(strip=True) if price_tag else "Harga Tidak Ada"
 
-        # Ambil semua paragraf info
-        paragraphs = card_div.find_all('p')
+        # Ambil teks semua paragraf info sekali saja, lalu klasifikasikan dalam satu lintasan
+        paragraph_texts = [p.get_text(strip=True) for p in card_div.find_all('p')]
+
+        return _build_item(product_name, product_price, paragraph_texts, scrape_time)
+    except Exception as e:
+        print(f"Error saat parsing produk: {e}")
+        return None
+
+def parse_fashion_node(card_node, scrape_time=None):
+    """Ekstrak data produk dari node kartu selectolax, setara dengan parse_fashion_item."""
+    try:
+        title_node = card_node.css_first('h3.product-title')
+        product_name = title_node.text(strip=True) if title_node else "Judul Tidak Ditemukan"
 
-        # Ekstraksi rating, warna, ukuran, dan gender dengan pola berbeda
-        rating_val = parse_text_by_keyword(paragraphs, "Rating", r"Rating:\s*(⭐\s*\d+(?:\.\d+)?)", "Rating Tidak Valid")
-        color_count = parse_text_by_keyword(paragraphs, "Colors", r"(\d+)\s*Colors", "Warna Tidak Ada")
-        size_info = parse_text_by_keyword(paragraphs, "Size", r"Size:\s*(\w+)", "Ukuran Tidak Diketahui")
-        gender_info = parse_text_by_keyword(paragraphs, "Gender", r"Gender:\s*(\w+)", "Gender Tidak Diketahui")
+        price_node = card_node.css_first('div.price-container')
+        product_price = price_node.text(strip=True) if price_node else "Harga Tidak Ada"
 
-        scrape_time = datetime.now()
+        paragraph_texts = [p.text(strip=True) for p in card_node.css('p')]
 
-        return {
-            "Title": product_name,
-            "Price": product_price,
-            "Rating": rating_val,
-            "Colors": color_count,
-            "Size": size_info,
-            "Gender": gender_info,
-            "Timestamp": scrape_time
-        }
+        return _build_item(product_name, product_price, paragraph_texts, scrape_time)
     except Exception as e:
         print(f"Error saat parsing produk: {e}")
         return None
 
-def collect_fashion_data(pages_to_scrape, wait_seconds=2):
-    """Kumpulkan data produk fashion dari beberapa halaman dengan delay dan error handling."""
-    collected = []
-    base_url = "https://fashion-studio.dicoding.dev/"
-    for page in range(1, pages_to_scrape + 1):
-        if page == 1:
-            url = base_url
+def available_parser_backends():
+    """Daftar backend parser HTML yang bisa dipakai di lingkungan ini."""
+    backends = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        backends.append("lxml")
+    except ImportError:
+        pass
+    if HTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+def best_parser_backend():
+    """Backend parser tercepat yang terpasang (selectolax, lalu lxml, lalu html.parser)."""
+    return available_parser_backends()[-1]
+
+def check_parser_backend(backend):
+    """Pastikan backend parser dikenal dan pustakanya terpasang."""
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Backend parser tidak dikenal: {backend}. Pilihan: {', '.join(PARSER_BACKENDS)}")
+    if backend not in available_parser_backends():
+        raise ImportError(f"Backend parser '{backend}' membutuhkan pustaka yang belum terpasang.")
+
+def parse_page_products(html_content, page, backend="html.parser"):
+    """Parse satu halaman HTML menjadi daftar data produk.
+
+    Args:
+        html_content (str): Konten HTML halaman
+        page (int): Nomor halaman, untuk pesan log
+        backend (str): "html.parser", "lxml", atau "selectolax"
+
+    Returns:
+        list: Daftar dict produk, kosong jika halaman tidak berisi produk atau gagal diparse
+    """
+    try:
+        if backend == "selectolax":
+            product_cards = HTMLParser(html_content).css('div.collection-card')
+            parse_card = parse_fashion_node
         else:
-            url = f"{base_url}page{page}"
+            soup = BeautifulSoup(html_content, backend)
+            product_cards = soup.find_all('div', class_='collection-card')
+            parse_card = parse_fashion_item
+        if not product_cards:
+            print(f"Tidak ditemukan produk di halaman {page}.")
+            return []
+
+        # Satu halaman diambil pada satu waktu, jadi timestamp cukup diambil sekali
+        scrape_time = datetime.now()
+        items = []
+        for card in product_cards:
+            item = parse_card(card, scrape_time)
+            if item:
+                items.append(item)
+        return items
+    except Exception as parse_err:
+        print(f"Kesalahan parsing halaman {page}: {parse_err}")
+        return []
+
+def page_has_products(html_content) -> bool:
+    """Cek cepat apakah HTML halaman berisi kartu produk, tanpa parsing penuh."""
+    return bool(html_content) and 'collection-card' in html_content
+
+def find_next_page_url(html_content, current_url):
+    """Cari URL halaman berikutnya dari tautan "Next" di navigasi halaman.
 
+    Returns:
+        str: URL absolut halaman berikutnya, atau None jika ini halaman terakhir
+    """
+    soup = BeautifulSoup(html_content, "html.parser")
+    link = (
+        soup.select_one('a[rel~="next"][href]')
+        or soup.select_one('li.next a[href]')
+        or soup.find('a', href=True, string=re.compile(r'^\s*Next\b', re.IGNORECASE))
+    )
+    if link is None:
+        return None
+    return urljoin(current_url, link['href'])
+
+class PageDiscoveryError(RuntimeError):
+    """Jumlah halaman katalog tidak bisa dipastikan karena probe halaman terus gagal diambil."""
+
+def discover_page_count(base_url=BASE_URL, concurrency=5, rate_limit=None, max_pages=1000,
+                        probe_attempts=3, retry_delay=1.0):
+    """Temukan jumlah halaman katalog dengan probing bersamaan yang terbatas.
+
+    Tahap pertama menggandakan nomor halaman (1, 2, 4, ...) sampai ditemukan
+    halaman tanpa produk, lalu interval yang tersisa dipersempit dengan
+    pencarian k-ary: setiap putaran mengirim `concurrency` probe sekaligus.
+    Halaman yang sudah diprobe akan diambil dari PageCache jika cache terpasang.
+
+    Hanya respons 404 atau halaman tanpa kartu produk yang dianggap "tidak ada".
+    Probe yang gagal diambil (error jaringan, circuit terbuka, 5xx) tidak
+    mempersempit batas; probe itu diulang, dan jika tetap gagal discovery
+    dihentikan agar katalog tidak terpotong diam-diam.
+
+    Args:
+        base_url (str): URL dasar katalog
+        concurrency (int): Jumlah probe per putaran
+        rate_limit (float): Batas request per detik
+        max_pages (int): Batas atas jumlah halaman yang dicari
+        probe_attempts (int): Jumlah percobaan per probe yang gagal diambil
+        retry_delay (float): Jeda awal sebelum mengulang probe yang gagal (berlipat dua setiap ulangan)
+
+    Returns:
+        int: Nomor halaman terakhir yang berisi produk, 0 jika tidak ada
+
+    Raises:
+        PageDiscoveryError: Jika sebuah probe tetap gagal setelah probe_attempts percobaan
+    """
+    concurrency = max(1, concurrency)
+    get_http_session(min_pool_size=concurrency)
+    bucket = TokenBucket(rate_limit, capacity=concurrency) if rate_limit else None
+    loop = asyncio.new_event_loop()
+
+    def fetch_round(pages):
+        urls = [build_page_url(page, base_url) for page in pages]
+        responses = loop.run_until_complete(
+            fetch_pages_async(urls, concurrency, bucket=bucket, fetcher=fetch_page_with_status)
+        )
+        results = {}
+        for page, (html_content, status_code) in zip(pages, responses):
+            if html_content is not None:
+                results[page] = page_has_products(html_content)
+            elif status_code == 404:
+                results[page] = False
+        return results
+
+    def probe(candidates):
+        results = fetch_round(candidates)
+        for attempt in range(1, probe_attempts):
+            failed = [page for page in candidates if page not in results]
+            if not failed:
+                break
+            print(f"Probe halaman {failed} gagal diambil, mencoba lagi ({attempt}/{probe_attempts - 1})...")
+            time.sleep(retry_delay * 2 ** (attempt - 1))
+            results.update(fetch_round(failed))
+        failed = [page for page in candidates if page not in results]
+        if failed:
+            raise PageDiscoveryError(
+                f"Jumlah halaman tidak dapat dipastikan: probe halaman {failed} gagal setelah "
+                f"{probe_attempts} percobaan"
+            )
+        return results
+
+    # lo: halaman terbesar yang diketahui ada, hi: halaman terkecil yang diketahui tidak ada
+    lo, hi = 0, None
+    try:
+        next_page = 1
+        while hi is None:
+            candidates = []
+            while len(candidates) < concurrency and next_page <= max_pages:
+                candidates.append(next_page)
+                next_page = max_pages if next_page < max_pages < next_page * 2 else next_page * 2
+            if not candidates:
+                hi = max_pages + 1
+                break
+            results = probe(candidates)
+            for page in candidates:
+                if not results[page]:
+                    hi = page
+                    break
+                lo = page
+
+        while hi - lo > 1:
+            step = (hi - lo) / (concurrency + 1)
+            candidates = sorted({lo + max(1, round(step * i)) for i in range(1, concurrency + 1)} - {hi})
+            candidates = [page for page in candidates if lo < page < hi]
+            results = probe(candidates)
+            for page in candidates:
+                if not results[page]:
+                    hi = page
+                    break
+                lo = page
+    finally:
+        loop.close()
+
+    print(f"Ditemukan {lo} halaman katalog.")
+    return lo
+
+def iter_linked_page_html(base_url=BASE_URL, wait_seconds=2, max_pages=1000, start_page=1):
+    """Ambil halaman berurutan dengan mengikuti tautan "Next" sampai halaman terakhir.
+
+    Args:
+        base_url (str): URL dasar katalog
+        wait_seconds (float): Jeda antar halaman
+        max_pages (int): Batas pengaman jumlah halaman
+        start_page (int): Halaman awal, dipakai saat melanjutkan run
+
+    Returns:
+        bool: (nilai return generator) True jika sampai di halaman terakhir tanpa kegagalan
+    """
+    url = build_page_url(start_page, base_url)
+    page = start_page
+    while url and page <= max_pages:
         print(f"Mengambil data dari: {url}")
         html_content = retrieve_page_content(url)
         if not html_content:
             print(f"Gagal mengambil halaman {page}, menghentikan proses.")
-            break
+            return False
+
+        yield page, html_content
+        url = find_next_page_url(html_content, url)
+        page += 1
+        if url:
+            time.sleep(wait_seconds)
+    return True
+
+def iter_page_html(pages, wait_seconds=2, concurrency=None, rate_limit=None, base_url=BASE_URL,
+                   adaptive_concurrency=False):
+    """Ambil HTML halaman sesuai urutan dan hasilkan pasangan (halaman, html).
+
+    Berhenti pada halaman pertama yang gagal diambil, sama seperti sebelumnya.
+
+    Args:
+        pages (range): Nomor halaman yang akan diambil
+        wait_seconds (float): Jeda antar halaman pada mode berurutan
+        concurrency (int): Jika diisi, halaman diambil bersamaan dengan asyncio
+        rate_limit (float): Batas request per detik untuk mode asyncio
+        base_url (str): URL dasar katalog
+        adaptive_concurrency (bool): Atur konkurensi secara AIMD dengan concurrency sebagai batas atas
 
+    Returns:
+        bool: (nilai return generator) True jika semua halaman berhasil diambil
+    """
+    if concurrency:
+        # Pastikan setiap worker mendapat koneksi sendiri dari pool
+        get_http_session(min_pool_size=concurrency)
+        # Halaman diambil per jendela agar HTML yang tertahan di memori tetap terbatas
+        window = concurrency * 4
+        bucket = TokenBucket(rate_limit, capacity=concurrency) if rate_limit else None
+        limiter = None
+        if adaptive_concurrency:
+            limiter = AdaptiveConcurrencyLimiter(initial=max(1, concurrency // 2), max_limit=concurrency)
+        loop = asyncio.new_event_loop()
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
-            product_cards = soup.find_all('div', class_='collection-card')
-            if not product_cards:
-                print(f"Tidak ditemukan produk di halaman {page}.")
-                continue
+            for start in range(0, len(pages), window):
+                window_pages = pages[start:start + window]
+                urls = [build_page_url(page, base_url) for page in window_pages]
+                html_pages = loop.run_until_complete(
+                    fetch_pages_async(urls, concurrency, bucket=bucket, limiter=limiter)
+                )
+                for page, html_content in zip(window_pages, html_pages):
+                    if not html_content:
+                        print(f"Gagal mengambil halaman {page}, menghentikan proses.")
+                        return False
+                    yield page, html_content
+        finally:
+            loop.close()
+        return True
 
-            for card in product_cards:
-                item = parse_fashion_item(card)
-                if item:
-                    collected.append(item)
+    for page in pages:
+        url = build_page_url(page, base_url)
 
-            time.sleep(wait_seconds)
-        except Exception as parse_err:
-            print(f"Kesalahan parsing halaman {page}: {parse_err}")
-            continue
+        print(f"Mengambil data dari: {url}")
+        html_content = retrieve_page_content(url)
+        if not html_content:
+            print(f"Gagal mengambil halaman {page}, menghentikan proses.")
+            return False
+
+        yield page, html_content
+        time.sleep(wait_seconds)
+    return True
+
+def _parse_page_chunk(page_chunk, backend):
+    """Worker proses: parse sekumpulan (halaman, html) menjadi (halaman, daftar produk)."""
+    return [(page, parse_page_products(html_content, page, backend)) for page, html_content in page_chunk]
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def parse_pages_in_pool(page_html, backend="html.parser", workers=None, chunksize=1):
+    """Parse HTML di ProcessPoolExecutor sambil halaman berikutnya masih diambil.
+
+    Setiap chunk halaman dikirim ke worker begitu terkumpul, lalu hasilnya
+    dikembalikan sesuai urutan halaman. Jumlah chunk yang menunggu dibatasi
+    agar memori tetap terkendali.
+
+    Args:
+        page_html (iterable): Pasangan (halaman, html) sesuai urutan
+        backend (str): Backend parser HTML
+        workers (int): Jumlah proses parser, None berarti jumlah CPU
+        chunksize (int): Jumlah halaman per tugas worker
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunked(page_html, max(1, chunksize)):
+            pending.append(executor.submit(_parse_page_chunk, chunk, backend))
+            while pending and (pending[0].done() or len(pending) >= max_pending):
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def iter_parsed_pages(pages_to_scrape, wait_seconds=2, concurrency=None, rate_limit=None,
+                      parser_backend="html.parser", parse_workers=None, parse_chunksize=1,
+                      base_url=BASE_URL, checkpoint=None, adaptive_concurrency=False):
+    """Hasilkan pasangan (halaman, daftar produk) sesuai urutan halaman.
+
+    Argumen sama dengan collect_fashion_data.
+    """
+    check_parser_backend(parser_backend)
+    completed = checkpoint.load(base_url) if checkpoint is not None else {}
+    fetch_status = {}
+
+    if pages_to_scrape is None and concurrency:
+        pages_to_scrape = discover_page_count(base_url, concurrency, rate_limit)
+    if pages_to_scrape is not None:
+        remaining = [page for page in range(1, pages_to_scrape + 1) if page not in completed]
+        page_html = iter_page_html(remaining, wait_seconds, concurrency, rate_limit, base_url, adaptive_concurrency)
+    else:
+        # Mode tautan "Next" dilanjutkan setelah halaman berurutan terakhir yang tersimpan
+        last_completed = 0
+        while last_completed + 1 in completed:
+            last_completed += 1
+        completed = {page: completed[page] for page in range(1, last_completed + 1)}
+        page_html = iter_linked_page_html(base_url, wait_seconds, start_page=last_completed + 1)
+
+    def track_status(pages):
+        fetch_status['complete'] = yield from pages
+
+    tracked_html = track_status(page_html)
+    if parse_workers:
+        parsed_pages = parse_pages_in_pool(tracked_html, parser_backend, parse_workers, parse_chunksize)
+    else:
+        parsed_pages = ((page, parse_page_products(html_content, page, parser_backend))
+                        for page, html_content in tracked_html)
+
+    metrics = get_metrics()
+
+    def record(pages):
+        for page, items in pages:
+            metrics.inc('etl_rows_extracted_total', len(items))
+            if not items:
+                metrics.inc('etl_parse_failures_total')
+            if checkpoint is not None:
+                checkpoint.record(page, items)
+            yield page, items
+
+    stored_pages = ((page, completed[page]) for page in sorted(completed))
+    yield from heapq.merge(stored_pages, record(parsed_pages), key=lambda entry: entry[0])
+
+    if checkpoint is not None and fetch_status.get('complete'):
+        checkpoint.clear()
+
+class ProductRecordBuilder:
+    """Penampung data produk berbentuk kolom yang langsung menjadi DataFrame.
+
+    Produk dari setiap halaman ditambahkan ke list per kolom, sehingga tidak ada
+    daftar dict yang menumpuk sepanjang run. Kolom baru yang muncul di tengah
+    jalan diisi None untuk baris-baris sebelumnya.
+    """
+
+    __slots__ = ("_columns", "_length")
+
+    def __init__(self):
+        self._columns = {}
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append(self, item: dict):
+        """Tambahkan satu dict produk sebagai baris baru."""
+        columns = self._columns
+        if item.keys() == columns.keys():
+            for column, values in columns.items():
+                values.append(item[column])
+        else:
+            for column in item:
+                if column not in columns:
+                    columns[column] = [None] * self._length
+            for column, values in columns.items():
+                values.append(item.get(column))
+        self._length += 1
+
+    def extend(self, items):
+        """Tambahkan beberapa dict produk sekaligus."""
+        for item in items:
+            self.append(item)
+
+    @staticmethod
+    def _datetime_column(values) -> pd.DatetimeIndex:
+        # Timestamp diambil sekali per halaman, jadi hanya nilai unik yang dikonversi
+        positions = {}
+        codes = np.fromiter(
+            (positions.setdefault(value, len(positions)) for value in values),
+            dtype=np.intp, count=len(values),
+        )
+        return pd.to_datetime(list(positions), errors="coerce").take(codes)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Bangun DataFrame bertipe dari kolom yang terkumpul, lalu kosongkan builder.
+
+        Returns:
+            pd.DataFrame: Data produk mentah; Timestamp bertipe datetime64,
+                          DataFrame kosong jika belum ada baris
+        """
+        if not self._length:
+            return pd.DataFrame()
+        columns = {}
+        for column, values in self._columns.items():
+            if column == "Timestamp":
+                columns[column] = self._datetime_column(values)
+            else:
+                columns[column] = pd.Series(values, dtype=object)
+        self._columns = {}
+        self._length = 0
+        return pd.DataFrame(columns, copy=False)
+
+def iter_fashion_batches(pages_to_scrape=None, batch_size=None, **scrape_options):
+    """Hasilkan data produk mentah sebagai DataFrame kecil secara bertahap.
+
+    Args:
+        pages_to_scrape (int): Jumlah halaman yang akan diambil, None untuk penemuan otomatis
+        batch_size (int): Jumlah baris per batch; None berarti satu batch per halaman
+        **scrape_options: Opsi lain yang sama dengan collect_fashion_data
+
+    Yields:
+        pd.DataFrame: Batch data mentah dengan urutan sesuai nomor halaman
+    """
+    pending = ProductRecordBuilder()
+    for _, items in iter_parsed_pages(pages_to_scrape, **scrape_options):
+        for item in items:
+            pending.append(item)
+            if batch_size is not None and len(pending) >= batch_size:
+                yield pending.to_frame()
+        if batch_size is None and len(pending):
+            yield pending.to_frame()
+    if len(pending):
+        yield pending.to_frame()
+
+def collect_fashion_data(pages_to_scrape=None, wait_seconds=2, concurrency=None, rate_limit=None,
+                         parser_backend="html.parser", parse_workers=None, parse_chunksize=1,
+                         base_url=BASE_URL, checkpoint=None, adaptive_concurrency=False):
+    """Kumpulkan data produk fashion dari beberapa halaman dengan delay dan error handling.
+
+    Args:
+        pages_to_scrape (int): Jumlah halaman yang akan diambil; None berarti jumlah
+                               halaman ditemukan otomatis (probing pada mode asyncio,
+                               mengikuti tautan "Next" pada mode berurutan)
+        wait_seconds (float): Jeda antar halaman pada mode berurutan
+        concurrency (int): Jika diisi, halaman diambil bersamaan dengan asyncio
+                           dan jeda per halaman diganti oleh rate_limit
+        rate_limit (float): Batas request per detik untuk mode asyncio
+        parser_backend (str): Backend parser HTML, lihat PARSER_BACKENDS
+        parse_workers (int): Jika diisi, parsing dijalankan di ProcessPoolExecutor
+                             dengan jumlah worker ini, terpisah dari I/O jaringan
+        parse_chunksize (int): Jumlah halaman per tugas worker parser
+        base_url (str): URL dasar katalog
+        checkpoint (CheckpointJournal): Jika diisi, halaman yang selesai dicatat ke jurnal
+                                        dan halaman yang sudah ada di jurnal tidak diambil ulang
+        adaptive_concurrency (bool): Pada mode asyncio, konkurensi diatur secara AIMD
+                                     dengan concurrency sebagai batas atas
+
+    Returns:
+        pd.DataFrame: Data produk mentah dengan urutan sesuai nomor halaman
+    """
+    collected = ProductRecordBuilder()
+    parsed_pages = iter_parsed_pages(
+        pages_to_scrape, wait_seconds, concurrency, rate_limit,
+        parser_backend, parse_workers, parse_chunksize, base_url, checkpoint, adaptive_concurrency
+    )
+    for _, items in parsed_pages:
+        collected.extend(items)
 
-    return pd.DataFrame(collected) if collected else pd.DataFrame()
\ No newline at end of file
+    return collected.to_frame()
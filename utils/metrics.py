@@ -0,0 +1,267 @@
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import numpy as np
+
+# Batas bucket histogram latensi per halaman (detik)
+PAGE_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Nama metrik -> (tipe Prometheus, deskripsi)
+METRIC_HELP = {
+    'etl_stage_seconds_total': ('counter', 'Waktu yang dihabiskan di setiap tahap, tanpa waktu tahap di hulunya'),
+    'etl_pages_fetched_total': ('counter', 'Halaman yang diambil per status (ok atau failed)'),
+    'etl_bytes_downloaded_total': ('counter', 'Byte body respons yang diunduh dari jaringan'),
+    'etl_page_fetch_seconds': ('histogram', 'Latensi pengambilan satu halaman termasuk retry'),
+    'etl_parse_failures_total': ('counter', 'Halaman berisi HTML yang tidak menghasilkan produk'),
+    'etl_rows_extracted_total': ('counter', 'Baris produk mentah hasil parsing'),
+    'etl_rows_dropped_total': ('counter', 'Baris yang dibuang per tahap dan aturan'),
+    'etl_sink_rows_written_total': ('counter', 'Baris yang ditulis per sink'),
+    'etl_sink_bytes_written_total': ('counter', 'Byte yang ditulis per sink'),
+    'etl_sink_seconds_total': ('counter', 'Durasi sink yang dijalankan lewat run_sinks'),
+}
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(label_key: tuple, extra: tuple = ()) -> str:
+    pairs = label_key + extra
+    if not pairs:
+        return ''
+    escaped = (
+        (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        position = bisect_left(self.buckets, value)
+        if position < len(self.counts):
+            self.counts[position] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield _format_value(bound), total
+
+class PipelineMetrics:
+    """Registri metrik pipeline ETL (thread-safe) dengan log JSON dan ekspor textfile Prometheus.
+
+    Counter dan histogram diberi label, mis. inc('etl_rows_dropped_total', 3, stage='validate',
+    rule='unknown_size'). Setiap peristiwa penting juga bisa ditulis sebagai satu baris JSON
+    ke log_path (atau stderr jika log_path None dan log_to_stderr True).
+
+    Waktu tahap dicatat sebagai self time: stage() dan timed_batches() membentuk tumpukan
+    per thread, sehingga waktu tahap hulu yang berjalan di dalam tahap hilir (mis. transform
+    yang menarik batch dari extract pada mode --stream) tidak dihitung dua kali.
+    """
+
+    enabled = True
+
+    def __init__(self, log_path: str = None, log_to_stderr: bool = False):
+        """Inisialisasi registri.
+
+        Args:
+            log_path (str): File log JSON Lines; None berarti tanpa file
+            log_to_stderr (bool): Tulis log JSON ke stderr jika log_path None
+        """
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._timers = threading.local()
+        self._log_file = None
+        if log_path:
+            directory = os.path.dirname(log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._log_file = open(log_path, 'a', encoding='utf-8')
+        elif log_to_stderr:
+            self._log_file = sys.stderr
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Tambahkan value ke counter name dengan label yang diberikan."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets=PAGE_LATENCY_BUCKETS, **labels):
+        """Catat satu nilai ke histogram name."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def log(self, event: str, **fields):
+        """Tulis satu peristiwa sebagai baris JSON dengan waktu UTC."""
+        if self._log_file is None:
+            return
+        record = {'time': datetime.now(timezone.utc).isoformat(), 'event': event, **fields}
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock:
+            self._log_file.write(line + '\n')
+            self._log_file.flush()
+
+    def _stack(self) -> list:
+        stack = getattr(self._timers, 'stack', None)
+        if stack is None:
+            stack = self._timers.stack = []
+        return stack
+
+    def _enter_stage(self):
+        frame = [0.0]  # waktu yang dihabiskan tahap lain di dalam frame ini
+        self._stack().append(frame)
+        return frame, time.perf_counter()
+
+    def _exit_stage(self, stage: str, frame: list, started_at: float) -> float:
+        elapsed = time.perf_counter() - started_at
+        stack = self._stack()
+        stack.pop()
+        if stack:
+            stack[-1][0] += elapsed
+        self.inc('etl_stage_seconds_total', elapsed - frame[0], stage=stage)
+        return elapsed
+
+    @contextmanager
+    def stage(self, stage: str, **fields):
+        """Ukur satu blok sebagai tahap stage dan tulis peristiwa stage_finished ke log."""
+        frame, started_at = self._enter_stage()
+        try:
+            yield
+        finally:
+            elapsed = self._exit_stage(stage, frame, started_at)
+            self.log('stage_finished', stage=stage, seconds=round(elapsed, 6), **fields)
+
+    def timed_batches(self, stage: str, batches):
+        """Bungkus generator batch sehingga waktu menghasilkan setiap batch dihitung untuk stage."""
+        iterator = iter(batches)
+        finished = object()
+        while True:
+            frame, started_at = self._enter_stage()
+            try:
+                batch = next(iterator, finished)
+            finally:
+                self._exit_stage(stage, frame, started_at)
+            if batch is finished:
+                return
+            yield batch
+
+    def snapshot(self) -> dict:
+        """Salinan nilai counter dan ringkasan histogram, dikelompokkan per nama metrik."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (histogram.sum, histogram.count) for key, histogram in self._histograms.items()}
+        snapshot = {}
+        for (name, label_key), value in sorted(counters.items()):
+            snapshot.setdefault(name, []).append({'labels': dict(label_key), 'value': value})
+        for (name, label_key), (total, count) in sorted(histograms.items()):
+            snapshot.setdefault(name, []).append({'labels': dict(label_key), 'sum': total, 'count': count})
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Render semua metrik dalam format teks eksposisi Prometheus."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, list(histogram.cumulative()), histogram.sum, histogram.count)
+                for key, histogram in self._histograms.items()
+            )
+        lines = []
+        described = set()
+
+        def describe(name, default_type):
+            if name not in described:
+                metric_type, help_text = METRIC_HELP.get(name, (default_type, name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                described.add(name)
+
+        for (name, label_key), value in counters:
+            describe(name, 'counter')
+            lines.append(f"{name}{_format_labels(label_key)} {_format_value(value)}")
+        for (name, label_key), buckets, total, count in histograms:
+            describe(name, 'histogram')
+            for bound, cumulative in buckets:
+                lines.append(f"{name}_bucket{_format_labels(label_key, (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(label_key, (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(label_key)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(label_key)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Tulis textfile Prometheus secara atomik agar node exporter tidak membaca file setengah jadi."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as output:
+            output.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def close(self):
+        """Tutup file log JSON."""
+        if self._log_file is not None and self._log_file is not sys.stderr:
+            self._log_file.close()
+        self._log_file = None
+
+class _DisabledMetrics(PipelineMetrics):
+    """Registri yang mengabaikan semua catatan, dipakai saat metrik tidak dipasang."""
+
+    enabled = False
+
+    def inc(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, buckets=PAGE_LATENCY_BUCKETS, **labels):
+        pass
+
+    def log(self, event, **fields):
+        pass
+
+    def timed_batches(self, stage, batches):
+        return iter(batches)
+
+_disabled_metrics = _DisabledMetrics()
+_metrics = None
+
+def configure_metrics(metrics):
+    """Pasang PipelineMetrics yang dipakai extract, transform, dan load (atau None untuk mematikan)."""
+    global _metrics
+    _metrics = metrics
+
+def get_metrics() -> PipelineMetrics:
+    """Registri metrik yang sedang terpasang; jika tidak ada, registri yang mengabaikan semua catatan."""
+    return _metrics if _metrics is not None else _disabled_metrics
+
+def record_dropped_rows(metrics: PipelineMetrics, reasons, stage: str):
+    """Tambahkan jumlah baris yang dibuang per kode alasan dari array string alasan gabungan."""
+    if not metrics.enabled:
+        return
+    counts = {}
+    for combined, count in zip(*np.unique(np.asarray(reasons, dtype=str), return_counts=True)):
+        for code in str(combined).split(','):
+            if code:
+                counts[code] = counts.get(code, 0) + int(count)
+    for code, count in counts.items():
+        metrics.inc('etl_rows_dropped_total', count, stage=stage, rule=code)
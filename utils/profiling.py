@@ -0,0 +1,144 @@
+import cProfile
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+DEFAULT_TOP_ALLOCATIONS = 25
+# Frame milik tracemalloc dan mesin import tidak relevan untuk mencari hot spot pipeline
+IGNORED_ALLOCATION_FILES = ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", tracemalloc.__file__)
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class FrameSampler:
+    """Profiler sampling: ambil stack semua thread setiap interval detik di thread latar belakang.
+
+    Berbeda dengan cProfile yang hanya melihat thread pemanggil, sampler ini juga
+    melihat thread worker fetch (asyncio.to_thread), dengan overhead yang tetap
+    kecil. Hasilnya dalam format collapsed stack ("akar;...;daun jumlah") yang
+    bisa langsung dibaca flamegraph.pl atau speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """Inisialisasi sampler.
+
+        Args:
+            interval (float): Jarak antar sampel dalam detik
+        """
+        self.interval = interval
+        self.samples = 0
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="frame-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def write_collapsed(self, path: str):
+        """Tulis stack yang terkumpul, yang paling sering lebih dulu."""
+        with open(path, 'w', encoding='utf-8') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f"{stack} {count}\n")
+
+class StageProfiler:
+    """Profil CPU (cProfile) dan memori (tracemalloc) per tahap pipeline.
+
+    Setiap tahap menghasilkan file di output_dir:
+    - <tahap>.pstats: statistik cProfile, dibaca dengan pstats atau snakeviz
+    - <tahap>_allocations.txt: puncak memori dan top-N baris kode pengalokasi memori
+    - <tahap>_samples.txt: collapsed stack dari FrameSampler, hanya untuk sample_stages
+
+    Tahap yang dimasuki berkali-kali diakumulasi: panggilan cProfile dijumlahkan
+    dan puncak memori adalah yang tertinggi dari semua kali masuk, sedangkan
+    daftar alokasi diambil di akhir kali masuk terakhir. cProfile hanya mengukur
+    thread pemanggil; pakai sampling untuk melihat pekerjaan di thread worker.
+    """
+
+    def __init__(self, output_dir: str = 'profiles', top_n: int = DEFAULT_TOP_ALLOCATIONS,
+                 sample_interval: float = None, sample_stages=("extract",)):
+        """Inisialisasi profiler.
+
+        Args:
+            output_dir (str): Direktori hasil profil
+            top_n (int): Jumlah baris pengalokasi memori teratas yang ditulis
+            sample_interval (float): Jika diisi, tahap di sample_stages juga di-sampling dengan interval ini
+            sample_stages (tuple): Tahap yang di-sampling, bawaan hanya loop fetch (extract)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.sample_stages = tuple(sample_stages)
+        self._profiles = {}
+        self._samplers = {}
+        self._peaks = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, name)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profil satu blok sebagai tahap name lalu tulis hasilnya."""
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        sampler = None
+        if self.sample_interval and name in self.sample_stages:
+            sampler = self._samplers.setdefault(name, FrameSampler(self.sample_interval))
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        if sampler is not None:
+            sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            if sampler is not None:
+                sampler.stop()
+            _, peak = tracemalloc.get_traced_memory()
+            peak = self._peaks[name] = max(peak, self._peaks.get(name, 0))
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._write(name, profile, snapshot, peak, sampler)
+
+    def _write(self, name, profile, snapshot, peak, sampler):
+        profile.dump_stats(self._path(f"{name}.pstats"))
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, filename) for filename in IGNORED_ALLOCATION_FILES
+        ])
+        top_lines = snapshot.statistics('lineno')[:self.top_n]
+        with open(self._path(f"{name}_allocations.txt"), 'w', encoding='utf-8') as output:
+            output.write(f"Puncak memori tahap {name}: {peak / 2**20:.1f} MB\n")
+            output.write(f"Top {len(top_lines)} alokasi yang masih hidup di akhir tahap:\n")
+            for statistic in top_lines:
+                output.write(f"{statistic}\n")
+        if sampler is not None:
+            sampler.write_collapsed(self._path(f"{name}_samples.txt"))
+        print(f"[Profil] {name}: puncak memori {peak / 2**20:.1f} MB, hasil di {self._path(name)}.*")
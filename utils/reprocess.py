@@ -0,0 +1,182 @@
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+from utils.extract import ProductRecordBuilder
+from utils.transform import clean_and_transform
+
+# Batas memori bawaan untuk seluruh chunk yang sedang diproses sekaligus
+DEFAULT_MEMORY_BUDGET_MB = 512
+# Perkiraan kelipatan memori satu chunk selama dibersihkan (mentah, hasil, salinan pickle worker)
+TRANSFORM_MEMORY_FACTOR = 4
+# Jumlah baris yang dibaca untuk memperkirakan ukuran satu baris
+SAMPLE_ROWS = 1000
+MIN_CHUNK_ROWS = 1000
+
+RAW_STRING_COLUMNS = ('Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender')
+
+def _is_jsonl(path: str) -> bool:
+    return path.endswith(('.jsonl', '.jsonl.gz'))
+
+def _open_text(path: str, mode: str = 'r', compressed: bool = None):
+    if compressed is None:
+        compressed = path.endswith('.gz')
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+def _read_csv_chunks(path: str, chunk_rows: int):
+    # Kolom mentah dibaca sebagai string agar aturan .str di clean_and_transform berlaku
+    dtypes = {column: object for column in RAW_STRING_COLUMNS}
+    yield from pd.read_csv(path, chunksize=chunk_rows, dtype=dtypes)
+
+def _read_jsonl_chunks(path: str, chunk_rows: int):
+    """Baca file JSON Lines berisi satu produk per baris atau jurnal CheckpointJournal."""
+    pending = ProductRecordBuilder()
+    with _open_text(path) as source:
+        for line in source:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('type') == 'run':
+                continue
+            for item in entry['items'] if entry.get('type') == 'page' else [entry]:
+                pending.append(item)
+                if len(pending) >= chunk_rows:
+                    yield pending.to_frame()
+    if len(pending):
+        yield pending.to_frame()
+
+def iter_raw_chunks(path: str, chunk_rows: int):
+    """Baca file data mentah per chunk tanpa memuat seluruh isinya.
+
+    Args:
+        path (str): File CSV (boleh .csv.gz) atau JSON Lines (.jsonl, boleh .gz)
+        chunk_rows (int): Jumlah baris maksimal per chunk
+
+    Yields:
+        pd.DataFrame: Chunk data mentah
+    """
+    reader = _read_jsonl_chunks if _is_jsonl(path) else _read_csv_chunks
+    yield from reader(path, chunk_rows)
+
+def estimate_row_bytes(path: str) -> float:
+    """Perkirakan memori per baris (byte) dari beberapa baris pertama file."""
+    sample = next(iter_raw_chunks(path, SAMPLE_ROWS), None)
+    if sample is None or sample.empty:
+        return 0.0
+    return sample.memory_usage(index=True, deep=True).sum() / len(sample)
+
+def plan_chunk_rows(paths, memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB, workers: int = 1) -> int:
+    """Hitung jumlah baris per chunk agar semua chunk yang diproses bersamaan muat di memory_budget_mb.
+
+    Chunk yang sedang dibaca, yang menunggu, dan yang dibersihkan worker
+    (2 * workers + 1) masing-masing dihitung TRANSFORM_MEMORY_FACTOR kali ukuran mentahnya.
+    """
+    row_bytes = max((estimate_row_bytes(path) for path in paths), default=0.0)
+    if row_bytes == 0:
+        return MIN_CHUNK_ROWS
+    chunks_in_memory = 2 * workers + 1
+    budget_bytes = memory_budget_mb * 1024 * 1024
+    return max(MIN_CHUNK_ROWS, int(budget_bytes / (chunks_in_memory * TRANSFORM_MEMORY_FACTOR * row_bytes)))
+
+def is_cleaned_frame(chunk: pd.DataFrame) -> bool:
+    """Cek apakah chunk sudah berbentuk hasil bersih (Price dan Rating numerik), mis. products.csv."""
+    for column in ('Price', 'Rating'):
+        if column not in chunk.columns:
+            return False
+        values = chunk[column].dropna()
+        if values.empty or pd.to_numeric(values, errors='coerce').isna().any():
+            return False
+    return True
+
+def _clean_chunk(chunk: pd.DataFrame, engine: str):
+    """Worker proses: bersihkan satu chunk, kembalikan (jumlah baris mentah, hasil, sudah bersih).
+
+    Chunk yang sudah bersih diteruskan apa adanya, karena aturan pembersihan
+    akan membuang semua barisnya. Kesalahan pembersihan diteruskan ke pemanggil
+    agar output tidak diganti dengan hasil yang tidak lengkap. Hasil memakai
+    compact_dtypes: chunk yang menunggu giliran ditulis (dan dikirim balik dari
+    proses worker) lebih kecil, sedangkan isi CSV-nya tetap sama.
+    """
+    if is_cleaned_frame(chunk):
+        return len(chunk), chunk, True
+    return len(chunk), clean_and_transform(chunk, compact_dtypes=True, engine=engine, raise_errors=True), False
+
+def _clean_in_pool(chunks, workers: int, engine: str):
+    """Bersihkan chunk di ProcessPoolExecutor dan hasilkan hasilnya sesuai urutan input."""
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_clean_chunk, chunk, engine))
+            while pending and (pending[0].done() or len(pending) >= max_pending):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def reprocess_files(input_paths, output_path: str, memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+                    workers: int = None, chunk_rows: int = None, engine: str = "pandas") -> dict:
+    """Bersihkan ulang file data mentah historis per chunk dan tulis hasilnya secara bertahap.
+
+    File input dibaca berurutan per chunk, setiap chunk dibersihkan dengan aturan
+    clean_and_transform di pool worker, lalu hasilnya langsung ditulis ke output
+    sesuai urutan input. Output ditulis ke file sementara dan baru menggantikan
+    output_path setelah semua chunk berhasil dibersihkan. Chunk yang sudah
+    bersih (Price dan Rating numerik, seperti products.csv) diteruskan apa adanya.
+
+    Args:
+        input_paths (list): File CSV atau JSON Lines mentah, lihat iter_raw_chunks
+        output_path (str): File CSV hasil; akhiran .gz berarti dikompresi gzip
+        memory_budget_mb (float): Batas memori untuk chunk yang diproses bersamaan
+        workers (int): Jumlah proses pembersih, None berarti jumlah CPU; 1 berarti tanpa pool
+        chunk_rows (int): Jumlah baris per chunk; None berarti dihitung dari memory_budget_mb
+        engine (str): Engine transformasi, lihat clean_and_transform
+
+    Returns:
+        dict: Ringkasan berisi jumlah file, chunk, chunk yang sudah bersih, baris mentah, dan baris yang ditulis
+
+    Raises:
+        ValueError: Jika ada baris yang dibaca tetapi tidak satu pun lolos pembersihan;
+                    output_path yang lama tidak ditimpa
+    """
+    input_paths = list(input_paths)
+    workers = workers or os.cpu_count() or 1
+    chunk_rows = chunk_rows or plan_chunk_rows(input_paths, memory_budget_mb, workers)
+    print(f"[Reprocess] {len(input_paths)} file, {chunk_rows} baris per chunk, {workers} worker")
+
+    chunks = (chunk for path in input_paths for chunk in iter_raw_chunks(path, chunk_rows))
+    if workers > 1:
+        results = _clean_in_pool(chunks, workers, engine)
+    else:
+        results = (_clean_chunk(chunk, engine) for chunk in chunks)
+
+    summary = {'files': len(input_paths), 'chunks': 0, 'chunks_passed_through': 0, 'rows_read': 0, 'rows_written': 0}
+    temp_path = f"{output_path}.tmp"
+    try:
+        with _open_text(temp_path, 'w', compressed=output_path.endswith('.gz')) as output_file:
+            for rows_read, cleaned, passed_through in results:
+                summary['chunks'] += 1
+                summary['chunks_passed_through'] += passed_through
+                summary['rows_read'] += rows_read
+                if cleaned.empty:
+                    continue
+                cleaned.to_csv(output_file, header=summary['rows_written'] == 0, index=False)
+                summary['rows_written'] += len(cleaned)
+        if summary['rows_read'] and not summary['rows_written']:
+            raise ValueError(
+                f"Tidak satu pun dari {summary['rows_read']} baris lolos pembersihan; {output_path} tidak ditimpa"
+            )
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    if summary['chunks_passed_through']:
+        print(f"[Reprocess] {summary['chunks_passed_through']} chunk sudah bersih dan diteruskan apa adanya")
+    print(f"[Reprocess] {summary['rows_written']} dari {summary['rows_read']} baris ditulis ke {output_path}")
+    return summary
@@ -0,0 +1,246 @@
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Request ditolak karena circuit breaker sedang terbuka."""
+
+class FetchMetrics:
+    """Penghitung hasil setiap percobaan request (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = {}
+        self.retries = 0
+        self.total_latency = 0.0
+
+    def record(self, outcome: str, latency: float = 0.0):
+        """Catat satu hasil percobaan, mis. 'success', 'http_429', 'timeout'."""
+        with self._lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            self.total_latency += latency
+
+    def record_retry(self):
+        """Catat satu percobaan ulang."""
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> dict:
+        """Salinan metrik saat ini."""
+        with self._lock:
+            attempts = sum(self.outcomes.values())
+            return {
+                "attempts": attempts,
+                "retries": self.retries,
+                "outcomes": dict(self.outcomes),
+                "avg_latency": self.total_latency / attempts if attempts else 0.0,
+            }
+
+    def report(self):
+        """Cetak ringkasan hasil percobaan request."""
+        snapshot = self.snapshot()
+        outcomes = ", ".join(f"{name}: {count}" for name, count in sorted(snapshot["outcomes"].items()))
+        print(
+            f"[Fetch] percobaan: {snapshot['attempts']}, diulang: {snapshot['retries']}, "
+            f"rata-rata latensi: {snapshot['avg_latency']:.3f}s ({outcomes})"
+        )
+
+class CircuitBreaker:
+    """Circuit breaker sederhana: terbuka setelah sejumlah kegagalan beruntun.
+
+    Setelah reset_timeout lewat, satu request percobaan (half-open) diizinkan;
+    jika berhasil circuit kembali tertutup, jika gagal circuit terbuka lagi.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Cek apakah request boleh dikirim sekarang."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                return True
+            return self.state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = "closed"
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half-open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+class RetryPolicy:
+    """Kebijakan retry untuk error sementara, 429, dan 5xx.
+
+    Jeda memakai exponential backoff dengan full jitter dan tidak pernah lebih
+    pendek dari header Retry-After yang dikirim server.
+
+    Args:
+        max_attempts (int): Jumlah percobaan maksimum per URL, termasuk percobaan pertama
+        backoff_base (float): Jeda dasar (detik) untuk percobaan ulang pertama
+        backoff_max (float): Batas atas jeda
+        retry_statuses (tuple): Status HTTP yang dianggap sementara
+        circuit_breaker (CircuitBreaker): Breaker bersama, None untuk mematikan
+        metrics (FetchMetrics): Penampung metrik hasil percobaan
+    """
+
+    def __init__(self, max_attempts: int = 4, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_statuses=RETRYABLE_STATUSES, circuit_breaker: CircuitBreaker = None,
+                 metrics: FetchMetrics = None):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = tuple(retry_statuses)
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics or FetchMetrics()
+
+    def before_attempt(self):
+        """Tolak request jika circuit breaker terbuka."""
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            self.metrics.record("circuit_open")
+            raise CircuitOpenError("Circuit breaker terbuka, request dilewati")
+
+    def classify_response(self, response) -> str:
+        """Nama hasil percobaan untuk respons HTTP."""
+        if response.status_code == 429:
+            return "http_429"
+        if response.status_code >= 500:
+            return "http_5xx"
+        if response.status_code >= 400:
+            return "http_4xx"
+        return "success"
+
+    @staticmethod
+    def classify_error(error: Exception) -> str:
+        """Nama hasil percobaan untuk exception jaringan."""
+        if isinstance(error, requests.exceptions.Timeout):
+            return "timeout"
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return "connection_error"
+        return "request_error"
+
+    def is_retryable(self, outcome: str, status_code: int = None) -> bool:
+        """Cek apakah hasil percobaan layak diulang."""
+        if outcome in ("timeout", "connection_error"):
+            return True
+        return status_code in self.retry_statuses
+
+    def record(self, outcome: str, latency: float):
+        """Catat hasil percobaan ke metrik dan circuit breaker.
+
+        Respons 4xx dihitung sukses bagi breaker: server menjawab dengan sehat,
+        hanya halamannya yang tidak ada (mis. 404 saat mencari jumlah halaman).
+        """
+        self.metrics.record(outcome, latency)
+        if self.circuit_breaker is None:
+            return
+        if outcome in ("success", "http_4xx"):
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+
+    def compute_delay(self, attempt: int, retry_after: str = None) -> float:
+        """Hitung jeda sebelum percobaan ke-(attempt + 1).
+
+        Args:
+            attempt (int): Nomor percobaan yang baru saja gagal, mulai dari 1
+            retry_after (str): Nilai header Retry-After (detik atau tanggal HTTP)
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        return max(delay, parse_retry_after(retry_after))
+
+def parse_retry_after(value) -> float:
+    """Ubah header Retry-After menjadi jumlah detik, 0 jika tidak ada atau tidak valid."""
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class AdaptiveConcurrencyLimiter:
+    """Pembatas konkurensi AIMD untuk mode asyncio.
+
+    Batas naik satu setiap kali `limit` request berturut-turut sehat (latensi di
+    bawah target), dan dipotong setengah saat request gagal atau melambat.
+
+    Args:
+        initial (int): Batas awal
+        min_limit (int): Batas terendah
+        max_limit (int): Batas tertinggi
+        latency_target (float): Latensi (detik) yang masih dianggap sehat
+        decrease_factor (float): Faktor pengali saat terjadi tekanan
+    """
+
+    def __init__(self, initial: int = 2, min_limit: int = 1, max_limit: int = 20,
+                 latency_target: float = 2.0, decrease_factor: float = 0.5):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(self.max_limit, max(self.min_limit, initial))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.history = [self.limit]
+        self._healthy_streak = 0
+        self._condition = None
+
+    def _get_condition(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @asynccontextmanager
+    async def slot(self):
+        """Tunggu sampai jumlah request berjalan di bawah batas saat ini."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    def record(self, latency: float, success: bool):
+        """Sesuaikan batas berdasarkan hasil satu request."""
+        if success and latency <= self.latency_target:
+            self._healthy_streak += 1
+            if self._healthy_streak >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self._healthy_streak = 0
+                self.history.append(self.limit)
+            return
+        self._healthy_streak = 0
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit != self.limit:
+            self.limit = new_limit
+            self.history.append(self.limit)
@@ -0,0 +1,122 @@
+import json
+import os
+import sqlite3
+import pandas as pd
+
+DEFAULT_KEY_COLUMNS = ("Title", "Size", "Gender")
+
+def hash_columns(dataframe: pd.DataFrame, columns) -> pd.Series:
+    """Hitung hash 64-bit per baris secara vektor dari kolom yang dipilih."""
+    hashed = pd.util.hash_pandas_object(dataframe[list(columns)], index=False)
+    return hashed.astype('int64')
+
+class ProductStateStore:
+    """Penyimpanan state lokal (SQLite) berisi fingerprint konten setiap produk.
+
+    Setiap produk diidentifikasi oleh hash kolom kunci, dan isinya oleh hash
+    semua kolom selain Timestamp. Dengan membandingkan snapshot baru terhadap
+    state, hanya produk baru, berubah, atau hilang yang perlu dimuat.
+    """
+
+    def __init__(self, path: str = '.state/products.sqlite', key_columns=DEFAULT_KEY_COLUMNS):
+        """Inisialisasi state store.
+
+        Args:
+            path (str): Lokasi file database state
+            key_columns (tuple): Kolom yang mengidentifikasi satu produk
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.key_columns = tuple(key_columns)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS product_state ("
+            " key_hash INTEGER PRIMARY KEY, content_hash INTEGER NOT NULL, key_values TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _fingerprint(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        content_columns = [column for column in dataframe.columns if column != 'Timestamp']
+        fingerprints = pd.DataFrame({
+            'key_hash': hash_columns(dataframe, self.key_columns),
+            'content_hash': hash_columns(dataframe, content_columns),
+        }, index=dataframe.index)
+        # Jika satu kunci muncul lebih dari sekali, baris terakhir yang menjadi acuan
+        return fingerprints[~fingerprints['key_hash'].duplicated(keep='last')]
+
+    def _load_state(self) -> pd.DataFrame:
+        return pd.read_sql_query(
+            "SELECT key_hash, content_hash, key_values FROM product_state", self._conn
+        )
+
+    def compute_delta(self, dataframe: pd.DataFrame) -> dict:
+        """Bandingkan snapshot baru dengan state tersimpan.
+
+        Args:
+            dataframe (pd.DataFrame): Data produk yang sudah dibersihkan
+
+        Returns:
+            dict: 'new' dan 'changed' berisi baris dari dataframe, 'removed' berisi
+                  kolom kunci produk yang tidak lagi muncul, 'unchanged' berisi jumlah
+                  produk yang tidak berubah
+        """
+        current = self._fingerprint(dataframe)
+        stored = self._load_state()
+
+        is_new = ~current['key_hash'].isin(stored['key_hash'])
+        same_content = pd.MultiIndex.from_frame(current[['key_hash', 'content_hash']]).isin(
+            pd.MultiIndex.from_frame(stored[['key_hash', 'content_hash']])
+        )
+        is_changed = ~is_new & ~same_content
+        removed_state = stored[~stored['key_hash'].isin(current['key_hash'])]
+        removed = pd.DataFrame(
+            [json.loads(values) for values in removed_state['key_values']],
+            columns=list(self.key_columns),
+        )
+
+        return {
+            'new': dataframe.loc[current.index[is_new.to_numpy()]],
+            'changed': dataframe.loc[current.index[is_changed.to_numpy()]],
+            'removed': removed,
+            'unchanged': int((~is_new & ~is_changed).sum()),
+        }
+
+    def commit(self, dataframe: pd.DataFrame):
+        """Simpan snapshot sebagai state terbaru; panggil setelah delta berhasil dimuat."""
+        current = self._fingerprint(dataframe)
+        key_values = dataframe.loc[current.index, list(self.key_columns)].astype(object)
+        rows = zip(
+            current['key_hash'].tolist(),
+            current['content_hash'].tolist(),
+            (json.dumps(values, default=str) for values in key_values.values.tolist()),
+        )
+        with self._conn:
+            self._conn.execute("DELETE FROM product_state")
+            self._conn.executemany(
+                "INSERT INTO product_state (key_hash, content_hash, key_values) VALUES (?, ?, ?)", rows
+            )
+
+    def close(self):
+        """Tutup koneksi database state."""
+        self._conn.close()
+
+def build_delta_frame(delta: dict) -> pd.DataFrame:
+    """Gabungkan hasil compute_delta menjadi satu DataFrame dengan kolom ChangeType."""
+    frames = [
+        delta['new'].assign(ChangeType='new'),
+        delta['changed'].assign(ChangeType='changed'),
+        delta['removed'].assign(ChangeType='removed'),
+    ]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+def report_delta(delta: dict):
+    """Cetak jumlah produk baru, berubah, hilang, dan tetap."""
+    print(
+        f"[Incremental] baru: {len(delta['new'])}, berubah: {len(delta['changed'])}, "
+        f"dihapus: {len(delta['removed'])}, tetap: {delta['unchanged']}"
+    )
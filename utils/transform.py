@@ -1,61 +1,291 @@
+import os
+import re
+import numpy as np
 import pandas as pd
 
-def clean_and_transform(dataframe: pd.DataFrame) -> pd.DataFrame:
+from utils.metrics import get_metrics, record_dropped_rows
+from utils.validate import combine_reason_codes
+
+try:
+    import polars as pl
+    import pyarrow  # noqa: F401  pl.from_pandas butuh pyarrow untuk kolom string
+except ImportError:
+    pl = None
+
+USD_TO_IDR = 16000
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+TIMESTAMP_BLOCK_SIZE = 65536
+
+# Engine transformasi: pandas adalah implementasi acuan, polars alternatif multithread
+TRANSFORM_ENGINES = ("pandas", "polars")
+# Di bawah jumlah baris ini biaya konversi ke polars lebih besar dari manfaatnya
+POLARS_MIN_ROWS = 200_000
+
+# Pola regex dikompilasi sekali untuk semua pemanggilan
+RATING_PATTERN = re.compile(r'⭐\s*(\d+(?:\.\d+)?)')
+PRICE_NOISE_PATTERN = re.compile(r'[$,]')
+COLORS_PATTERN = re.compile(r'(\d+)')
+
+def parse_unique_values(values: pd.Series, parse) -> pd.Series:
+    """Terapkan fungsi parsing string hanya pada nilai unik, lalu sebarkan hasilnya.
+
+    Kolom hasil scraping seperti Rating, Price, dan Colors hanya punya sedikit
+    nilai berbeda, sehingga regex cukup dijalankan sekali per nilai unik.
+
+    Args:
+        values (pd.Series): Kolom string mentah
+        parse (callable): Fungsi vektor yang mengubah Series string menjadi Series float
+
+    Returns:
+        pd.Series: Hasil parsing float dengan index yang sama seperti values
+    """
+    codes, uniques = pd.factorize(values)
+    parsed_uniques = parse(pd.Series(uniques, dtype=object)).to_numpy(dtype=float)
+    parsed = np.append(parsed_uniques, np.nan)[codes]  # kode -1 (NaN) menunjuk ke NaN terakhir
+    return pd.Series(parsed, index=values.index, name=values.name)
+
+def format_timestamps(values: pd.Series) -> pd.Series:
+    """Format kolom Timestamp ke ISO 8601 ('%Y-%m-%dT%H:%M:%S.%f') secara vektor.
+
+    Nilai yang tidak bisa dikonversi menjadi NaN, sama seperti dt.strftime.
+    """
+    timestamps = pd.to_datetime(values, errors='coerce')
+    if getattr(timestamps.dt, 'tz', None) is not None:
+        return timestamps.dt.strftime(TIMESTAMP_FORMAT)
+
+    # np.datetime_as_string dengan unit mikrodetik menghasilkan format yang sama
+    # dengan strftime tanpa membuat objek datetime per baris. Diproses per blok
+    # agar array string sementara tidak sebesar seluruh kolom.
+    raw_values = timestamps.to_numpy()
+    formatted = np.empty(len(raw_values), dtype=object)
+    for start in range(0, len(raw_values), TIMESTAMP_BLOCK_SIZE):
+        block = slice(start, start + TIMESTAMP_BLOCK_SIZE)
+        formatted[block] = np.datetime_as_string(raw_values[block], unit='us')
+    formatted[timestamps.isna().to_numpy()] = np.nan
+    return pd.Series(formatted, index=values.index, name=values.name)
+
+def available_transform_engines():
+    """Daftar engine transformasi yang bisa dipakai di lingkungan ini."""
+    return ["pandas", "polars"] if pl is not None else ["pandas"]
+
+def resolve_transform_engine(engine: str, row_count: int) -> str:
+    """Tentukan engine transformasi untuk satu run.
+
+    Args:
+        engine (str): "pandas", "polars", atau "auto"
+        row_count (int): Jumlah baris yang akan diproses
+
+    Returns:
+        str: Engine yang dipakai. Pada "auto", polars dipilih hanya jika terpasang,
+             data cukup besar (POLARS_MIN_ROWS), dan tersedia lebih dari satu CPU.
+    """
+    if engine == "auto":
+        if pl is not None and row_count >= POLARS_MIN_ROWS and (os.cpu_count() or 1) > 1:
+            return "polars"
+        return "pandas"
+    if engine not in TRANSFORM_ENGINES:
+        raise ValueError(f"Engine transformasi tidak dikenal: {engine}. Pilihan: auto, {', '.join(TRANSFORM_ENGINES)}")
+    if engine not in available_transform_engines():
+        raise ImportError(f"Engine transformasi '{engine}' membutuhkan pustaka yang belum terpasang.")
+    return engine
+
+def _parse_with_pandas(dataframe: pd.DataFrame):
+    """Parsing kolom Rating, Price, Colors, dan Timestamp dengan pandas (implementasi acuan).
+
+    Returns:
+        tuple: (mask baris yang dipertahankan, dict kolom hasil untuk baris tersebut)
+    """
+    # Ekstrak nilai rating sebagai float dari string seperti '⭐ 4.5'
+    rating = parse_unique_values(
+        dataframe['Rating'],
+        lambda values: pd.to_numeric(values.str.extract(RATING_PATTERN, expand=False), errors='coerce'),
+    )
+
+    # Hapus simbol '$' dan koma dalam satu lintasan, konversi ke float, lalu ke IDR
+    price = parse_unique_values(
+        dataframe['Price'],
+        lambda values: pd.to_numeric(values.str.replace(PRICE_NOISE_PATTERN, '', regex=True), errors='coerce'),
+    ) * USD_TO_IDR
+
+    # Satu mask untuk semua aturan pembuangan baris
+    keep = ((dataframe['Rating'] != 'Rating Tidak Valid') & rating.notna() & price.notna()).to_numpy()
+
+    colors = parse_unique_values(
+        dataframe['Colors'][keep],
+        lambda values: pd.to_numeric(values.str.extract(COLORS_PATTERN, expand=False), errors='coerce'),
+    )
+    return keep, {
+        'Price': price[keep].to_numpy(),
+        'Rating': rating[keep].to_numpy(),
+        'Colors': colors.to_numpy(),
+        'Timestamp': format_timestamps(dataframe['Timestamp'][keep]).to_numpy(),
+    }
+
+def _parse_with_polars(dataframe: pd.DataFrame):
+    """Parsing kolom yang sama seperti _parse_with_pandas dengan ekspresi polars (multithread).
+
+    Timestamp dikonversi dengan pd.to_datetime lebih dulu agar aturan coerce-nya
+    sama persis; Timestamp ber-timezone diformat dengan format_timestamps.
+    """
+    timestamps = pd.to_datetime(dataframe['Timestamp'], errors='coerce')
+    tz_aware = getattr(timestamps.dt, 'tz', None) is not None
+    try:
+        source = pl.from_pandas(pd.DataFrame({
+            'Rating': dataframe['Rating'],
+            'Price': dataframe['Price'],
+            'Colors': dataframe['Colors'],
+            'Timestamp': timestamps,
+        }, copy=False))
+    except (TypeError, ValueError) as err:
+        # Kolom campuran (mis. string dan angka) tidak bisa menjadi kolom string polars
+        print(f"[Transformasi] Data tidak bisa diproses dengan polars ({err}), memakai pandas.")
+        return _parse_with_pandas(dataframe)
+
+    # strip_chars dan fill_nan menyamakan aturan konversi dengan pd.to_numeric
+    rating = (
+        pl.col('Rating').str.extract(RATING_PATTERN.pattern, 1)
+        .str.strip_chars().cast(pl.Float64, strict=False).fill_nan(None)
+    )
+    price = (
+        pl.col('Price').str.replace_all(PRICE_NOISE_PATTERN.pattern, '')
+        .str.strip_chars().cast(pl.Float64, strict=False).fill_nan(None) * USD_TO_IDR
+    )
+    keep = (pl.col('Rating') != 'Rating Tidak Valid').fill_null(True) & rating.is_not_null() & price.is_not_null()
+    parsed = source.lazy().select(
+        keep.alias('keep'),
+        price.alias('Price'),
+        rating.alias('Rating'),
+        pl.col('Colors').str.extract(COLORS_PATTERN.pattern, 1).cast(pl.Int64, strict=False).alias('Colors'),
+        pl.col('Timestamp') if tz_aware else pl.col('Timestamp').dt.strftime('%Y-%m-%dT%H:%M:%S.%6f'),
+    ).collect()
+
+    keep_mask = parsed['keep'].to_numpy()
+    kept = parsed.filter(pl.col('keep'))
+    if tz_aware:
+        formatted = format_timestamps(timestamps[keep_mask]).to_numpy()
+    else:
+        formatted = kept['Timestamp'].to_numpy()
+        formatted[kept['Timestamp'].is_null().to_numpy()] = np.nan
+    return keep_mask, {
+        'Price': kept['Price'].to_numpy(),
+        'Rating': kept['Rating'].to_numpy(),
+        'Colors': kept['Colors'].cast(pl.Float64).to_numpy(),
+        'Timestamp': formatted,
+    }
+
+def drop_reasons(dropped: pd.DataFrame) -> np.ndarray:
+    """Kode alasan untuk baris mentah yang dibuang clean_and_transform."""
+    rating = parse_unique_values(
+        dropped['Rating'],
+        lambda values: pd.to_numeric(values.str.extract(RATING_PATTERN, expand=False), errors='coerce'),
+    )
+    price = parse_unique_values(
+        dropped['Price'],
+        lambda values: pd.to_numeric(values.str.replace(PRICE_NOISE_PATTERN, '', regex=True), errors='coerce'),
+    )
+    invalid_text = (dropped['Rating'] == 'Rating Tidak Valid').to_numpy()
+    return combine_reason_codes((
+        ('rating_invalid', invalid_text),
+        ('rating_unparseable', ~invalid_text & rating.isna().to_numpy()),
+        ('price_unparseable', price.isna().to_numpy()),
+    ))
+
+def clean_and_transform(dataframe: pd.DataFrame, compact_dtypes: bool = False,
+                        engine: str = "pandas", quarantine=None, raise_errors: bool = False) -> pd.DataFrame:
     """Membersihkan dan mengubah data produk agar siap untuk proses selanjutnya.
 
+    Semua aturan filter (rating tidak valid, rating atau harga yang tidak bisa
+    dikonversi) digabung menjadi satu mask, lalu hasil dibangun sekali tanpa
+    salinan antara.
+
     Args:
         dataframe (pd.DataFrame): Data mentah hasil scraping.
+        compact_dtypes (bool): Simpan Size dan Gender sebagai category dan Colors
+                               sebagai integer terkecil yang cukup. Nilainya tetap sama.
+        engine (str): "pandas" (acuan), "polars", atau "auto" untuk memilih
+                      berdasarkan ukuran data. Hasil semua engine identik.
+        quarantine (QuarantineSink): Jika diisi, baris yang dibuang beserta kode
+                                     alasannya disimpan ke sink ini; jika terjadi
+                                     kesalahan, seluruh baris dikarantina dengan
+                                     alasan transform_error.
+        raise_errors (bool): Teruskan kesalahan ke pemanggil alih-alih
+                             mengembalikan DataFrame kosong.
 
     Returns:
         pd.DataFrame: Data yang sudah dibersihkan dan diubah tipe datanya,
                       atau DataFrame kosong jika terjadi kesalahan.
     """
+    engine = resolve_transform_engine(engine, len(dataframe))
     try:
         if dataframe.empty:
             print("[Transformasi] DataFrame kosong, tidak ada yang diproses.")
             return pd.DataFrame()
-            
-        # Buat salinan untuk menghindari SettingWithCopyWarning
-        filtered_df = dataframe.copy()
-        
-        # Buang baris dengan rating yang tidak valid
-        filtered_df = filtered_df[filtered_df['Rating'] != 'Rating Tidak Valid']
-
-        # Ekstrak nilai rating sebagai float dari string seperti '⭐ 4.5'
-        filtered_df['Rating'] = filtered_df['Rating'].str.extract(r'⭐\s*(\d+(?:\.\d+)?)')
-        filtered_df['Rating'] = pd.to_numeric(filtered_df['Rating'], errors='coerce')
-        
-        # Tangani nilai NaN setelah konversi
-        filtered_df = filtered_df.dropna(subset=['Rating'])
-
-        # Bersihkan kolom Price, hapus simbol '$' dan koma, konversi ke float, lalu ke IDR
-        filtered_df['Price'] = (
-            filtered_df['Price']
-            .str.replace('$', '', regex=False)
-            .str.replace(',', '', regex=False)
-        )
-        # Konversi ke float dan kalikan dengan kurs
-        filtered_df['Price'] = pd.to_numeric(filtered_df['Price'], errors='coerce') * 16000
-        filtered_df['Price'] = filtered_df['Price'].round(2)
-        
-        # Tangani nilai NaN setelah konversi harga
-        filtered_df = filtered_df.dropna(subset=['Price'])
 
-        #Mengubah Colors
-        extracted_color_series = filtered_df['Colors'].str.extract(r'(\d+)')[0]
-        numeric_color_series = pd.to_numeric(extracted_color_series, errors='coerce')
-        filled_color_series = numeric_color_series.fillna(1)
-        filtered_df['Colors'] = filled_color_series.astype(int)
+        # Kolom teks harus bertipe string agar aturan parsing .str berlaku
+        for column in ('Rating', 'Price', 'Colors'):
+            values = dataframe[column]
+            if not (pd.api.types.is_string_dtype(values) or pd.api.types.is_object_dtype(values)):
+                raise TypeError(f"Kolom {column} harus bertipe string, bukan {values.dtype}")
+
+        parse_columns = _parse_with_polars if engine == "polars" else _parse_with_pandas
+        keep, parsed = parse_columns(dataframe)
+        index = dataframe.index[keep]
+        metrics = get_metrics()
+        if (quarantine is not None or metrics.enabled) and not keep.all():
+            dropped = dataframe[~keep]
+            reasons = drop_reasons(dropped)
+            if quarantine is not None:
+                quarantine.add(dropped, reasons, stage="transform")
+            record_dropped_rows(metrics, reasons, stage="transform")
 
-        # Pastikan Size dan Gender bertipe string
-        filtered_df['Size'] = filtered_df['Size'].astype(str)
-        filtered_df['Gender'] = filtered_df['Gender'].astype(str)
+        # Colors tanpa angka diisi default 1
+        colors = pd.Series(parsed['Colors'], index=index, dtype=float).fillna(1)
+        colors = pd.to_numeric(colors, downcast='integer') if compact_dtypes else colors.astype(int)
 
-        # Format kolom Timestamp ke ISO 8601, abaikan error konversi
-        filtered_df['Timestamp'] = pd.to_datetime(filtered_df['Timestamp'], errors='coerce').dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        size = dataframe['Size'][keep].astype(str)
+        gender = dataframe['Gender'][keep].astype(str)
+        if compact_dtypes:
+            size = size.astype('category')
+            gender = gender.astype('category')
 
-        return filtered_df
+        transformed_columns = {
+            'Price': pd.Series(parsed['Price'], index=index, dtype=float).round(2),
+            'Rating': pd.Series(parsed['Rating'], index=index, dtype=float),
+            'Colors': colors,
+            'Size': size,
+            'Gender': gender,
+            'Timestamp': pd.Series(parsed['Timestamp'], index=index, dtype=object),
+        }
+        return pd.DataFrame(
+            {
+                column: transformed_columns[column] if column in transformed_columns else dataframe[column][keep]
+                for column in dataframe.columns
+            },
+            index=index,
+            copy=False,
+        )
 
     except Exception as err:
+        if raise_errors:
+            raise
         print(f"[Transformasi Error] Terjadi masalah saat membersihkan data: {err}")
-        return pd.DataFrame()
\ No newline at end of file
+        if quarantine is not None:
+            quarantine.add(dataframe, "transform_error", stage="transform")
+        get_metrics().inc('etl_rows_dropped_total', len(dataframe), stage="transform", rule="transform_error")
+        return pd.DataFrame()
+
+def transform_batches(batches, engine: str = "pandas", quarantine=None):
+    """Bersihkan batch data mentah satu per satu dengan aturan clean_and_transform.
+
+    Args:
+        batches (iterable): Batch pd.DataFrame mentah hasil scraping
+        engine (str): Engine transformasi, lihat clean_and_transform
+        quarantine (QuarantineSink): Sink untuk baris yang dibuang, lihat clean_and_transform
+
+    Yields:
+        pd.DataFrame: Batch yang sudah dibersihkan; batch yang kosong setelah dibersihkan dilewati
+    """
+    for batch in batches:
+        cleaned_batch = clean_and_transform(batch, engine=engine, quarantine=quarantine)
+        if not cleaned_batch.empty:
+            yield cleaned_batch
@@ -0,0 +1,195 @@
+import os
+import numpy as np
+import pandas as pd
+
+from utils.metrics import get_metrics
+
+KNOWN_SIZES = ("XS", "S", "M", "L", "XL", "XXL")
+KNOWN_GENDERS = ("Men", "Women", "Unisex")
+# Rentang harga wajar dalam IDR setelah konversi dari USD
+PRICE_RANGE_IDR = (1.0, 100_000_000.0)
+RATING_RANGE = (0.0, 5.0)
+UNKNOWN_MARKER = "Tidak Diketahui"
+
+def combine_reason_codes(failures) -> np.ndarray:
+    """Gabungkan kode alasan setiap baris menjadi satu string dipisah koma.
+
+    Kombinasi kegagalan per baris dikodekan sebagai pola bit, sehingga string
+    alasan hanya dibuat sekali per kombinasi yang muncul, bukan per baris.
+
+    Args:
+        failures (iterable): Pasangan (kode, mask gagal) dengan panjang mask yang sama
+
+    Returns:
+        np.ndarray: String alasan per baris, kosong jika baris lolos semua aturan
+    """
+    codes, patterns = [], None
+    for bit, (code, failed) in enumerate(failures):
+        codes.append(code)
+        flags = np.asarray(failed, dtype=np.int64) << bit
+        patterns = flags if patterns is None else patterns | flags
+    if patterns is None:
+        return np.empty(0, dtype=object)
+    unique_patterns, inverse = np.unique(patterns, return_inverse=True)
+    labels = np.array([
+        ",".join(code for bit, code in enumerate(codes) if pattern >> bit & 1)
+        for pattern in unique_patterns.tolist()
+    ], dtype=object)
+    return labels[inverse]
+
+def _unique_value_mask(values: pd.Series, check) -> np.ndarray:
+    """Terapkan check hanya pada nilai unik kolom, lalu sebarkan hasilnya ke setiap baris."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    unique_valid = np.fromiter((bool(check(value)) for value in uniques), dtype=bool, count=len(uniques))
+    return np.append(unique_valid, False)[codes]  # kode -1 (NaN) dianggap tidak valid
+
+class ValidationRule:
+    """Satu aturan validasi deklaratif: kode alasan dan fungsi mask baris yang valid."""
+
+    __slots__ = ("code", "columns", "check")
+
+    def __init__(self, code: str, columns, check):
+        """Inisialisasi aturan.
+
+        Args:
+            code (str): Kode alasan yang dicatat untuk baris yang gagal
+            columns (tuple): Kolom yang dibutuhkan; aturan dilewati jika ada yang tidak tersedia
+            check (callable): Fungsi DataFrame -> mask bool (True berarti valid)
+        """
+        self.code = code
+        self.columns = tuple(columns)
+        self.check = check
+
+    @classmethod
+    def in_range(cls, code: str, column: str, low: float, high: float):
+        """Nilai numerik harus berada di [low, high]; NaN dianggap tidak valid."""
+        return cls(code, (column,), lambda frame: frame[column].between(low, high).to_numpy())
+
+    @classmethod
+    def one_of(cls, code: str, column: str, allowed):
+        """Nilai harus salah satu dari allowed."""
+        allowed = tuple(allowed)
+        return cls(code, (column,), lambda frame: frame[column].isin(allowed).to_numpy())
+
+    @classmethod
+    def not_containing(cls, code: str, columns, marker: str = UNKNOWN_MARKER):
+        """Nilai teks pada columns tidak boleh mengandung marker, mis. 'Ukuran Tidak Diketahui'."""
+        columns = tuple(columns)
+
+        def check(frame):
+            valid = np.ones(len(frame), dtype=bool)
+            for column in columns:
+                valid &= _unique_value_mask(frame[column], lambda value: marker not in str(value))
+            return valid
+        return cls(code, columns, check)
+
+DEFAULT_RULES = (
+    ValidationRule.in_range("price_out_of_range", "Price", *PRICE_RANGE_IDR),
+    ValidationRule.in_range("rating_out_of_range", "Rating", *RATING_RANGE),
+    ValidationRule.one_of("unknown_size", "Size", KNOWN_SIZES),
+    ValidationRule.one_of("unknown_gender", "Gender", KNOWN_GENDERS),
+    ValidationRule.not_containing("unknown_field", ("Title", "Size", "Gender")),
+)
+
+class QuarantineSink:
+    """Penampung baris yang gagal dibersihkan atau divalidasi, beserta kode alasannya.
+
+    Baris ditambahkan ke file CSV dengan kolom tambahan Stage dan Reasons, dan
+    jumlah baris per kode alasan dihitung untuk laporan.
+    """
+
+    def __init__(self, path: str = 'quarantine.csv'):
+        """Inisialisasi sink; file lama di path ditimpa pada penulisan pertama.
+
+        Args:
+            path (str): Lokasi file CSV karantina
+        """
+        self.path = path
+        self.rows = 0
+        self.reason_counts = {}
+        self._started = False
+
+    def add(self, rows: pd.DataFrame, reasons, stage: str):
+        """Simpan baris yang gagal.
+
+        Args:
+            rows (pd.DataFrame): Baris yang gagal
+            reasons: Satu kode alasan untuk semua baris, atau array string alasan per baris
+            stage (str): Tahap tempat baris gagal, mis. "transform" atau "validate"
+        """
+        if rows.empty:
+            return
+        reasons = pd.Series(reasons, index=rows.index, dtype=object)
+        for codes, count in reasons.value_counts().items():
+            for code in codes.split(","):
+                self.reason_counts[code] = self.reason_counts.get(code, 0) + int(count)
+        quarantined = rows.assign(Stage=stage, Reasons=reasons)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        quarantined.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+        self.rows += len(rows)
+
+    def report(self):
+        """Cetak jumlah baris karantina per kode alasan."""
+        counts = ", ".join(f"{code}: {count}" for code, count in sorted(self.reason_counts.items()))
+        print(f"[Karantina] {self.rows} baris disimpan ke {self.path} ({counts or 'tidak ada'})")
+
+class DataValidator:
+    """Evaluasi semua aturan sebagai mask kolom dalam satu lintasan atas DataFrame."""
+
+    def __init__(self, rules=DEFAULT_RULES, quarantine: QuarantineSink = None):
+        """Inisialisasi validator.
+
+        Args:
+            rules (tuple): Daftar ValidationRule
+            quarantine (QuarantineSink): Sink untuk baris yang gagal; None berarti hanya dihitung
+        """
+        self.rules = tuple(rules)
+        self.quarantine = quarantine
+        self.rule_counts = {rule.code: 0 for rule in self.rules}
+        self.rows_checked = 0
+        self.rows_rejected = 0
+
+    def validate(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Kembalikan baris yang lolos semua aturan; baris lain dikirim ke karantina.
+
+        Aturan yang kolomnya tidak ada di dataframe dilewati.
+        """
+        if dataframe.empty:
+            return dataframe
+        rules = [rule for rule in self.rules if all(column in dataframe.columns for column in rule.columns)]
+        failures = np.zeros((len(rules), len(dataframe)), dtype=bool)
+        for position, rule in enumerate(rules):
+            failures[position] = ~rule.check(dataframe)
+        metrics = get_metrics()
+        for rule, failed_count in zip(rules, failures.sum(axis=1)):
+            self.rule_counts[rule.code] += int(failed_count)
+            if failed_count:
+                metrics.inc('etl_rows_dropped_total', int(failed_count), stage="validate", rule=rule.code)
+
+        rejected = failures.any(axis=0)
+        self.rows_checked += len(dataframe)
+        self.rows_rejected += int(rejected.sum())
+        if not rejected.any():
+            return dataframe
+        if self.quarantine is not None:
+            reasons = combine_reason_codes(
+                (rule.code, failed[rejected]) for rule, failed in zip(rules, failures)
+            )
+            self.quarantine.add(dataframe[rejected], reasons, stage="validate")
+        return dataframe[~rejected]
+
+    def validate_batches(self, batches):
+        """Validasi setiap batch; batch yang kosong setelah validasi dilewati."""
+        for batch in batches:
+            valid_batch = self.validate(batch)
+            if not valid_batch.empty:
+                yield valid_batch
+
+    def report(self):
+        """Cetak jumlah baris yang gagal per aturan."""
+        counts = ", ".join(f"{code}: {count}" for code, count in self.rule_counts.items())
+        print(f"[Validasi] {self.rows_rejected} dari {self.rows_checked} baris ditolak ({counts})")
@@ -0,0 +1,233 @@
+import os
+import sqlite3
+import pandas as pd
+
+from utils.dedup import latest_rows_mask
+from utils.state import hash_columns
+
+DEFAULT_WAREHOUSE_KEY_COLUMNS = ("Title", "Size", "Gender")
+SUMMARY_GROUP_COLUMNS = ("Gender", "Size")
+# Kolom numerik yang diringkas per grup: jumlah nilai, total, minimum, dan maksimum
+SUMMARY_MEASURES = ("Price", "Rating")
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _sqlite_type(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+def _sqlite_rows(dataframe: pd.DataFrame):
+    """Baris DataFrame sebagai tuple nilai Python; NaN menjadi NULL dan waktu menjadi teks ISO."""
+    converted = {}
+    for column, values in dataframe.items():
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            values = values.dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        values = values.astype(object)
+        converted[column] = values.where(values.notna(), None)
+    return pd.DataFrame(converted).itertuples(index=False, name=None)
+
+class SqliteWarehouse:
+    """Gudang data lokal (SQLite) berisi produk terbaru dan tabel ringkasan siap kueri.
+
+    Tabel produk di-upsert berdasarkan kolom kunci dan diberi indeks pada Title,
+    (Gender, Size), dan Price. Ringkasan harga dan rating per (Gender, Size)
+    dijaga oleh trigger setiap kali baris ditambah, diubah, atau dihapus, sehingga
+    tidak perlu dihitung ulang dari seluruh tabel. Minimum/maksimum grup hanya
+    dihitung ulang lewat indeks jika nilai yang hilang adalah batasnya. Trigger
+    juga menghitung hasil scraping yang tersimpan per tanggal (rows_loaded), sehingga
+    memuat ulang data yang sama tidak menambah hitungan.
+
+    Kueri dasbor cukup membaca view {table}_summary atau {table}_scrape_counts.
+    """
+
+    def __init__(self, path: str = 'warehouse.sqlite', table: str = 'products',
+                 key_columns=DEFAULT_WAREHOUSE_KEY_COLUMNS):
+        """Inisialisasi gudang data.
+
+        Args:
+            path (str): Lokasi file database SQLite
+            table (str): Nama tabel produk; tabel ringkasan memakai nama ini sebagai awalan
+            key_columns (tuple): Kolom kunci untuk upsert
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.table = table
+        self.key_columns = tuple(key_columns)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def _existing_columns(self) -> list:
+        return [row[1] for row in self._conn.execute(f"PRAGMA table_info({_quote(self.table)})")]
+
+    def _create_schema(self, dataframe: pd.DataFrame):
+        """Buat tabel produk, indeks, tabel ringkasan, dan trigger jika belum ada."""
+        table = _quote(self.table)
+        definitions = ", ".join(f"{_quote(column)} {_sqlite_type(dtype)}" for column, dtype in dataframe.dtypes.items())
+        keys = ", ".join(map(_quote, self.key_columns))
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS {table} ({definitions}, PRIMARY KEY ({keys}))",
+            f"CREATE TABLE IF NOT EXISTS {_quote(self.table + '_scrape_counts')} ("
+            " ScrapeDate TEXT PRIMARY KEY, rows_loaded INTEGER NOT NULL, last_loaded_at TEXT NOT NULL)",
+        ]
+        for name, columns in (('title', ('Title',)), ('gender_size', SUMMARY_GROUP_COLUMNS), ('price', ('Price',))):
+            if all(column in dataframe.columns for column in columns):
+                statements.append(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{self.table}_{name}')} "
+                    f"ON {table} ({', '.join(map(_quote, columns))})"
+                )
+        if all(column in dataframe.columns for column in SUMMARY_GROUP_COLUMNS + SUMMARY_MEASURES):
+            statements.extend(self._summary_statements())
+        if 'Timestamp' in dataframe.columns:
+            statements.extend(self._scrape_count_statements())
+        with self._conn:
+            for statement in statements:
+                self._conn.execute(statement)
+
+    def _summary_statements(self) -> list:
+        """Tabel ringkasan per (Gender, Size), trigger pemeliharaannya, dan view rata-rata."""
+        table = _quote(self.table)
+        stats = _quote(self.table + '_stats')
+        group = ", ".join(map(_quote, SUMMARY_GROUP_COLUMNS))
+        measure_columns = ", ".join(
+            f"{m}_count INTEGER NOT NULL, {m}_sum REAL NOT NULL, {m}_min REAL, {m}_max REAL"
+            for m in map(str.lower, SUMMARY_MEASURES)
+        )
+
+        def match(row):
+            return " AND ".join(f"{_quote(column)} = {row}.{_quote(column)}" for column in SUMMARY_GROUP_COLUMNS)
+
+        add_updates = ["product_count = product_count + 1"]
+        remove_updates = ["product_count = product_count - 1"]
+        refresh_updates = []
+        for measure in SUMMARY_MEASURES:
+            m, old = measure.lower(), f"OLD.{_quote(measure)}"
+            add_updates += [
+                f"{m}_count = {m}_count + excluded.{m}_count",
+                f"{m}_sum = {m}_sum + excluded.{m}_sum",
+                # NULL dibandingkan dengan apa pun menghasilkan NULL, sehingga nilai baru dipakai jika batas lama kosong
+                f"{m}_min = CASE WHEN excluded.{m}_min IS NULL OR {m}_min <= excluded.{m}_min "
+                f"THEN {m}_min ELSE excluded.{m}_min END",
+                f"{m}_max = CASE WHEN excluded.{m}_max IS NULL OR {m}_max >= excluded.{m}_max "
+                f"THEN {m}_max ELSE excluded.{m}_max END",
+            ]
+            remove_updates += [
+                f"{m}_count = {m}_count - ({old} IS NOT NULL)",
+                f"{m}_sum = {m}_sum - COALESCE({old}, 0)",
+            ]
+            for bound, function, comparison in (('min', 'MIN', '<='), ('max', 'MAX', '>=')):
+                refresh_updates.append(
+                    f"{m}_{bound} = CASE WHEN {old} {comparison} {m}_{bound} THEN "
+                    f"(SELECT {function}({_quote(measure)}) FROM {table} WHERE {match('OLD')}) ELSE {m}_{bound} END"
+                )
+
+        add_row = (
+            f"INSERT INTO {stats} ({group}, product_count, "
+            + ", ".join(f"{m}_count, {m}_sum, {m}_min, {m}_max" for m in map(str.lower, SUMMARY_MEASURES))
+            + ") VALUES ("
+            + ", ".join(f"NEW.{_quote(column)}" for column in SUMMARY_GROUP_COLUMNS) + ", 1, "
+            + ", ".join(
+                f"NEW.{_quote(measure)} IS NOT NULL, COALESCE(NEW.{_quote(measure)}, 0), "
+                f"NEW.{_quote(measure)}, NEW.{_quote(measure)}"
+                for measure in SUMMARY_MEASURES
+            )
+            + f") ON CONFLICT ({group}) DO UPDATE SET {', '.join(add_updates)};"
+        )
+        remove_row = (
+            f"UPDATE {stats} SET {', '.join(remove_updates)} WHERE {match('OLD')};"
+            f" UPDATE {stats} SET {', '.join(refresh_updates)} WHERE {match('OLD')};"
+            f" DELETE FROM {stats} WHERE {match('OLD')} AND product_count <= 0;"
+        )
+        trigger = f"{self.table}_stats"
+        average = ", ".join(
+            f"{m}_sum / NULLIF({m}_count, 0) AS {m}_avg, {m}_min, {m}_max"
+            for m in map(str.lower, SUMMARY_MEASURES)
+        )
+        return [
+            f"CREATE TABLE IF NOT EXISTS {stats} ({' TEXT, '.join(map(_quote, SUMMARY_GROUP_COLUMNS))} TEXT, "
+            f"product_count INTEGER NOT NULL, {measure_columns}, PRIMARY KEY ({group}))",
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(trigger + '_insert')} AFTER INSERT ON {table} BEGIN {add_row} END",
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(trigger + '_update')} AFTER UPDATE ON {table} "
+            f"BEGIN {remove_row} {add_row} END",
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(trigger + '_delete')} AFTER DELETE ON {table} BEGIN {remove_row} END",
+            f"CREATE VIEW IF NOT EXISTS {_quote(self.table + '_summary')} AS "
+            f"SELECT {group}, product_count, {average} FROM {stats}",
+        ]
+
+    def _scrape_count_statements(self) -> list:
+        """Trigger penghitung rows_loaded per tanggal scraping (dari Timestamp).
+
+        rows_loaded adalah jumlah hasil scraping (kunci produk dengan Timestamp-nya)
+        yang pernah ditulis ke tabel produk pada tanggal itu. Hanya baris yang benar-
+        benar di-upsert yang dihitung, jadi duplikat dalam satu DataFrame dihitung
+        sekali dan memuat ulang baris dengan Timestamp yang sama tidak dihitung lagi.
+        Timestamp yang tidak bisa dibaca dihitung pada ScrapeDate 'unknown'.
+        """
+        table = _quote(self.table)
+        count_row = (
+            f"INSERT INTO {_quote(self.table + '_scrape_counts')} (ScrapeDate, rows_loaded, last_loaded_at) "
+            "VALUES (COALESCE(date(NEW.\"Timestamp\"), 'unknown'), 1, strftime('%Y-%m-%dT%H:%M:%f', 'now')) "
+            "ON CONFLICT (ScrapeDate) DO UPDATE SET "
+            "rows_loaded = rows_loaded + 1, last_loaded_at = excluded.last_loaded_at;"
+        )
+        trigger = f"{self.table}_scrape_counts"
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(trigger + '_insert')} AFTER INSERT ON {table} "
+            f"BEGIN {count_row} END",
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(trigger + '_update')} AFTER UPDATE ON {table} "
+            f"WHEN OLD.\"Timestamp\" IS NOT NEW.\"Timestamp\" BEGIN {count_row} END",
+        ]
+
+    def _add_missing_columns(self, dataframe: pd.DataFrame):
+        existing = set(self._existing_columns())
+        with self._conn:
+            for column, dtype in dataframe.dtypes.items():
+                if column not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE {_quote(self.table)} ADD COLUMN {_quote(column)} {_sqlite_type(dtype)}"
+                    )
+
+    def upsert(self, dataframe: pd.DataFrame) -> int:
+        """Tambahkan atau perbarui produk beserta ringkasan dan jumlah baris per tanggal scraping.
+
+        Jika satu kunci muncul lebih dari sekali, baris dengan Timestamp terbaru yang
+        disimpan. Semua perubahan, termasuk ringkasan, berada dalam satu transaksi.
+
+        Args:
+            dataframe (pd.DataFrame): Data produk yang sudah dibersihkan
+
+        Returns:
+            int: Jumlah baris yang ditambahkan atau diperbarui
+        """
+        if dataframe.empty:
+            return 0
+        self._create_schema(dataframe)
+        self._add_missing_columns(dataframe)
+
+        timestamps = dataframe['Timestamp'] if 'Timestamp' in dataframe.columns else None
+        keys = hash_columns(dataframe, self.key_columns).to_numpy()
+        latest = dataframe[latest_rows_mask(keys, timestamps)]
+
+        columns = list(latest.columns)
+        column_list = ", ".join(map(_quote, columns))
+        updates = ", ".join(
+            f"{_quote(column)} = excluded.{_quote(column)}" for column in columns if column not in self.key_columns
+        )
+        upsert = (
+            f"INSERT INTO {_quote(self.table)} ({column_list}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(map(_quote, self.key_columns))}) DO "
+            + (f"UPDATE SET {updates}" if updates else "NOTHING")
+        )
+        with self._conn:
+            # rowcount executemany tidak ikut menghitung baris yang diubah trigger ringkasan
+            upserted = self._conn.executemany(upsert, _sqlite_rows(latest)).rowcount
+        return upserted
+
+    def close(self):
+        """Tutup koneksi database."""
+        self._conn.close()